@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 
-from .models import GlobalConfig
+from .models import ExportJob, GlobalConfig
 
 
 @admin.register(GlobalConfig)
@@ -32,3 +32,14 @@ class GlobalConfigAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False
+
+
+@admin.register(ExportJob)
+class ExportJobAdmin(admin.ModelAdmin):
+    list_display = ["source", "format", "user", "status", "processed_rows", "total_rows", "backend", "created_at"]
+    list_filter = ["status", "format", "backend"]
+    search_fields = ["source", "user__username", "user__email"]
+    readonly_fields = [f.name for f in ExportJob._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
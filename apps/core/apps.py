@@ -6,3 +6,9 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core"
+
+    def ready(self) -> None:
+        # Versionado del cache de permisos del CRUD (ver apps.core.crud.permissions).
+        from apps.core.crud.permissions import install_permission_signals
+
+        install_permission_signals()
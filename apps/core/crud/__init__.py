@@ -1,11 +1,13 @@
 from .config import CrudConfig
-from .defs import ColumnDef, FilterDef
+from .defs import BulkActionDef, ColumnDef, CrudBudget, FilterDef
 from .registry import register_crud, get_crud
 
 __all__ = [
     "CrudConfig",
     "ColumnDef",
     "FilterDef",
+    "BulkActionDef",
+    "CrudBudget",
     "register_crud",
     "get_crud",
 ]
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any, Callable
+
+from django.contrib.auth import get_user_model
+from django.db import connections, models, router, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .defs import CrudBudget
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .config import CrudConfig
+
+
+DEFAULT_BUDGET = CrudBudget()
+EXPORT_FORMATS = ("csv", "xlsx", "pdf")
+# crud_urls de relleno: el harness mide render, no navegación.
+BUDGET_URLS = {
+    key: "#"
+    for key in ("list", "table", "create", "bulk", "export_csv", "export_xlsx", "export_pdf")
+}
+
+
+class BudgetSeedError(Exception):
+    """No se pudieron generar filas sintéticas (declarar CrudBudget.seed)."""
+
+
+@dataclass(frozen=True)
+class BudgetResult:
+    slug: str
+    render: str  # list | table | export:<fmt>
+    page_size: int | None
+    rows: int
+    queries: int
+    ms: float
+    max_queries: int
+    max_ms: float
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error and self.queries <= self.max_queries and self.ms <= self.max_ms
+
+
+class _Rollback(Exception):
+    pass
+
+
+# --- filas sintéticas ---
+def _synthetic_value(field: models.Field, i: int, depth: int) -> Any:
+    if field.choices:
+        choices = field.flatchoices
+        return choices[i % len(choices)][0]
+    if isinstance(field, models.ForeignKey):
+        related = field.related_model
+        if not field.one_to_one:
+            existing = related._default_manager.first()
+            if existing is not None:
+                return existing
+        if depth >= 2:
+            raise BudgetSeedError(f"{field.model._meta.label}.{field.name}: relación demasiado profunda")
+        return synthetic_instance(related, i, depth=depth + 1)
+    if isinstance(field, models.EmailField):
+        return f"budget{i}@example.com"
+    if isinstance(field, (models.CharField, models.TextField)):
+        value = f"{field.name} {i:06d}"
+        return value[-field.max_length :] if field.max_length else value
+    if isinstance(field, models.BooleanField):
+        return False
+    if isinstance(field, (models.IntegerField, models.FloatField, models.DecimalField)):
+        return i
+    if isinstance(field, models.DateTimeField):
+        return timezone.now() - timedelta(minutes=i)
+    if isinstance(field, models.DateField):
+        return timezone.localdate() - timedelta(days=i % 3650)
+    if isinstance(field, models.UUIDField):
+        return uuid.uuid4()
+    raise BudgetSeedError(f"{field.model._meta.label}.{field.name}: tipo sin generador")
+
+
+def _synthetic_kwargs(model, i: int, depth: int) -> dict:
+    data: dict[str, Any] = {}
+    for field in model._meta.concrete_fields:
+        if field.primary_key or field.has_default() or field.null:
+            continue
+        if getattr(field, "auto_now", False) or getattr(field, "auto_now_add", False):
+            continue
+        if field.blank and not field.unique and isinstance(field, (models.CharField, models.TextField)):
+            continue
+        data[field.name] = _synthetic_value(field, i, depth)
+    return data
+
+
+def synthetic_instance(model, i: int = 0, *, depth: int = 0):
+    return model._default_manager.create(**_synthetic_kwargs(model, i, depth))
+
+
+def seed_rows(model, count: int, *, start: int = 0, using: str | None = None) -> int:
+    """bulk_create de `count` filas con valores mínimos válidos por tipo de campo.
+
+    choices rotan y fechas retroceden con el índice: filtros y orden no son triviales.
+    """
+
+    objs = [model(**_synthetic_kwargs(model, start + i, 0)) for i in range(count)]
+    model._default_manager.db_manager(using).bulk_create(objs, batch_size=500)
+    return len(objs)
+
+
+def seed_config(config: "CrudConfig", count: int, *, start: int = 0) -> int:
+    """Filas sintéticas para crud_budget (se revierten) y crud_bench (carga por lotes).
+
+    Usa CrudBudget.seed si el config lo declara; si no, seed_rows sobre config.model.
+    """
+
+    seed = (config.budget or DEFAULT_BUDGET).seed
+    if seed is None:
+        return seed_rows(config.model, count, start=start)
+    if isinstance(seed, str):
+        seed = import_string(seed)
+    return seed(config, count, start)
+
+
+# --- medición ---
+def _measure(using: str, fn: Callable[[], Any]) -> tuple[int, float]:
+    with CaptureQueriesContext(connections[using]) as ctx:
+        start = time.perf_counter()
+        response = fn()
+        # StreamingHttpResponse: el costo está en consumir el iterador.
+        if getattr(response, "streaming", False):
+            for _ in response.streaming_content:
+                pass
+        elapsed = (time.perf_counter() - start) * 1000
+    return len(ctx.captured_queries), elapsed
+
+
+def _request(user):
+    request = RequestFactory().get("/", {"page": "1"})
+    request.user = user
+    # Sin CSRF_COOKIE: sin cache de fragmentos ni ETag → se mide el render en frío.
+    return request
+
+
+def _export_fields(config: "CrudConfig") -> tuple[list[str], list[str]]:
+    fields = config.get_export_fields()
+    if fields:
+        return fields, config.get_export_headers() or fields
+    fields = [(c.fields[0] if c.fields else c.key) for c in config.list_columns if c.value is None]
+    return fields, fields
+
+
+def _export_call(config: "CrudConfig", fmt: str, request) -> Callable[[], Any]:
+    from apps.core.services.exporting import build_pdf_table, stream_csv, stream_xlsx
+
+    fields, headers = _export_fields(config)
+    kwargs = {"fields": fields, "headers": headers, "filename_base": "budget"}
+    builder = {"csv": stream_csv, "xlsx": stream_xlsx, "pdf": build_pdf_table}[fmt]
+
+    def run():
+        qs = config.queryset_for_list(request, config.parse_params(request))
+        return builder(queryset=qs, **kwargs)
+
+    return run
+
+
+def run_budget(
+    config: "CrudConfig",
+    *,
+    renders: tuple[str, ...] = ("list", "table", "export"),
+    seed: bool = True,
+    on_note: Callable[[str], None] = lambda msg: None,
+) -> list[BudgetResult]:
+    """Renderiza list/table/exports de un CrudConfig y compara queries/tiempo con su budget.
+
+    Las filas sintéticas y el superusuario temporal viven en una transacción que se
+    revierte al final. table se mide en cada page size: además del máximo absoluto,
+    las queries no pueden crecer con el tamaño de página (N+1).
+    """
+
+    from .engine import build_list_page_context, render_list_fragment
+    from django.template.loader import render_to_string
+
+    budget = config.budget or DEFAULT_BUDGET
+    using = router.db_for_read(config.model)
+    results: list[BudgetResult] = []
+    saved = (config.page_size, config.fragment_cache_timeout, config.facet_cache_timeout)
+
+    try:
+        with transaction.atomic(using=using):
+            user = get_user_model()._default_manager.create_superuser(
+                username=f"crud-budget-{time.time_ns()}", email="", password=None
+            )
+            if seed:
+                created = seed_config(config, budget.seed_rows)
+                on_note(f"{created} filas sintéticas")
+            config.fragment_cache_timeout = 0
+            config.facet_cache_timeout = 0
+
+            table_queries: dict[int, int] = {}
+            for size in budget.page_sizes:
+                config.page_size = size
+                request = _request(user)
+                rows = config.queryset_for_list(request, config.parse_params(request))[:size].count()
+                if rows < size:
+                    on_note(f"page_size={size}: solo {rows} filas visibles (get_base_queryset?)")
+
+                if "table" in renders:
+                    render_list_fragment(config=config, request=_request(user), crud_urls=BUDGET_URLS)
+                    queries, ms = _measure(
+                        using,
+                        lambda: render_list_fragment(
+                            config=config, request=_request(user), crud_urls=BUDGET_URLS
+                        ),
+                    )
+                    table_queries[size] = queries
+                    results.append(
+                        BudgetResult(
+                            config.crud_slug, "table", size, rows, queries, ms,
+                            budget.max_queries, budget.max_ms,
+                        )
+                    )
+
+                if "list" in renders:
+
+                    def render_page():
+                        request = _request(user)
+                        ctx = build_list_page_context(config=config, request=request, crud_urls=BUDGET_URLS)
+                        return render_to_string("crud/list.html", ctx, request=request)
+
+                    try:
+                        render_page()  # warm-up: compila templates del layout
+                        queries, ms = _measure(using, render_page)
+                        results.append(
+                            BudgetResult(
+                                config.crud_slug, "list", size, rows, queries, ms,
+                                budget.max_queries, budget.max_ms,
+                            )
+                        )
+                    except Exception as exc:
+                        results.append(
+                            BudgetResult(config.crud_slug, "list", size, rows, 0, 0, 0, 0, error=repr(exc))
+                        )
+
+            if len(set(table_queries.values())) > 1 and not budget.allow_query_growth:
+                sizes = ", ".join(f"{s}→{q}" for s, q in table_queries.items())
+                results.append(
+                    BudgetResult(
+                        config.crud_slug, "table:n+1", None, 0, max(table_queries.values()), 0,
+                        budget.max_queries, budget.max_ms,
+                        error=f"queries crecen con page_size ({sizes})",
+                    )
+                )
+
+            if "export" in renders and config.is_export_enabled():
+                request = _request(user)
+                total = config.queryset_for_list(request, config.parse_params(request)).count()
+                for fmt in EXPORT_FORMATS:
+                    if not config.allows_format(fmt):
+                        continue
+                    try:
+                        queries, ms = _measure(using, _export_call(config, fmt, request))
+                    except RuntimeError as exc:  # Dependencia faltante: openpyxl/reportlab
+                        on_note(f"export:{fmt} omitido ({exc})")
+                        continue
+                    results.append(
+                        BudgetResult(
+                            config.crud_slug, f"export:{fmt}", None, total, queries, ms,
+                            budget.export_max_queries, budget.export_max_ms,
+                        )
+                    )
+            raise _Rollback
+    except _Rollback:
+        pass
+    finally:
+        config.page_size, config.fragment_cache_timeout, config.facet_cache_timeout = saved
+    return results
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import copy
+from typing import TYPE_CHECKING, Iterator
+
+from django.core import signing
+from django.db import router, transaction
+from django.db.models import QuerySet
+from django.db.models.deletion import Collector
+from django.db.models.signals import post_delete, pre_delete
+from django.http import HttpRequest, QueryDict
+
+from .cache import bump_data_version, is_version_receiver
+from .defs import BulkActionDef
+from .search import indexes_for_model
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .config import CrudConfig
+
+
+SELECT_ALL_SALT = "crud.bulk.select_all"
+SELECT_ALL_MAX_AGE = 60 * 60
+
+class BulkError(Exception):
+    """Selección o acción masiva inválida (se responde 400)."""
+
+
+def with_query(request: HttpRequest, querystring: str) -> HttpRequest:
+    """Copia del request con otro GET (para reusar parse_params/queryset_for_list)."""
+
+    clone = copy.copy(request)
+    clone.GET = QueryDict(querystring or "")
+    return clone
+
+
+# --- "seleccionar todos los que coinciden" ---
+def select_all_token(config: "CrudConfig", request: HttpRequest, filters_qs: str) -> str:
+    """Token firmado con los filtros actuales (sin ids): la selección vive en el servidor."""
+
+    user_id = getattr(getattr(request, "user", None), "pk", None)
+    return signing.dumps(
+        {"q": filters_qs, "u": user_id}, salt=f"{SELECT_ALL_SALT}:{config.crud_slug}", compress=True
+    )
+
+
+def _read_select_all(config: "CrudConfig", request: HttpRequest, token: str) -> str:
+    try:
+        data = signing.loads(
+            token, salt=f"{SELECT_ALL_SALT}:{config.crud_slug}", max_age=SELECT_ALL_MAX_AGE
+        )
+    except signing.BadSignature as exc:
+        raise BulkError("Selección expirada o inválida; vuelve a seleccionar.") from exc
+    if data.get("u") != getattr(getattr(request, "user", None), "pk", None):
+        raise BulkError("Selección inválida para este usuario.")
+    return str(data.get("q") or "")
+
+
+def selection_queryset(config: "CrudConfig", request: HttpRequest) -> QuerySet:
+    """Filas objetivo: ids explícitos o token select-all. Siempre dentro de get_base_queryset."""
+
+    token = (request.POST.get("select_all") or "").strip()
+    if token:
+        filtered = with_query(request, _read_select_all(config, request, token))
+        params = config.parse_params(filtered)
+        qs = config.get_base_queryset(filtered)
+        qs = config.apply_search(qs, params)
+        qs = config.apply_filters(qs, params, filtered)
+        return config.apply_date_range(qs, params)
+
+    raw = (request.POST.get("ids") or "").replace(" ", "")
+    ids = [x for x in raw.split(",") if x]
+    if not ids:
+        raise BulkError("No hay registros seleccionados.")
+    pk_field = config.model._meta.pk
+    try:
+        ids = [pk_field.to_python(x) for x in ids]
+    except Exception as exc:
+        raise BulkError("Selección inválida.") from exc
+    return config.get_base_queryset(request).filter(pk__in=ids)
+
+
+# --- ejecución por lotes ---
+def _pk_batches(qs: QuerySet, size: int) -> Iterator[list]:
+    """Lotes de pk por keyset (pk > último): sin OFFSET y estable si se borran filas."""
+
+    base = qs.order_by("pk").values_list("pk", flat=True)
+    last = None
+    while True:
+        batch_qs = base if last is None else base.filter(pk__gt=last)
+        pks = list(batch_qs[:size])
+        if not pks:
+            return
+        yield pks
+        last = pks[-1]
+        if len(pks) < size:
+            return
+
+
+def _foreign_receivers(signal, model) -> bool:
+    """¿Hay receivers para el modelo además de los de versión? Ante la duda, sí."""
+
+    if not signal.has_listeners(model):
+        return False
+    try:
+        live = signal._live_receivers(model)
+        if isinstance(live, tuple):  # Django 5: (sync, async)
+            live = [receiver for group in live for receiver in group]
+        return not all(is_version_receiver(receiver) for receiver in live)
+    except Exception:
+        # API privada: si cambia, delete() normal (con signals) en vez de saltear receivers.
+        return True
+
+
+class _BulkCollector(Collector):
+    # Los receivers propios se replican tras cada lote; los de terceros fuerzan delete() normal.
+    def _has_signal_listeners(self, model) -> bool:
+        return _foreign_receivers(pre_delete, model) or _foreign_receivers(post_delete, model)
+
+
+def _after_batch(model, pks: list, *, using: str) -> None:
+    for index in indexes_for_model(model):
+        index.get_backend().sync(index, pks, using=using)
+
+
+def run_bulk_action(
+    config: "CrudConfig", action: BulkActionDef, request: HttpRequest, qs: QuerySet
+) -> int:
+    """Ejecuta la acción por lotes de config.bulk_batch_size pk. Devuelve filas afectadas."""
+
+    model = config.model
+    using = router.db_for_write(model)
+    manager = model._base_manager.using(using)
+    size = max(int(config.bulk_batch_size), 1)
+
+    fast_delete = False
+    if action.kind == "delete":
+        fast_delete = _BulkCollector(using=using, origin=qs).can_fast_delete(manager.none())
+
+    total = 0
+    touched = False
+    for pks in _pk_batches(qs.using(using), size):
+        batch = manager.filter(pk__in=pks)
+        with transaction.atomic(using=using):
+            if action.kind == "delete":
+                if fast_delete:
+                    total += batch._raw_delete(using)
+                else:
+                    total += batch.delete()[1].get(model._meta.label, 0)
+            elif action.kind == "update":
+                total += batch.update(**action.values)
+            else:
+                affected = action.handler(batch, request)
+                total += len(pks) if affected is None else int(affected)
+            _after_batch(model, pks, using=using)
+        touched = True
+
+    if touched:
+        # update()/_raw_delete no disparan signals: invalidación explícita.
+        bump_data_version(model, using=using)
+    return total
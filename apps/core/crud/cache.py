@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import TYPE_CHECKING, Any, Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpRequest
+from django.utils import timezone
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .config import CrudConfig, CrudParams
+
+
+# Versiones sin TTL: si el backend las desaloja, se re-siembran (= invalidación).
+_VERSION_PREFIX = "crud:ver"
+_FRAGMENT_PREFIX = "crud:frag"
+_STATS_PREFIX = "crud:frag:stats"
+_STALE_PREFIX = "crud:frag:stale"
+
+
+# Modelos con signals de versión en este proceso (ver has_version_signals).
+_VERSIONED: set[str] = set()
+# Receivers de versión conectados acá (apps.core.crud.bulk los replica a mano).
+_VERSION_RECEIVERS: set = set()
+
+
+def _version_key(model) -> str:
+    return f"{_VERSION_PREFIX}:{model._meta.label_lower}"
+
+
+def data_versions(models: Iterable[type]) -> tuple[int, ...]:
+    """Versión de datos por modelo (una sola ida a la cache para todos)."""
+
+    keys = [_version_key(m) for m in models]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        value = found.get(key)
+        if value is None:
+            cache.add(key, time.time_ns(), None)
+            value = cache.get(key) or 0
+        versions.append(int(value))
+    return tuple(versions)
+
+
+def bump_data_version(model, *, using: str | None = None) -> None:
+    """Invalida en O(1) todos los fragmentos que dependen del modelo.
+
+    Llamar a mano tras QuerySet.update()/bulk_create() (no disparan signals).
+    Dentro de una transacción se vuelve a marcar en commit: un render concurrente
+    que lea datos viejos no queda guardado bajo la versión nueva.
+    """
+
+    key = _version_key(model)
+    cache.set(key, time.time_ns(), None)
+    conn = transaction.get_connection(using)
+    if conn.in_atomic_block:
+        transaction.on_commit(lambda: cache.set(key, time.time_ns(), None), using=using)
+
+
+def install_version_signals(model) -> None:
+    uid = f"crud_version:{model._meta.label_lower}"
+    _VERSIONED.add(model._meta.label_lower)
+
+    def on_change(sender, using=None, **kwargs):
+        bump_data_version(sender, using=using)
+
+    post_save.connect(on_change, sender=model, weak=False, dispatch_uid=f"{uid}:save")
+    post_delete.connect(on_change, sender=model, weak=False, dispatch_uid=f"{uid}:delete")
+    _VERSION_RECEIVERS.add(on_change)
+
+
+def has_version_signals(model) -> bool:
+    """¿Los cambios por ORM del modelo mueven su versión de datos?"""
+
+    return model._meta.label_lower in _VERSIONED
+
+
+def is_version_receiver(receiver) -> bool:
+    return receiver in _VERSION_RECEIVERS
+
+
+def permission_fingerprint(config: "CrudConfig", request: HttpRequest) -> str | None:
+    """Qué puede ver/hacer el usuario. None si no se puede cachear (sin CSRF aún).
+
+    El fragmento incluye {% csrf_token %}: el secreto CSRF entra en la huella.
+    """
+
+    csrf = request.META.get("CSRF_COOKIE")
+    if not csrf:
+        return None
+    user = getattr(request, "user", None)
+    flags = (
+        config.can_list(request),
+        config.can_create(request),
+        config.can_edit(request),
+        config.can_delete(request),
+        config.can_export(request),
+    )
+    parts = [
+        str(getattr(user, "pk", None) or "anon"),
+        "".join("1" if flag else "0" for flag in flags),
+        ",".join(a.name for a in config.get_bulk_actions(request)),
+        hashlib.sha1(csrf.encode("utf-8")).hexdigest()[:16],
+        *(str(p) for p in config.fragment_cache_vary(request)),
+    ]
+    return "|".join(parts)
+
+
+def list_validator(
+    config: "CrudConfig",
+    request: HttpRequest,
+    params: "CrudParams",
+    *,
+    template_name: str,
+    extra: Iterable[Any] = (),
+) -> tuple[str, int] | None:
+    """(digest, última versión en ns) del listado; None si no se puede validar.
+
+    Sin queries de listado: versiones de datos (cache) + params + huella de permisos.
+    Base de la clave de fragmentos y del ETag (ver apps.core.crud.conditional).
+    """
+
+    perms = permission_fingerprint(config, request)
+    if perms is None:
+        return None
+    versions = data_versions(config.get_fragment_models())
+    raw = "|".join(
+        [template_name, *_params_parts(config, params), perms, *map(str, versions), *map(str, extra)]
+    )
+    digest = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    return digest, max(versions, default=0)
+
+
+def _params_parts(config: "CrudConfig", params: "CrudParams") -> tuple[str, str]:
+    # "" y "all" son equivalentes (mismo criterio que build_qs_without_page).
+    normalized = "&".join(
+        f"{k}={v}" for k, v in sorted(params.as_dict().items()) if v not in {"", "all"}
+    )
+    # from/to se resuelven en la zona horaria activa: misma URL, otras filas.
+    tz = timezone.get_current_timezone_name() if config.date_range(params) else ""
+    return normalized, tz
+
+
+def stale_fragment_key(
+    config: "CrudConfig",
+    request: HttpRequest,
+    params: "CrudParams",
+    *,
+    template_name: str,
+    extra: Iterable[Any] = (),
+) -> str | None:
+    """Clave SIN versiones de datos: última copia buena del listado (fallback por timeout)."""
+
+    perms = permission_fingerprint(config, request)
+    if perms is None:
+        return None
+    raw = "|".join([template_name, *_params_parts(config, params), perms, *map(str, extra)])
+    return f"{_STALE_PREFIX}:{config.crud_slug}:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+def fragment_key(
+    config: "CrudConfig",
+    request: HttpRequest,
+    params: "CrudParams",
+    *,
+    template_name: str,
+    extra: Iterable[Any] = (),
+) -> str | None:
+    validator = list_validator(config, request, params, template_name=template_name, extra=extra)
+    if validator is None:
+        return None
+    return fragment_key_for(config, validator[0])
+
+
+def fragment_key_for(config: "CrudConfig", digest: str) -> str:
+    return f"{_FRAGMENT_PREFIX}:{config.crud_slug}:{digest}"
+
+
+def _incr(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def record(slug: str, *, hit: bool) -> None:
+    _incr(f"{_STATS_PREFIX}:{slug}:{'hits' if hit else 'misses'}")
+
+
+def fragment_cache_stats(slug: str) -> dict[str, int]:
+    keys = {name: f"{_STATS_PREFIX}:{slug}:{name}" for name in ("hits", "misses")}
+    found = cache.get_many(keys.values())
+    return {name: int(found.get(key) or 0) for name, key in keys.items()}
+
+
+def get_fragment(key: str) -> dict | None:
+    return cache.get(key)
+
+
+def set_fragment(key: str, entry: dict, timeout: int) -> None:
+    cache.set(key, entry, timeout)
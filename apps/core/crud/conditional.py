@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable
+
+from django.contrib.messages import get_messages
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from apps.core import db_router
+
+from .cache import data_versions, install_version_signals, list_validator
+from .permissions import permission_versions
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .config import CrudConfig
+
+
+@dataclass(frozen=True)
+class ListValidator:
+    """ETag + Last-Modified de un listado (calculados sin ejecutar la query)."""
+
+    digest: str
+    last_modified: int | None
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.digest}"'
+
+
+def _layout_models() -> tuple[type, ...]:
+    # Página completa: el layout lee GlobalConfig (context processor).
+    from apps.core.models import GlobalConfig
+
+    return (GlobalConfig,)
+
+
+def install_layout_signals() -> None:
+    for model in _layout_models():
+        install_version_signals(model)
+
+
+def list_etag(
+    config: "CrudConfig",
+    request: HttpRequest,
+    *,
+    template_name: str,
+    extra: Iterable[Any] = (),
+    page: bool = False,
+) -> ListValidator | None:
+    """Validador del listado o None (GET condicional desactivado / no aplicable).
+
+    page=True agrega lo que cambia el layout: versión de permisos del usuario
+    (navegación) y de GlobalConfig. Con mensajes pendientes no hay validador: un 304
+    dejaría el flash sin mostrar.
+    """
+
+    if not config.conditional_get or request.method not in {"GET", "HEAD"}:
+        return None
+
+    extra = tuple(extra)
+    if page:
+        if len(get_messages(request)):
+            return None
+        user_id = getattr(getattr(request, "user", None), "pk", None)
+        extra = (*extra, *permission_versions(user_id), *data_versions(_layout_models()))
+
+    found = list_validator(
+        config, request, config.parse_params(request), template_name=template_name, extra=extra
+    )
+    if found is None:
+        return None
+    digest, version = found
+    return ListValidator(digest=digest, last_modified=(version // 1_000_000_000) or None)
+
+
+def not_modified(request: HttpRequest, validator: ListValidator | None) -> HttpResponse | None:
+    """304 (o 412) si el cliente ya tiene esta versión; None si hay que renderizar."""
+
+    if validator is None:
+        return None
+    response = get_conditional_response(
+        request, etag=validator.etag, last_modified=validator.last_modified
+    )
+    if response is None:
+        return None
+    return apply_validator(response, validator)
+
+
+def apply_validator(response: HttpResponse, validator: ListValidator | None) -> HttpResponse:
+    """ETag/Last-Modified + revalidación obligatoria. Vary siempre (mismo URL, HTMX o no)."""
+
+    patch_vary_headers(response, ("HX-Request",))
+    if validator is None or response.status_code not in {200, 304}:
+        return response
+    if db_router.reading_replica():
+        # Render desde la réplica (quizá atrasada): un ETag de la versión nueva lo fijaría.
+        return response
+    response["ETag"] = validator.etag
+    if validator.last_modified:
+        response["Last-Modified"] = http_date(validator.last_modified)
+    # private: depende del usuario; no-cache: el navegador guarda y revalida (→ 304).
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
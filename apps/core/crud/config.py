@@ -1,16 +1,38 @@
 from __future__ import annotations
 
+import warnings
 from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta
+from operator import attrgetter, itemgetter
 from typing import Any, Type
 from urllib.parse import urlencode
 
-from django.core.paginator import Paginator
-from django.db.models import Q, QuerySet
+from asgiref.sync import sync_to_async
+from django.db import models, router
+from django.db.models import QuerySet
 from django.http import HttpRequest
+from django.utils import timezone
 from django import forms
 
-from .defs import ColumnDef, FilterDef
+from .cache import install_version_signals
+from .conditional import install_layout_signals
+from .counting import (
+    CountedPaginator,
+    acount_queryset,
+    apage,
+    awindow_page,
+    count_queryset,
+    uncounted_page,
+    window_page,
+)
+from .defs import BulkActionDef, ColumnDef, CrudBudget, FilterDef
+from .facets import Facet, compute_facets
+from .keyset import CURSOR_SALT, keyset_after, nullable_path, paginate_keyset
 from .permissions import CrudPermissionSpec
+from .rows import RowPlan
+from .search import SearchIndex, register_search_index
+from .shaping import ColumnPathWarning, QueryShape, build_shape, undeclared_reads
+from .timeouts import QueryTimeout, statement_timeout
 
 
 @dataclass(frozen=True)
@@ -23,6 +45,8 @@ class CrudParams:
     # Compat con templates del kit (aunque MVP solo use algunos)
     date_from: str
     date_to: str
+    # Cursor opaco del modo keyset (vacío = primera página).
+    cursor: str = ""
 
     def as_dict(self) -> dict[str, str]:
         return {
@@ -33,9 +57,17 @@ class CrudParams:
             "page": self.page,
             "from": self.date_from,
             "to": self.date_to,
+            "cursor": self.cursor,
         }
 
 
+def _parse_date(raw: str) -> date | None:
+    try:
+        return date.fromisoformat(raw) if raw else None
+    except ValueError:
+        return None
+
+
 class CrudConfig:
     """Base declarativa mínima (LIST ONLY).
 
@@ -54,12 +86,102 @@ class CrudConfig:
     filters: list[FilterDef] = []
     search_fields: list[str] = []
 
+    # Backend de búsqueda (ver apps.core.crud.search): "icontains" (default), "postgres"
+    # (tsvector + pg_trgm), "sqlite_fts" (FTS5 trigram) o "auto" (según la BD).
+    # Los índices se crean con `python manage.py crud_search_index`.
+    search_backend: str = "icontains"
+    search_config: str = "simple"
+
     default_sort_key: str = ""
     default_dir: str = "asc"
     page_size: int = 10
 
+    # "offset" (Paginator de Django) o "keyset" (cursor: WHERE (sort, pk) > (...)).
+    # Keyset cuesta lo mismo en la página 1 que en la 5.000, pero solo navega anterior/siguiente.
+    pagination_mode: str = "offset"
+
+    # Scroll infinito (requiere keyset + crud_urls["rows"] → engine.render_rows): al final de
+    # la tabla, un sentinel pide el bloque siguiente de scroll_block_size <tr> al hacerse
+    # visible. scroll_streaming: el bloque se envía en tandas de scroll_stream_chunk filas
+    # a medida que salen de .iterator() (crud.js las pinta sin esperar el final).
+    infinite_scroll: bool = False
+    scroll_block_size: int = 100
+    scroll_streaming: bool = False
+    scroll_stream_chunk: int = 25
+
+    # Página completa en streaming (engine.render_list_page): el layout (<head>, CSS/JS)
+    # sale antes de consultar el listado; la tabla sigue en tandas de stream_page_chunk
+    # filas. Sin ETag/304: los headers salen antes de saber si el listado se degrada.
+    stream_page: bool = False
+    stream_page_chunk: int = 25
+
+    # Lecturas del listado (tabla, facets, filas, página) desde la réplica de
+    # settings.DATABASE_REPLICA_ALIAS, si existe. Tras escribir, el usuario queda fijado al
+    # primario CRUD_REPLICA_PIN_SECONDS (apps.core.db_router). Desde la réplica no hay ETag y
+    # el fragmento cacheado vive como mucho esos segundos (la réplica puede ir atrasada).
+    read_replica: bool = False
+
+    # Estrategia de conteo (ver apps.core.crud.counting):
+    # - "exact": COUNT(*) una sola vez, compartido con el paginator.
+    # - "window": COUNT(*) OVER () en la misma query de la página (solo offset).
+    # - "cached": COUNT(*) cacheado por huella del filtro durante count_cache_timeout.
+    # - "estimated": estadísticas del planner para listas sin filtros.
+    count_strategy: str = "exact"
+    count_cache_timeout: int = 60
+
+    # Query shaping: only()/select_related()/prefetch_related() desde ColumnDef.fields.
+    # list_extra_fields declara paths leídos fuera de las columnas (ej: row_urls).
+    query_shaping: bool = True
+    list_extra_fields: list[str] = []
+
+    # Render de filas (plan compilado en register_crud, ver apps.core.crud.rows):
+    # - row_source="values": la página se lee con values_list (sin instancias); exige
+    #   columnas sin `value` (cada celda es el valor de fields[0] o de `key`).
+    # - row_url_names: {"edit": "app:edit", ...} con kwarg row_url_kwarg=pk. Permite armar
+    #   las URLs por concatenación en vez de reverse() por fila (sin sobrescribir row_urls).
+    row_source: str = "objects"
+    row_url_names: dict[str, str] | None = None
+    row_url_kwarg: str = "id"
+
+    # Cache de fragmentos (ver apps.core.crud.cache). 0 = desactivado.
+    # La clave incluye params normalizados, huella de permisos y versión de datos de
+    # model + relaciones del query shape + fragment_cache_models (bump por signals).
+    fragment_cache_timeout: int = 0
+    fragment_cache_models: list[type] = []
+    # Tras servir la página N, renderiza N+1 (o el cursor siguiente) en un pool de threads
+    # bajo su clave versionada. Requiere fragment_cache_timeout; cupo por proceso en
+    # settings.CRUD_PREFETCH_WORKERS / CRUD_PREFETCH_MAX_PENDING.
+    prefetch_next_page: bool = False
+
+    # GET condicional (ver apps.core.crud.conditional): ETag con los mismos datos que la
+    # clave de fragmentos; If-None-Match → 304 antes de ejecutar la query del listado.
+    # Cambios fuera del ORM (SQL crudo) deben llamar bump_data_version.
+    conditional_get: bool = False
+
+    # Acciones masivas declarativas (ver apps.core.crud.bulk): se ejecutan por lotes de
+    # bulk_batch_size pk con update()/_raw_delete (delete() normal si hay signals ajenos).
+    bulk_actions: list[BulkActionDef] = []
+    bulk_batch_size: int = 500
+
     status_options: list[tuple[str, str]] | None = None
 
+    # Rango from/to (YYYY-MM-DD) sobre este campo Date/DateTime: >= desde, < hasta + 1 día.
+    date_field: str | None = None
+
+    # Presupuesto de queries/tiempo por render (manage.py crud_budget). None = defaults.
+    budget: CrudBudget | None = None
+
+    # Facetas (FilterDef.facet): conteos por valor en una query, cacheados por huella
+    # del filtro + versión de datos. 0 = sin cache.
+    facet_cache_timeout: int = 0
+    facet_limit: int = 20
+
+    # Tiempo máximo por query del listado/facetas (ms; None = sin límite). Excedido, el
+    # engine degrada: último fragmento bueno (stale_fragment_timeout) → página sin
+    # conteo → partial "refina la búsqueda". PostgreSQL y SQLite.
+    query_timeout_ms: int | None = None
+    stale_fragment_timeout: int = 3600
+
     # --- Step 8 (MVP): formularios y metadatos de modales (sin generación automática) ---
     create_form_class: Type[forms.ModelForm] | None = None
     edit_form_class: Type[forms.ModelForm] | None = None
@@ -85,6 +207,9 @@ class CrudConfig:
     export_fields: list[str] | None = None
     export_headers: dict[str, str] | None = None
     export_formats: list[str] | set[str] | tuple[str, ...] | None = None  # e.g. ["csv", "xlsx", "pdf"]
+    # Cache de archivos de export por huella de query + versión de datos (ver
+    # apps.core.services.exporting.export_cache_key). Instala los signals de versión.
+    export_cache: bool = False
 
     def exports_declared(self) -> bool:
         return bool(self.export_fields)
@@ -138,10 +263,15 @@ class CrudConfig:
             page=page,
             date_from=(request.GET.get("from") or "").strip(),
             date_to=(request.GET.get("to") or "").strip(),
+            cursor=(request.GET.get("cursor") or "").strip(),
         )
 
     def build_qs_without_page(self, params: CrudParams) -> str:
-        data = {k: v for k, v in params.as_dict().items() if k != "page" and v not in {"", "all"}}
+        data = {
+            k: v
+            for k, v in params.as_dict().items()
+            if k not in {"page", "cursor"} and v not in {"", "all"}
+        }
         return urlencode(data)
 
     def get_base_queryset(self, request: HttpRequest) -> QuerySet:
@@ -150,11 +280,7 @@ class CrudConfig:
     def apply_search(self, qs: QuerySet, params: CrudParams) -> QuerySet:
         if not params.q or not self.search_fields:
             return qs
-
-        query = Q()
-        for f in self.search_fields:
-            query |= Q(**{f"{f}__icontains": params.q})
-        return qs.filter(query)
+        return self.get_search_index().apply(qs, params.q)
 
     def apply_filters(self, qs: QuerySet, params: CrudParams, request: HttpRequest) -> QuerySet:
         data = params.as_dict()
@@ -165,6 +291,53 @@ class CrudConfig:
             qs = f.apply_to(qs, raw, request)
         return qs
 
+    def get_facets(self, request: HttpRequest, params: CrudParams) -> dict[str, Facet]:
+        try:
+            with self.query_budget():
+                return compute_facets(self, request, params)
+        except QueryTimeout:
+            return {}
+
+    def query_budget(self):
+        """Context manager: corta las queries que excedan query_timeout_ms (ver timeouts.py)."""
+
+        return statement_timeout(router.db_for_read(self.model), self.query_timeout_ms)
+
+    def date_range(self, params: CrudParams) -> tuple[Any, Any] | None:
+        """(desde inclusivo, hasta exclusivo) de from/to, o None si no aplica.
+
+        DateTimeField: medianoche en la zona horaria activa (la del usuario si un
+        middleware la activa; si no, TIME_ZONE). Nunca __date: el índice sigue sirviendo.
+        """
+
+        if not self.date_field:
+            return None
+        start = _parse_date(params.date_from)
+        end = _parse_date(params.date_to)
+        if start is None and end is None:
+            return None
+        if start and end and start > end:
+            start, end = end, start
+        end = end + timedelta(days=1) if end else None
+
+        field = self.model._meta.get_field(self.date_field)
+        if isinstance(field, models.DateTimeField):
+            tz = timezone.get_current_timezone()
+            start = timezone.make_aware(datetime.combine(start, dt_time.min), tz) if start else None
+            end = timezone.make_aware(datetime.combine(end, dt_time.min), tz) if end else None
+        return start, end
+
+    def apply_date_range(self, qs: QuerySet, params: CrudParams) -> QuerySet:
+        bounds = self.date_range(params)
+        if bounds is None:
+            return qs
+        start, end = bounds
+        if start is not None:
+            qs = qs.filter(**{f"{self.date_field}__gte": start})
+        if end is not None:
+            qs = qs.filter(**{f"{self.date_field}__lt": end})
+        return qs
+
     def apply_ordering(self, qs: QuerySet, params: CrudParams) -> QuerySet:
         sort_key = params.sort or self.default_sort_key
         direction = params.dir or self.default_dir
@@ -185,29 +358,181 @@ class CrudConfig:
 
         return qs.order_by(*[f"{prefix}{f}" for f in fields])
 
+    def sort_fields(self, params: CrudParams) -> set[str]:
+        """Campos locales que deciden la posición de una fila con este sort (pk incluido)."""
+
+        qs = self.apply_ordering(self.model._default_manager.none(), params)
+        pk_name = self.model._meta.pk.name
+        roots = {str(term).lstrip("-").split("__")[0] for term in qs.query.order_by}
+        return {pk_name if root == "pk" else root for root in roots}
+
     def queryset_for_list(self, request: HttpRequest, params: CrudParams) -> QuerySet:
         qs = self.get_base_queryset(request)
         qs = self.apply_search(qs, params)
         qs = self.apply_filters(qs, params, request)
+        qs = self.apply_date_range(qs, params)
         qs = self.apply_ordering(qs, params)
+        qs = self.apply_shape(qs)
         return qs
 
+    # --- Query shaping / registro ---
+    def prepare(self) -> None:
+        """Hook de register_crud: valida declaraciones y precalcula estructuras por config."""
+
+        if self.row_source not in {"objects", "values"}:
+            raise ValueError(f"{self.crud_slug}: row_source inválido: {self.row_source}")
+        if self.row_source == "values":
+            with_value = [c.key for c in self.list_columns if c.value is not None]
+            if with_value:
+                raise ValueError(
+                    f"{self.crud_slug}: row_source='values' no admite ColumnDef.value "
+                    f"({', '.join(with_value)})"
+                )
+
+        params_keys = set(CrudParams("", "", "", "", "", "", "").as_dict())
+        for f in self.filters:
+            if f.facet and (not f.field or f.name not in params_keys):
+                raise ValueError(
+                    f"{self.crud_slug}: la faceta '{f.name}' requiere FilterDef.field y un "
+                    f"parámetro conocido ({', '.join(sorted(params_keys))})"
+                )
+
+        if self.infinite_scroll and self.pagination_mode != "keyset":
+            raise ValueError(f"{self.crud_slug}: infinite_scroll requiere pagination_mode='keyset'")
+        if self.pagination_mode == "keyset":
+            # El cursor compara (sort, pk) > (...): un valor NULL no tiene posición.
+            nullable = [p for p in self.ordering_paths() if nullable_path(self.model, p)]
+            if nullable:
+                raise ValueError(
+                    f"{self.crud_slug}: pagination_mode='keyset' requiere columnas de orden "
+                    f"NOT NULL (nulables: {', '.join(nullable)})"
+                )
+
+        if self.date_field:
+            field = self.model._meta.get_field(self.date_field)
+            if not isinstance(field, models.DateField):  # DateTimeField hereda de DateField
+                raise ValueError(f"{self.crud_slug}: date_field debe ser Date/DateTimeField: {self.date_field}")
+
+        for col in self.list_columns:
+            if col.value is None:
+                continue
+            missing = undeclared_reads(self.model, col.value, col.read_paths())
+            if missing:
+                warnings.warn(
+                    f"{self.crud_slug}: la columna '{col.key}' lee {', '.join(missing)} "
+                    "sin declararlo en ColumnDef.fields (posible N+1 / campo diferido).",
+                    ColumnPathWarning,
+                    stacklevel=3,
+                )
+        self._query_shape = self.build_query_shape()
+        self._row_plan = RowPlan(self)
+        if self.search_fields:
+            register_search_index(self.get_search_index())
+        if self.fragment_cache_timeout or self.conditional_get or self.export_cache:
+            for model in self.get_fragment_models():
+                install_version_signals(model)
+        if self.conditional_get:
+            install_layout_signals()
+
+    def get_search_index(self) -> SearchIndex:
+        index = getattr(self, "_search_index", None)
+        if index is None:
+            index = self._search_index = SearchIndex(
+                name=f"crud.{self.crud_slug}",
+                model=self.model,
+                fields=tuple(self.search_fields),
+                backend=self.search_backend,
+                config=self.search_config,
+            )
+        return index
+
+    def ordering_paths(self) -> list[str]:
+        """Paths de order_by declarados por las columnas ordenables."""
+
+        paths: list[str] = []
+        for col in self.list_columns:
+            if col.sortable and col.order_by:
+                for path in [col.order_by] if isinstance(col.order_by, str) else col.order_by:
+                    if path not in paths:
+                        paths.append(path)
+        return paths
+
+    def build_query_shape(self) -> QueryShape:
+        paths: list[str] = []
+        for col in self.list_columns:
+            paths.extend(col.read_paths())
+        # Keyset lee los valores del ordering desde cada fila.
+        paths.extend(self.ordering_paths())
+        paths.extend(self.list_extra_fields)
+        restrict = all(col.declares_reads() for col in self.list_columns)
+        return build_shape(self.model, paths, restrict=restrict)
+
+    def get_query_shape(self) -> QueryShape:
+        shape = getattr(self, "_query_shape", None)
+        if shape is None:
+            shape = self._query_shape = self.build_query_shape()
+        return shape
+
+    def apply_shape(self, qs: QuerySet) -> QuerySet:
+        if not self.query_shaping or not self.list_columns:
+            return qs
+        return self.get_query_shape().apply(qs)
+
+    def get_fragment_models(self) -> tuple[type, ...]:
+        """Modelos cuyos cambios invalidan los fragmentos cacheados y el ETag del listado."""
+
+        models = getattr(self, "_fragment_models", None)
+        if models is None:
+            found: list[type] = [self.model]
+            shape = self.get_query_shape()
+            for path in (*shape.select_related, *shape.prefetch_related):
+                current = self.model
+                for part in path.split("__"):
+                    current = current._meta.get_field(part).related_model
+                    if current not in found:
+                        found.append(current)
+            for model in self.fragment_cache_models:
+                if model not in found:
+                    found.append(model)
+            models = self._fragment_models = tuple(found)
+        return models
+
+    def fragment_cache_vary(self, request: HttpRequest) -> tuple:
+        """Partes extra de la clave si get_base_queryset depende del request (ej: org)."""
+
+        return ()
+
+    def get_row_plan(self) -> RowPlan:
+        plan = getattr(self, "_row_plan", None)
+        if plan is None:
+            plan = self._row_plan = RowPlan(self)
+        return plan
+
+    def rows_queryset(self, qs: QuerySet) -> QuerySet:
+        """Queryset que se pagina: instancias, o tuplas values_list si row_source="values"."""
+
+        fields = self.get_row_plan().values_fields
+        if fields is None:
+            return qs
+        return qs.values_list(*fields)
+
     def columns_for_template(self) -> list[dict]:
-        return [c.to_template_dict() for c in self.list_columns]
+        return list(self.get_row_plan().columns)
 
     def row_cells(self, obj: Any) -> list[Any]:
-        cells: list[Any] = []
-        for c in self.list_columns:
-            if c.value:
-                cells.append(c.value(obj))
-            else:
-                cells.append(getattr(obj, c.key, ""))
-        return cells
+        return list(self.get_row_plan().cells_from_object(obj))
 
     def row_urls(self, obj: Any, request: HttpRequest, params: CrudParams) -> dict:
-        """MVP: por defecto no define URLs. La app concreta debe sobrescribir."""
+        """URLs por fila. Default: row_url_names si se declaró; si no, placeholders.
 
-        return {"detail": None, "edit": "#", "delete": "#"}
+        Sobrescribir desactiva el camino rápido de build_items (se llama por fila).
+        """
+
+        urls: dict = {"detail": None, "edit": "#", "delete": "#"}
+        if self.row_url_names:
+            for key, build in self.get_row_plan().url_builders("").items():
+                urls[key] = build(obj.pk)
+        return urls
 
     # --- Step 8 helpers (defaults deben calzar con Step 4) ---
     def get_create_form_class(self) -> Type[forms.ModelForm] | None:
@@ -258,38 +583,152 @@ class CrudConfig:
     def can_delete(self, request: HttpRequest) -> bool:
         return CrudPermissionSpec(self.permission_delete).is_allowed(request)
 
+    def get_bulk_actions(self, request: HttpRequest) -> list[BulkActionDef]:
+        """Acciones masivas permitidas para el usuario (orden declarado)."""
+
+        allowed: list[BulkActionDef] = []
+        for action in self.bulk_actions:
+            if action.permission is not None:
+                ok = CrudPermissionSpec(action.permission).is_allowed(request)
+            elif action.kind == "delete":
+                ok = self.can_delete(request)
+            else:
+                ok = self.can_edit(request)
+            if ok:
+                allowed.append(action)
+        return allowed
+
+    def get_bulk_action(self, name: str, request: HttpRequest) -> BulkActionDef | None:
+        return next((a for a in self.get_bulk_actions(request) if a.name == name), None)
+
     def build_items(self, page_obj, request: HttpRequest, params: CrudParams) -> list[dict]:
+        """Filas para crud/_table.html usando el RowPlan compilado.
+
+        Metadata de columnas compartida, querystring calculado una vez por página y
+        URLs por concatenación. Si la app sobrescribe row_cells/row_urls, se respetan.
+        """
+
+        plan = self.get_row_plan()
         data = {k: v for k, v in params.as_dict().items() if v not in {"", "all"}}
         qs_with_page = urlencode(data)
+        columns = plan.columns
+        object_list = page_obj.object_list
+
+        if plan.values_fields is not None:
+            extract = plan.cells_from_values
+            get_pk = itemgetter(0)
+        elif type(self).row_cells is not CrudConfig.row_cells:
+            extract = self.row_cells
+            get_pk = attrgetter("pk")
+        else:
+            extract = plan.cells_from_object
+            get_pk = attrgetter("pk")
+
+        custom_urls = type(self).row_urls is not CrudConfig.row_urls
+        builders = plan.url_builders(qs_with_page) if not custom_urls else {}
 
         rows: list[dict] = []
-        for obj in page_obj.object_list:
-            urls = self.row_urls(obj, request, params)
-            # Preserva estado (incluye page) como en crud_example.
-            if qs_with_page:
-                for k in ("edit", "delete", "detail"):
-                    if urls.get(k) and urls[k] not in {"#", None} and "?" not in str(urls[k]):
-                        urls[k] = f"{urls[k]}?{qs_with_page}"
-
-            # Build rich cells with column definition
-            raw_cells = self.row_cells(obj)
-            rich_cells = []
-            for i, val in enumerate(raw_cells):
-                col = self.list_columns[i]
-                rich_cells.append({
-                    "value": val,
-                    "col": col.to_template_dict()
-                })
+        for obj in object_list:
+            pk = get_pk(obj)
+            if custom_urls:
+                urls = self.row_urls(obj, request, params)
+                # Preserva estado (incluye page) como en crud_example.
+                if qs_with_page:
+                    for k in ("edit", "delete", "detail"):
+                        if urls.get(k) and urls[k] not in {"#", None} and "?" not in str(urls[k]):
+                            urls[k] = f"{urls[k]}?{qs_with_page}"
+            else:
+                urls = {"detail": None, "edit": "#", "delete": "#"}
+                for k, build in builders.items():
+                    urls[k] = build(pk)
 
             rows.append(
                 {
-                    "id": getattr(obj, "pk"),
-                    "cells": rich_cells,
+                    "id": pk,
+                    "cells": [{"value": v, "col": c} for v, c in zip(extract(obj), columns)],
                     "urls": urls,
                 }
             )
         return rows
 
-    def paginate(self, qs: QuerySet, params: CrudParams):
-        paginator = Paginator(qs, self.page_size)
+    def paginate(
+        self, qs: QuerySet, params: CrudParams, *, mode: str | None = None, count: bool = True
+    ):
+        """Page de Django (offset) o KeysetPage (cursor) según pagination_mode.
+
+        Keyset usa el ordering que produce apply_ordering (campos + pk); si el
+        queryset no tiene un ordering apto, cae a offset. count=False omite el total
+        (fallback por query_timeout_ms).
+        """
+
+        plan = self.get_row_plan()
+        qs = self.rows_queryset(qs)
+
+        if (mode or self.pagination_mode) == "keyset":
+            page = paginate_keyset(
+                qs,
+                cursor=params.cursor,
+                page_size=self.page_size,
+                salt=f"{CURSOR_SALT}:{self.crud_slug}",
+                getter_for=plan.value_getter if plan.values_fields is not None else None,
+            )
+            if page is not None:
+                if count:
+                    page.total_count, page.count_is_estimate = self.count_rows(qs, params)
+                return page
+
+        if not count:
+            return uncounted_page(qs, per_page=self.page_size, number=params.page or 1)
+        if self.count_strategy == "window":
+            return window_page(qs, per_page=self.page_size, number=params.page or 1)
+
+        total, estimated = self.count_rows(qs, params)
+        paginator = CountedPaginator(qs, self.page_size, count=total, estimated=estimated)
         return paginator.get_page(params.page or 1)
+
+    def scroll_queryset(self, qs: QuerySet, params: CrudParams):
+        """(filas desde params.cursor, cursor_for) para scroll infinito; None sin ordering apto."""
+
+        plan = self.get_row_plan()
+        return keyset_after(
+            self.rows_queryset(qs),
+            cursor=params.cursor,
+            salt=f"{CURSOR_SALT}:{self.crud_slug}",
+            getter_for=plan.value_getter if plan.values_fields is not None else None,
+        )
+
+    def count_rows(self, qs: QuerySet, params: CrudParams) -> tuple[int, bool]:
+        """(total, es_estimado) según count_strategy. Se calcula una sola vez por render."""
+
+        return count_queryset(
+            qs,
+            strategy=self.count_strategy,
+            key_prefix=self.crud_slug,
+            timeout=self.count_cache_timeout,
+        )
+
+    # --- Async (ASGI): hooks equivalentes con el ORM async (acount / async for) ---
+    async def apaginate(self, qs: QuerySet, params: CrudParams, *, mode: str | None = None):
+        """Como paginate, pero con object_list materializado sin bloquear el event loop.
+
+        Keyset decodifica cursor + una query LIMIT: se delega a paginate en un thread.
+        """
+
+        if (mode or self.pagination_mode) == "keyset":
+            return await sync_to_async(self.paginate)(qs, params, mode="keyset")
+
+        qs = self.rows_queryset(qs)
+        if self.count_strategy == "window":
+            return await awindow_page(qs, per_page=self.page_size, number=params.page or 1)
+
+        total, estimated = await self.acount_rows(qs, params)
+        paginator = CountedPaginator(qs, self.page_size, count=total, estimated=estimated)
+        return await apage(paginator, params.page or 1)
+
+    async def acount_rows(self, qs: QuerySet, params: CrudParams) -> tuple[int, bool]:
+        return await acount_queryset(
+            qs,
+            strategy=self.count_strategy,
+            key_prefix=self.crud_slug,
+            timeout=self.count_cache_timeout,
+        )
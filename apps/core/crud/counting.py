@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Count, QuerySet, Window
+
+
+COUNT_STRATEGIES = {"exact", "window", "cached", "estimated"}
+
+# Por debajo de este estimado, COUNT(*) exacto es barato y más honesto.
+ESTIMATE_EXACT_BELOW = 1000
+
+# Sin "_" inicial: values_list(named=True) no acepta nombres privados.
+_WINDOW_ALIAS = "crud_total_count"
+
+
+class CountedPaginator(Paginator):
+    """Paginator con count ya calculado (evita un segundo COUNT(*))."""
+
+    def __init__(self, object_list, per_page, *, count: int, estimated: bool = False, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        # count es cached_property en Paginator: se pre-llena la cache.
+        self.__dict__["count"] = count
+        self.count_is_estimate = estimated
+
+
+def _fingerprint(qs: QuerySet) -> str | None:
+    try:
+        sql, params = qs.order_by().query.sql_with_params()
+    except Exception:
+        # EmptyResultSet y similares: no se cachea.
+        return None
+    raw = f"{qs.db}|{sql}|{params!r}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def cached_count(qs: QuerySet, *, key_prefix: str, timeout: int) -> int:
+    """COUNT(*) cacheado por huella del filtro (SQL + params) con TTL."""
+
+    fp = _fingerprint(qs)
+    if fp is None:
+        return qs.count()
+
+    key = f"crud:count:{key_prefix}:{fp}"
+    value = cache.get(key)
+    if value is None:
+        value = qs.count()
+        cache.set(key, value, timeout)
+    return int(value)
+
+
+def _planner_estimate(qs: QuerySet) -> int | None:
+    conn = connections[qs.db]
+    table = qs.model._meta.db_table
+    try:
+        with conn.cursor() as cursor:
+            if conn.vendor == "postgresql":
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [conn.ops.quote_name(table)],
+                )
+                row = cursor.fetchone()
+                # reltuples = -1 si la tabla nunca fue analizada.
+                return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+            if conn.vendor == "sqlite":
+                # Requiere ANALYZE; el primer número de stat es el total de filas.
+                cursor.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1", [table])
+                row = cursor.fetchone()
+                return int(str(row[0]).split()[0]) if row and row[0] else None
+            if conn.vendor == "mysql":
+                cursor.execute(
+                    "SELECT TABLE_ROWS FROM information_schema.TABLES "
+                    "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+                    [table],
+                )
+                row = cursor.fetchone()
+                return int(row[0]) if row and row[0] is not None else None
+    except (DatabaseError, ValueError):
+        return None
+    return None
+
+
+def estimated_count(qs: QuerySet) -> tuple[int, bool]:
+    """Estimado del planner para listas SIN filtros; si no aplica, COUNT(*) exacto.
+
+    Devuelve (count, es_estimado).
+    """
+
+    if qs.query.has_filters() or qs.query.distinct or qs.query.is_sliced:
+        return qs.count(), False
+
+    estimate = _planner_estimate(qs)
+    if estimate is None or estimate < ESTIMATE_EXACT_BELOW:
+        return qs.count(), False
+    return estimate, True
+
+
+def count_queryset(
+    qs: QuerySet, *, strategy: str, key_prefix: str, timeout: int
+) -> tuple[int, bool]:
+    """Cuenta según la estrategia. "window" no aplica fuera de la página: cuenta exacto."""
+
+    if strategy == "cached":
+        return cached_count(qs, key_prefix=key_prefix, timeout=timeout), False
+    if strategy == "estimated":
+        return estimated_count(qs)
+    return qs.count(), False
+
+
+def window_page(qs: QuerySet, *, per_page: int, number: Any) -> Page:
+    """Trae la página y el total en una sola query (COUNT(*) OVER ())."""
+
+    try:
+        number = max(1, int(number))
+    except (TypeError, ValueError):
+        number = 1
+
+    offset = (number - 1) * per_page
+    rows = list(qs.annotate(**{_WINDOW_ALIAS: Window(Count("*"))})[offset : offset + per_page])
+
+    if not rows and number > 1:
+        # Página fuera de rango: mismo comportamiento que Paginator.get_page (última página).
+        paginator = CountedPaginator(qs, per_page, count=qs.count())
+        return paginator.get_page(number)
+
+    total = 0
+    if rows:
+        # values_list agrega la anotación al final de la tupla.
+        first = rows[0]
+        total = first[-1] if isinstance(first, tuple) else getattr(first, _WINDOW_ALIAS)
+    paginator = CountedPaginator(qs, per_page, count=total)
+    return Page(rows, number, paginator)
+
+
+def uncounted_page(qs: QuerySet, *, per_page: int, number: Any) -> Page:
+    """Página sin COUNT(*) (fallback por timeout): per_page + 1 filas para saber si hay más."""
+
+    try:
+        number = max(1, int(number))
+    except (TypeError, ValueError):
+        number = 1
+
+    offset = (number - 1) * per_page
+    rows = list(qs[offset : offset + per_page + 1])
+    # count = cota inferior: num_pages llega justo a la página siguiente si existe.
+    paginator = CountedPaginator(qs, per_page, count=offset + len(rows))
+    paginator.count_is_unknown = True
+    return Page(rows[:per_page], number, paginator)
+
+
+# --- Async (ASGI): mismas estrategias con el ORM async ---
+async def acached_count(qs: QuerySet, *, key_prefix: str, timeout: int) -> int:
+    fp = _fingerprint(qs)
+    if fp is None:
+        return await qs.acount()
+
+    key = f"crud:count:{key_prefix}:{fp}"
+    value = await cache.aget(key)
+    if value is None:
+        value = await qs.acount()
+        await cache.aset(key, value, timeout)
+    return int(value)
+
+
+async def acount_queryset(
+    qs: QuerySet, *, strategy: str, key_prefix: str, timeout: int
+) -> tuple[int, bool]:
+    if strategy == "cached":
+        return await acached_count(qs, key_prefix=key_prefix, timeout=timeout), False
+    if strategy == "estimated":
+        # Estadísticas del planner: SQL crudo (cursor sync) en un thread.
+        return await sync_to_async(estimated_count)(qs)
+    return await qs.acount(), False
+
+
+def _page_number(paginator: Paginator, number: Any) -> int:
+    """Mismo criterio que Paginator.get_page, sin tocar la BD (count ya calculado)."""
+
+    try:
+        return paginator.validate_number(number)
+    except PageNotAnInteger:
+        return 1
+    except EmptyPage:
+        return paginator.num_pages
+
+
+async def apage(paginator: CountedPaginator, number: Any) -> Page:
+    """Page con object_list ya materializado (los templates no pueden consultar en async)."""
+
+    number = _page_number(paginator, number)
+    bottom = (number - 1) * paginator.per_page
+    rows = [row async for row in paginator.object_list[bottom : bottom + paginator.per_page]]
+    return Page(rows, number, paginator)
+
+
+async def awindow_page(qs: QuerySet, *, per_page: int, number: Any) -> Page:
+    try:
+        number = max(1, int(number))
+    except (TypeError, ValueError):
+        number = 1
+
+    offset = (number - 1) * per_page
+    annotated = qs.annotate(**{_WINDOW_ALIAS: Window(Count("*"))})
+    rows = [row async for row in annotated[offset : offset + per_page]]
+
+    if not rows and number > 1:
+        paginator = CountedPaginator(qs, per_page, count=await qs.acount())
+        return await apage(paginator, number)
+
+    total = 0
+    if rows:
+        first = rows[0]
+        total = first[-1] if isinstance(first, tuple) else getattr(first, _WINDOW_ALIAS)
+    return Page(rows, number, CountedPaginator(qs, per_page, count=total))
+
+
+def page_total(page_obj) -> tuple[int | None, bool]:
+    """(total, es_estimado) de una Page/KeysetPage sin volver a contar."""
+
+    if getattr(page_obj, "is_keyset", False):
+        return page_obj.total_count, page_obj.count_is_estimate
+    paginator = page_obj.paginator
+    if getattr(paginator, "count_is_unknown", False):
+        return None, False
+    return paginator.count, getattr(paginator, "count_is_estimate", False)
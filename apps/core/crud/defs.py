@@ -9,6 +9,9 @@ from django.http import HttpRequest
 
 ValueFunc = Callable[[Any], str]
 ApplyFilterFunc = Callable[[QuerySet, str, HttpRequest], QuerySet]
+BulkHandlerFunc = Callable[[QuerySet, HttpRequest], "int | None"]
+# (config, count, start) → filas creadas (ver CrudBudget.seed).
+BudgetSeedFunc = Callable[[Any, int, int], int]
 
 
 @dataclass(frozen=True)
@@ -21,6 +24,9 @@ class ColumnDef:
     - extra: configuración extra para el tipo (ej: mapa de colores para badge)
     - order_by: campo(s) reales para QuerySet.order_by
     - value: función que produce el string final para la celda
+    - fields: paths del modelo que lee la celda (ej: "user__email"). El engine los usa
+      para only()/select_related()/prefetch_related(). Sin value, la celda es el valor
+      de fields[0] (o de `key` si no hay fields).
     """
 
     key: str
@@ -32,6 +38,19 @@ class ColumnDef:
 
     order_by: str | tuple[str, ...] | None = None
     value: ValueFunc | None = None
+    fields: tuple[str, ...] = ()
+
+    def read_paths(self) -> tuple[str, ...]:
+        """Paths que lee la celda: los declarados, o `key` si no hay value."""
+
+        if self.fields:
+            return tuple(self.fields)
+        if self.value is None:
+            return (self.key,)
+        return ()
+
+    def declares_reads(self) -> bool:
+        return bool(self.fields) or self.value is None
 
     def to_template_dict(self) -> dict:
         return {
@@ -50,10 +69,74 @@ class FilterDef:
 
     - name: nombre en querystring (ej: status)
     - apply: función que aplica el filtro al queryset
+    - field: campo que filtra por igualdad (opcional; lo usan crud_index_advisor y facetas)
+    - facet: mostrar conteos por valor (requiere field; ver apps.core.crud.facets)
+    - label: texto visible de la faceta (default: verbose_name de field)
+    - options: (valor, label) de la faceta; default: status_options/choices o GROUP BY
     """
 
     name: str
     apply: ApplyFilterFunc
+    field: str | None = None
+    facet: bool = False
+    label: str = ""
+    options: tuple[tuple[Any, str], ...] = ()
 
     def apply_to(self, qs: QuerySet, value: str, request: HttpRequest) -> QuerySet:
         return self.apply(qs, value, request)
+
+
+BULK_KINDS = {"delete", "update", "custom"}
+
+
+@dataclass(frozen=True)
+class BulkActionDef:
+    """Acción masiva declarativa (set-based, por lotes de pk).
+
+    - name: value del select (action=<name>)
+    - label: texto visible
+    - kind: "delete" | "update" | "custom"
+    - values: campos a asignar con kind="update" (ej: {"status": "inactive"})
+    - handler: kind="custom": handler(qs_del_lote, request) -> filas afectadas (o None)
+    - permission: spec de CrudPermissionSpec; default: delete -> permission_delete,
+      update/custom -> permission_edit
+    """
+
+    name: str
+    label: str
+    kind: str = "update"
+    values: dict = field(default_factory=dict)
+    handler: BulkHandlerFunc | None = None
+    permission: str | None = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in BULK_KINDS:
+            raise ValueError(f"BulkActionDef '{self.name}': kind inválido: {self.kind}")
+        if self.kind == "update" and not self.values:
+            raise ValueError(f"BulkActionDef '{self.name}': kind='update' requiere values")
+        if self.kind == "custom" and self.handler is None:
+            raise ValueError(f"BulkActionDef '{self.name}': kind='custom' requiere handler")
+
+
+@dataclass(frozen=True)
+class CrudBudget:
+    """Presupuesto de render de un CrudConfig (ver apps.core.crud.budget / crud_budget).
+
+    - max_queries / max_ms: por render de list y table, en cada page size
+    - export_max_queries / export_max_ms: por export completo (seed_rows filas)
+    - page_sizes: tamaños de página a medir; las queries de table deben ser iguales en
+      todos (allow_query_growth=True lo desactiva)
+    - seed_rows: filas sintéticas (apps.core.crud.budget.seed_config)
+    - seed: generador propio (config, count, start) → filas creadas, o su dotted path;
+      para get_base_queryset que filtra por org/usuario o modelos que el generador
+      genérico no cubre (start: índice de la primera fila, para valores únicos)
+    """
+
+    max_queries: int = 8
+    max_ms: float = 300.0
+    export_max_queries: int = 4
+    export_max_ms: float = 3000.0
+    page_sizes: tuple[int, ...] = (10, 50, 100)
+    seed_rows: int = 120
+    allow_query_growth: bool = False
+    seed: BudgetSeedFunc | str | None = None
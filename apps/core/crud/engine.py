@@ -1,8 +1,118 @@
 from __future__ import annotations
 
-from django.http import HttpRequest
+import json
+import logging
+from functools import partial, wraps
+from itertools import islice
+from types import SimpleNamespace
+from typing import Any, Iterable, Iterator
+from urllib.parse import urlencode, urlparse
 
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.contrib import messages
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    StreamingHttpResponse,
+)
+from django.shortcuts import render
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+from apps.core import db_router
+
+from . import cache as fragment_cache
+from . import conditional, prefetch
+from .bulk import BulkError, run_bulk_action, select_all_token, selection_queryset, with_query
+from .conditional import ListValidator
 from .config import CrudConfig
+from .counting import page_total
+from .permissions import aresolve_permissions
+from .timeouts import QueryTimeout
+
+TABLE_TEMPLATE = "crud/_table.html"
+LIST_TEMPLATE = "crud/list.html"
+FACETS_OOB_TEMPLATE = "crud/_facets_oob.html"
+REFINE_TEMPLATE = "crud/_refine.html"
+ROW_OOB_TEMPLATE = "crud/_row_oob.html"
+ROW_TEMPLATE = "crud/_row.html"
+ROWS_SENTINEL_TEMPLATE = "crud/_rows_sentinel.html"
+# Separador entre tandas del bloque en streaming (crud.js pinta hasta la última marca).
+ROWS_STREAM_MARK = "<!--crud-rows-->"
+LIST_CONTENT_TEMPLATE = "crud/_list_content.html"
+# Marcas de corte del streaming de página completa (CrudConfig.stream_page).
+STREAM_SLOT = "<!--crud-stream-->"
+STREAM_TABLE_SLOT = "<!--crud-stream-table-->"
+STREAM_ROWS_SLOT = "<!--crud-stream-rows-->"
+TABLE_OOB_TEMPLATE = "crud/_table_oob.html"
+
+# Respuestas por query_timeout_ms (X-Crud-Cache): sin ETag ni facetas.
+DEGRADED_STATES = {"stale", "uncounted", "refine"}
+
+logger = logging.getLogger(__name__)
+
+
+def _replica_reads(fn):
+    """CrudConfig.read_replica: las lecturas del render (y de su streaming) van a la réplica."""
+
+    if iscoroutinefunction(fn):
+
+        @wraps(fn)
+        async def async_wrapper(*, config: CrudConfig, request: HttpRequest, **kwargs):
+            call = partial(fn, config=config, request=request, **kwargs)
+            if not config.read_replica:
+                return await call()
+            return await db_router.acall_with_replica(request, call)
+
+        return async_wrapper
+
+    @wraps(fn)
+    def wrapper(*, config: CrudConfig, request: HttpRequest, **kwargs):
+        call = partial(fn, config=config, request=request, **kwargs)
+        if not config.read_replica:
+            return call()
+        return db_router.call_with_replica(request, call)
+
+    return wrapper
+
+
+def _list_context(
+    *, config: CrudConfig, request: HttpRequest, params, page_obj, crud_urls: dict
+) -> dict:
+    # El total sale del paginator (count_strategy): nunca un segundo COUNT(*).
+    total_count, total_count_estimated = page_total(page_obj)
+
+    qs_without_page = config.build_qs_without_page(params)
+
+    ctx = {
+        "crud_urls": crud_urls,
+        "page_title": config.page_title or "Listado",
+        "entity_label": config.entity_label or "",
+        "entity_label_plural": config.entity_label_plural or "",
+        "current_filters": params.as_dict(),
+        "status_options": config.status_options,
+        "columns": config.columns_for_template(),
+        "items": config.build_items(page_obj, request, params),
+        "page_obj": page_obj,
+        "total_count": total_count,
+        "total_count_estimated": total_count_estimated,
+        "qs": qs_without_page,
+    }
+    if config.infinite_scroll and crud_urls.get("rows"):
+        ctx["infinite_scroll"] = True
+        ctx["rows_sentinel"] = ""
+        if getattr(page_obj, "is_keyset", False) and page_obj.has_next():
+            ctx["rows_sentinel"] = _rows_sentinel(config, crud_urls, params, page_obj.next_cursor)
+    if config.bulk_actions:
+        # bulk_actions=[] (sin permisos) oculta la barra; None deja el default del template.
+        ctx["bulk_actions"] = [(a.name, a.label) for a in config.get_bulk_actions(request)]
+        ctx["bulk_select_all_token"] = select_all_token(config, request, qs_without_page)
+        ctx["bulk_list_qs"] = urlencode(
+            {k: v for k, v in params.as_dict().items() if v not in {"", "all"}}
+        )
+    return ctx
 
 
 def build_list_context(
@@ -10,16 +120,49 @@ def build_list_context(
     config: CrudConfig,
     request: HttpRequest,
     crud_urls: dict,
+    pagination_mode: str | None = None,
+    count: bool = True,
 ) -> dict:
     """Construye el context contract requerido por templates/crud/*.
 
     LIST ONLY: columnas/items/page_obj/filters/ordering/paginación.
+    pagination_mode permite forzar "offset"/"keyset" por vista (default: el de la config).
+    count=False: sin total (total_count=None).
     """
 
     params = config.parse_params(request)
     qs = config.queryset_for_list(request, params)
-    page_obj = config.paginate(qs, params)
+    page_obj = config.paginate(qs, params, mode=pagination_mode, count=count)
+    return _list_context(
+        config=config, request=request, params=params, page_obj=page_obj, crud_urls=crud_urls
+    )
+
 
+async def abuild_list_context(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    pagination_mode: str | None = None,
+) -> dict:
+    """build_list_context para vistas async: COUNT y página con el ORM async.
+
+    Con row_source="objects", las columnas no deben leer relaciones fuera del query
+    shape (un acceso lazy es sync y falla dentro del event loop).
+    """
+
+    # can_edit/can_delete/bulk se evalúan por fila: snapshot de permisos antes.
+    await aresolve_permissions(request)
+    params = config.parse_params(request)
+    # get_base_queryset/backends de búsqueda pueden consultar la BD al armar el queryset.
+    qs = await sync_to_async(config.queryset_for_list)(request, params)
+    page_obj = await config.apaginate(qs, params, mode=pagination_mode)
+    return _list_context(
+        config=config, request=request, params=params, page_obj=page_obj, crud_urls=crud_urls
+    )
+
+
+def _summary_context(config: CrudConfig, params, crud_urls: dict, entry: dict) -> dict:
     return {
         "crud_urls": crud_urls,
         "page_title": config.page_title or "Listado",
@@ -27,9 +170,854 @@ def build_list_context(
         "entity_label_plural": config.entity_label_plural or "",
         "current_filters": params.as_dict(),
         "status_options": config.status_options,
-        "columns": config.columns_for_template(),
-        "items": config.build_items(page_obj, request, params),
-        "page_obj": page_obj,
-        "total_count": qs.count(),
+        "total_count": entry["total_count"],
+        "total_count_estimated": entry["total_count_estimated"],
         "qs": config.build_qs_without_page(params),
+        "table_html": mark_safe(entry["html"]),
+    }
+
+
+def _key_extra(crud_urls: dict, pagination_mode: str | None) -> tuple:
+    return (pagination_mode or "", *sorted(crud_urls.items()))
+
+
+def _fragment_lookup(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    template_name: str,
+    pagination_mode: str | None,
+    validator: ListValidator | None = None,
+) -> tuple[str | None, dict | None]:
+    """(clave, entrada cacheada). Clave None = cache desactivada o no aplicable.
+
+    validator: ETag ya calculado para el mismo template (comparte el digest).
+    """
+
+    if not config.fragment_cache_timeout:
+        return None, None
+    if validator is not None:
+        key = fragment_cache.fragment_key_for(config, validator.digest)
+    else:
+        key = fragment_cache.fragment_key(
+            config,
+            request,
+            config.parse_params(request),
+            template_name=template_name,
+            extra=_key_extra(crud_urls, pagination_mode),
+        )
+    if not key:
+        return None, None
+    entry = fragment_cache.get_fragment(key)
+    if entry is not None:
+        fragment_cache.record(config.crud_slug, hit=True)
+    return key, entry
+
+
+def _entry_for(ctx: dict, html: str) -> dict:
+    return {
+        "html": html,
+        "total_count": ctx["total_count"],
+        "total_count_estimated": ctx["total_count_estimated"],
+        # Página siguiente: permite encadenar el prefetch también desde un hit.
+        "next": prefetch.next_page_query(ctx["current_filters"], ctx["page_obj"]),
+    }
+
+
+def _fragment_timeout(config: CrudConfig) -> int:
+    """TTL de un fragmento recién renderizado (también el del prefetch)."""
+
+    timeout = config.fragment_cache_timeout
+    if db_router.reading_replica():
+        # La réplica puede ir atrasada respecto de la versión de la clave: copia de vida corta.
+        timeout = min(timeout, db_router.pin_seconds() or timeout)
+    return timeout
+
+
+def _fragment_store(
+    config: CrudConfig, key: str | None, ctx: dict, html: str, stale_key: str | None = None
+) -> tuple[dict, str]:
+    entry = _entry_for(ctx, html)
+    if stale_key:
+        fragment_cache.set_fragment(stale_key, entry, config.stale_fragment_timeout)
+    if not key:
+        return entry, "off"
+    fragment_cache.record(config.crud_slug, hit=False)
+    fragment_cache.set_fragment(key, entry, _fragment_timeout(config))
+    return entry, "miss"
+
+
+def _budgeted_list_context(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    pagination_mode: str | None,
+    count: bool = True,
+) -> dict:
+    with config.query_budget():
+        return build_list_context(
+            config=config,
+            request=request,
+            crud_urls=crud_urls,
+            pagination_mode=pagination_mode,
+            count=count,
+        )
+
+
+def _stale_key(
+    config: CrudConfig, request: HttpRequest, template_name: str, crud_urls: dict, pagination_mode
+) -> str | None:
+    if not (config.query_timeout_ms and config.stale_fragment_timeout):
+        return None
+    return fragment_cache.stale_fragment_key(
+        config,
+        request,
+        config.parse_params(request),
+        template_name=template_name,
+        extra=_key_extra(crud_urls, pagination_mode),
+    )
+
+
+def _degraded_entry(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    template_name: str,
+    pagination_mode: str | None,
+    stale_key: str | None,
+) -> tuple[dict, dict | None, str]:
+    """Fallback tras QueryTimeout: último fragmento bueno → página sin conteo → "refina"."""
+
+    logger.warning(
+        "%s: listado excedió query_timeout_ms=%s (%s)",
+        config.crud_slug,
+        config.query_timeout_ms,
+        request.GET.urlencode(),
+    )
+    if stale_key:
+        entry = fragment_cache.get_fragment(stale_key)
+        if entry is not None:
+            return entry, None, "stale"
+
+    unknown = {"total_count": None, "total_count_estimated": False}
+    try:
+        ctx = _budgeted_list_context(
+            config=config,
+            request=request,
+            crud_urls=crud_urls,
+            pagination_mode=pagination_mode,
+            count=False,
+        )
+    except QueryTimeout:
+        html = render_to_string(
+            REFINE_TEMPLATE,
+            {
+                "crud_urls": crud_urls,
+                "entity_label_plural": config.entity_label_plural or "",
+                "current_filters": config.parse_params(request).as_dict(),
+            },
+            request=request,
+        )
+        return {"html": html, **unknown}, None, "refine"
+    html = render_to_string(template_name, ctx, request=request)
+    return {"html": html, **unknown}, ctx, "uncounted"
+
+
+def _fragment_entry(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    template_name: str,
+    pagination_mode: str | None,
+    validator: ListValidator | None = None,
+) -> tuple[dict, dict | None, str]:
+    """(entry, ctx, estado): entry = {html, total_count, total_count_estimated}.
+
+    ctx es None si no se armó el listado (hit, stale, refine).
+    estado: "hit" | "miss" | "off" | DEGRADED_STATES (query_timeout_ms excedido).
+    """
+
+    key, entry = _fragment_lookup(
+        config=config,
+        request=request,
+        crud_urls=crud_urls,
+        template_name=template_name,
+        pagination_mode=pagination_mode,
+        validator=validator,
+    )
+    if entry is not None:
+        return entry, None, "hit"
+
+    stale_key = _stale_key(config, request, template_name, crud_urls, pagination_mode)
+    try:
+        ctx = _budgeted_list_context(
+            config=config, request=request, crud_urls=crud_urls, pagination_mode=pagination_mode
+        )
+    except QueryTimeout:
+        return _degraded_entry(
+            config=config,
+            request=request,
+            crud_urls=crud_urls,
+            template_name=template_name,
+            pagination_mode=pagination_mode,
+            stale_key=stale_key,
+        )
+    html = render_to_string(template_name, ctx, request=request)
+    entry, state = _fragment_store(config, key, ctx, html, stale_key)
+    return entry, ctx, state
+
+
+async def _afragment_entry(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    template_name: str,
+    pagination_mode: str | None,
+    validator: ListValidator | None = None,
+) -> tuple[dict, dict | None, str]:
+    await aresolve_permissions(request)  # la huella de la clave usa can_*
+    key, entry = _fragment_lookup(
+        config=config,
+        request=request,
+        crud_urls=crud_urls,
+        template_name=template_name,
+        pagination_mode=pagination_mode,
+        validator=validator,
+    )
+    if entry is not None:
+        return entry, None, "hit"
+
+    stale_key = _stale_key(config, request, template_name, crud_urls, pagination_mode)
+    if config.query_timeout_ms:
+        # El límite vive en la conexión del thread: el listado completo corre ahí.
+        try:
+            ctx = await sync_to_async(_budgeted_list_context)(
+                config=config, request=request, crud_urls=crud_urls, pagination_mode=pagination_mode
+            )
+        except QueryTimeout:
+            return await sync_to_async(_degraded_entry)(
+                config=config,
+                request=request,
+                crud_urls=crud_urls,
+                template_name=template_name,
+                pagination_mode=pagination_mode,
+                stale_key=stale_key,
+            )
+    else:
+        ctx = await abuild_list_context(
+            config=config, request=request, crud_urls=crud_urls, pagination_mode=pagination_mode
+        )
+    # Los context processors (GlobalConfig, navegación) consultan la BD: render en thread.
+    html = await sync_to_async(render_to_string)(template_name, ctx, request=request)
+    entry, state = _fragment_store(config, key, ctx, html, stale_key)
+    return entry, ctx, state
+
+
+def _prefetch_next(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    template_name: str,
+    pagination_mode: str | None,
+    entry: dict,
+) -> None:
+    """Renderiza la página siguiente en background bajo su misma clave versionada."""
+
+    if not (config.prefetch_next_page and config.fragment_cache_timeout and entry.get("next")):
+        return
+    next_request = with_query(request, entry["next"])
+    next_request.META = request.META.copy()  # get_token() marca META; no compartirlo
+    key = fragment_cache.fragment_key(
+        config,
+        next_request,
+        config.parse_params(next_request),
+        template_name=template_name,
+        extra=_key_extra(crud_urls, pagination_mode),
+    )
+    if not key or fragment_cache.get_fragment(key) is not None:
+        return
+
+    def task() -> None:
+        try:
+            ctx = _budgeted_list_context(
+                config=config,
+                request=next_request,
+                crud_urls=crud_urls,
+                pagination_mode=pagination_mode,
+            )
+        except QueryTimeout:
+            return
+        html = render_to_string(template_name, ctx, request=next_request)
+        # Corre en el contexto copiado: si la página leyó de la réplica, el TTL se acota igual.
+        fragment_cache.set_fragment(key, _entry_for(ctx, html), _fragment_timeout(config))
+
+    prefetch.schedule(key, task)
+
+
+def _fragment_response(entry: dict, state: str, facets_html: str = "") -> HttpResponse:
+    response = HttpResponse(entry["html"] + facets_html)
+    response["X-Crud-Cache"] = state
+    return response
+
+
+def _facets_oob(config: CrudConfig, request: HttpRequest) -> str:
+    """Selects de facetas con conteos nuevos (hx-swap-oob), fuera del fragmento cacheado."""
+
+    params = config.parse_params(request)
+    facets = config.get_facets(request, params)
+    if not facets:
+        return ""
+    return render_to_string(
+        FACETS_OOB_TEMPLATE, {"facets": facets, "current_filters": params.as_dict()}
+    )
+
+
+@_replica_reads
+def render_list_fragment(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    template_name: str = TABLE_TEMPLATE,
+    pagination_mode: str | None = None,
+) -> HttpResponse:
+    """Partial de tabla (HTMX) servido desde la cache de fragmentos si está activa.
+
+    Con conditional_get, If-None-Match vigente → 304 sin ejecutar la query.
+    """
+
+    validator = conditional.list_etag(
+        config, request, template_name=template_name, extra=_key_extra(crud_urls, pagination_mode)
+    )
+    response = conditional.not_modified(request, validator)
+    if response is not None:
+        return response
+
+    entry, _, state = _fragment_entry(
+        config=config,
+        request=request,
+        crud_urls=crud_urls,
+        template_name=template_name,
+        pagination_mode=pagination_mode,
+        validator=validator,
+    )
+    if state in DEGRADED_STATES:
+        return conditional.apply_validator(_fragment_response(entry, state), None)
+    _prefetch_next(
+        config=config,
+        request=request,
+        crud_urls=crud_urls,
+        template_name=template_name,
+        pagination_mode=pagination_mode,
+        entry=entry,
+    )
+    response = _fragment_response(entry, state, _facets_oob(config, request))
+    return conditional.apply_validator(response, validator)
+
+
+@_replica_reads
+async def arender_list_fragment(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    template_name: str = TABLE_TEMPLATE,
+    pagination_mode: str | None = None,
+) -> HttpResponse:
+    await aresolve_permissions(request)
+    # Versiones y huella leen cache/sesión (backends sync): en un thread.
+    validator = await sync_to_async(conditional.list_etag)(
+        config, request, template_name=template_name, extra=_key_extra(crud_urls, pagination_mode)
+    )
+    response = conditional.not_modified(request, validator)
+    if response is not None:
+        return response
+
+    entry, _, state = await _afragment_entry(
+        config=config,
+        request=request,
+        crud_urls=crud_urls,
+        template_name=template_name,
+        pagination_mode=pagination_mode,
+        validator=validator,
+    )
+    if state in DEGRADED_STATES:
+        return conditional.apply_validator(_fragment_response(entry, state), None)
+    await sync_to_async(_prefetch_next)(
+        config=config,
+        request=request,
+        crud_urls=crud_urls,
+        template_name=template_name,
+        pagination_mode=pagination_mode,
+        entry=entry,
+    )
+    facets_html = await sync_to_async(_facets_oob)(config, request)
+    response = _fragment_response(entry, state, facets_html)
+    return conditional.apply_validator(response, validator)
+
+
+def build_list_page_context(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    pagination_mode: str | None = None,
+) -> dict:
+    """Context de crud/list.html. Con cache activa comparte la entrada del partial:
+
+    un hit arma el header sin queries y un miss deja la tabla lista para el load HTMX.
+    Sin cache ni query_timeout_ms, equivale a build_list_context.
+    """
+
+    params = config.parse_params(request)
+    state = "off"
+    if not config.fragment_cache_timeout and not config.query_timeout_ms:
+        ctx = build_list_context(
+            config=config, request=request, crud_urls=crud_urls, pagination_mode=pagination_mode
+        )
+    else:
+        entry, ctx, state = _fragment_entry(
+            config=config,
+            request=request,
+            crud_urls=crud_urls,
+            template_name=TABLE_TEMPLATE,
+            pagination_mode=pagination_mode,
+        )
+        if ctx is None:
+            ctx = _summary_context(config, params, crud_urls, entry)
+        else:
+            ctx["table_html"] = mark_safe(entry["html"])
+        if state not in DEGRADED_STATES:
+            _prefetch_next(
+                config=config,
+                request=request,
+                crud_urls=crud_urls,
+                template_name=TABLE_TEMPLATE,
+                pagination_mode=pagination_mode,
+                entry=entry,
+            )
+    ctx["crud_degraded"] = state in DEGRADED_STATES
+    ctx["facets"] = {} if ctx["crud_degraded"] else config.get_facets(request, params)
+    return ctx
+
+
+async def abuild_list_page_context(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    pagination_mode: str | None = None,
+) -> dict:
+    params = config.parse_params(request)
+    state = "off"
+    if not config.fragment_cache_timeout and not config.query_timeout_ms:
+        ctx = await abuild_list_context(
+            config=config, request=request, crud_urls=crud_urls, pagination_mode=pagination_mode
+        )
+    else:
+        entry, ctx, state = await _afragment_entry(
+            config=config,
+            request=request,
+            crud_urls=crud_urls,
+            template_name=TABLE_TEMPLATE,
+            pagination_mode=pagination_mode,
+        )
+        if ctx is None:
+            ctx = _summary_context(config, params, crud_urls, entry)
+        else:
+            ctx["table_html"] = mark_safe(entry["html"])
+        if state not in DEGRADED_STATES:
+            await sync_to_async(_prefetch_next)(
+                config=config,
+                request=request,
+                crud_urls=crud_urls,
+                template_name=TABLE_TEMPLATE,
+                pagination_mode=pagination_mode,
+                entry=entry,
+            )
+    ctx["crud_degraded"] = state in DEGRADED_STATES
+    ctx["facets"] = {}
+    if not ctx["crud_degraded"]:
+        ctx["facets"] = await sync_to_async(config.get_facets)(request, params)
+    return ctx
+
+
+@_replica_reads
+def render_list_page(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    template_name: str = LIST_TEMPLATE,
+    pagination_mode: str | None = None,
+) -> HttpResponse:
+    """crud/list.html completo, con GET condicional (back/forward, history restore)."""
+
+    if config.stream_page:
+        return stream_list_page(
+            config=config,
+            request=request,
+            crud_urls=crud_urls,
+            template_name=template_name,
+            pagination_mode=pagination_mode,
+        )
+    validator = conditional.list_etag(
+        config,
+        request,
+        template_name=template_name,
+        extra=_key_extra(crud_urls, pagination_mode),
+        page=True,
+    )
+    response = conditional.not_modified(request, validator)
+    if response is not None:
+        return response
+
+    ctx = build_list_page_context(
+        config=config, request=request, crud_urls=crud_urls, pagination_mode=pagination_mode
+    )
+    if ctx["crud_degraded"]:
+        validator = None
+    return conditional.apply_validator(render(request, template_name, ctx), validator)
+
+
+@_replica_reads
+async def arender_list_page(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    template_name: str = LIST_TEMPLATE,
+    pagination_mode: str | None = None,
+) -> HttpResponse:
+    if config.stream_page:
+        return await astream_list_page(
+            config=config,
+            request=request,
+            crud_urls=crud_urls,
+            template_name=template_name,
+            pagination_mode=pagination_mode,
+        )
+    await aresolve_permissions(request)
+    validator = await sync_to_async(conditional.list_etag)(
+        config,
+        request,
+        template_name=template_name,
+        extra=_key_extra(crud_urls, pagination_mode),
+        page=True,
+    )
+    response = conditional.not_modified(request, validator)
+    if response is not None:
+        return response
+
+    ctx = await abuild_list_page_context(
+        config=config, request=request, crud_urls=crud_urls, pagination_mode=pagination_mode
+    )
+    if ctx["crud_degraded"]:
+        validator = None
+    # Context processors + layout consultan la BD: el render va a un thread.
+    response = await sync_to_async(render)(request, template_name, ctx)
+    return conditional.apply_validator(response, validator)
+
+
+# --- Página completa en streaming (CrudConfig.stream_page) ---
+def _stream_shell(config: CrudConfig, request: HttpRequest, template_name: str) -> tuple[str, str, list]:
+    """(antes, después) del contenido de list.html + mensajes ya consumidos.
+
+    Se renderiza antes de devolver la respuesta: csrf_token y messages se resuelven
+    mientras los middlewares todavía pueden escribir cookies/storage.
+    """
+
+    html = render_to_string(
+        template_name,
+        {
+            "crud_stream_slot": mark_safe(STREAM_SLOT),
+            "page_title": config.page_title or "Listado",
+            "entity_label": config.entity_label or "",
+            "entity_label_plural": config.entity_label_plural or "",
+        },
+        request=request,
+    )
+    head, _, tail = html.partition(STREAM_SLOT)
+    return head, tail, list(messages.get_messages(request))
+
+
+def _stream_content(
+    config: CrudConfig, request: HttpRequest, crud_urls: dict, ctx: dict, consumed: list
+) -> Iterator[str]:
+    """crud/_list_content.html por partes; las filas en tandas si la tabla no vino ya armada."""
+
+    ctx = {**ctx, "messages": consumed}
+    items = ctx.get("items") or []
+    if ctx.get("table_html") or not items:
+        if not ctx.get("table_html"):
+            ctx["table_html"] = mark_safe(render_to_string(TABLE_TEMPLATE, ctx, request=request))
+        yield render_to_string(LIST_CONTENT_TEMPLATE, ctx, request=request)
+        return
+
+    table = render_to_string(
+        TABLE_TEMPLATE, {**ctx, "stream_rows": mark_safe(STREAM_ROWS_SLOT)}, request=request
+    )
+    content = render_to_string(
+        LIST_CONTENT_TEMPLATE, {**ctx, "table_html": mark_safe(STREAM_TABLE_SLOT)}, request=request
+    )
+    content_head, _, content_tail = content.partition(STREAM_TABLE_SLOT)
+    table_head, _, table_tail = table.partition(STREAM_ROWS_SLOT)
+    yield content_head + table_head
+    chunk = max(1, config.stream_page_chunk)
+    for i in range(0, len(items), chunk):
+        yield _render_items(crud_urls, items[i : i + chunk])
+    yield table_tail + content_tail
+
+
+def _streaming_page(parts) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(parts, content_type="text/html; charset=utf-8")
+    # Proxies (nginx) no deben juntar el stream: el layout tiene que salir ya.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@_replica_reads
+def stream_list_page(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    template_name: str = LIST_TEMPLATE,
+    pagination_mode: str | None = None,
+) -> StreamingHttpResponse:
+    """crud/list.html en streaming: layout primero, después queries + contenido por tandas."""
+
+    head, tail, consumed = _stream_shell(config, request, template_name)
+
+    def stream():
+        yield head
+        ctx = build_list_page_context(
+            config=config, request=request, crud_urls=crud_urls, pagination_mode=pagination_mode
+        )
+        yield from _stream_content(config, request, crud_urls, ctx, consumed)
+        yield tail
+
+    return _streaming_page(stream())
+
+
+@_replica_reads
+async def astream_list_page(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    template_name: str = LIST_TEMPLATE,
+    pagination_mode: str | None = None,
+) -> StreamingHttpResponse:
+    await aresolve_permissions(request)
+    head, tail, consumed = await sync_to_async(_stream_shell)(config, request, template_name)
+
+    async def stream():
+        yield head
+        ctx = await abuild_list_page_context(
+            config=config, request=request, crud_urls=crud_urls, pagination_mode=pagination_mode
+        )
+        # Context processors del contenido consultan la BD: cada parte se arma en un thread.
+        parts = _stream_content(config, request, crud_urls, ctx, consumed)
+        while (part := await sync_to_async(next)(parts, None)) is not None:
+            yield part
+        yield tail
+
+    return _streaming_page(stream())
+
+
+def handle_bulk_action(*, config: CrudConfig, request: HttpRequest, crud_urls: dict) -> HttpResponse:
+    """POST de _bulk_actions.html: ejecuta la acción y responde la tabla refrescada.
+
+    Selección: ids (página actual) o select_all (token firmado con los filtros).
+    La tabla se re-renderiza con list_qs (filtros + página desde donde se envió).
+    """
+
+    action = config.get_bulk_action((request.POST.get("action") or "").strip(), request)
+    if action is None:
+        return HttpResponseForbidden("Forbidden")
+
+    try:
+        qs = selection_queryset(config, request)
+    except BulkError as exc:
+        return HttpResponseBadRequest(str(exc))
+
+    count = run_bulk_action(config, action, request, qs)
+
+    list_request = with_query(request, request.POST.get("list_qs") or "")
+    response = render_list_fragment(config=config, request=list_request, crud_urls=crud_urls)
+    response["HX-Trigger"] = json.dumps({"crudBulkDone": {"action": action.name, "count": count}})
+    return response
+
+
+# --- Respuestas de modales (create/edit/delete) ---
+def list_request_for(request: HttpRequest) -> HttpRequest:
+    """Request con el GET del listado visible (HX-Current-URL; fallback: request.GET)."""
+
+    current = request.headers.get("HX-Current-URL") or ""
+    query = urlparse(current).query if current else ""
+    return with_query(request, query or request.GET.urlencode())
+
+
+def render_table_refresh(*, config: CrudConfig, request: HttpRequest, crud_urls: dict) -> HttpResponse:
+    """Tabla completa como OOB (#crud-table) con filtros/sort/page del listado visible."""
+
+    list_request = list_request_for(request)
+    entry, _, _ = _fragment_entry(
+        config=config,
+        request=list_request,
+        crud_urls=crud_urls,
+        template_name=TABLE_TEMPLATE,
+        pagination_mode=None,
+    )
+    return HttpResponse(render_to_string(TABLE_OOB_TEMPLATE, {"table_html": mark_safe(entry["html"])}))
+
+
+def render_row_update(
+    *,
+    config: CrudConfig,
+    request: HttpRequest,
+    crud_urls: dict,
+    pk: Any,
+    changed_fields: Iterable[str] | None = None,
+    deleted: bool = False,
+) -> HttpResponse:
+    """Respuesta de modal tras edit/delete: solo el <tr> afectado (hx-swap-oob).
+
+    Una query por pk con los filtros del listado visible: si la fila ya no coincide, se
+    quita. Tabla completa (render_table_refresh) si cambió un campo del orden actual
+    (la fila se movería) o si changed_fields es None. El total del header no se toca.
+    """
+
+    if deleted:
+        return HttpResponse(render_to_string(ROW_OOB_TEMPLATE, {"deleted": True, "row_id": pk}))
+
+    list_request = list_request_for(request)
+    params = config.parse_params(list_request)
+    if changed_fields is None or set(changed_fields) & config.sort_fields(params):
+        return render_table_refresh(config=config, request=request, crud_urls=crud_urls)
+
+    qs = config.queryset_for_list(list_request, params).filter(pk=pk)
+    rows = list(config.rows_queryset(qs)[:1])
+    if not rows:
+        return HttpResponse(render_to_string(ROW_OOB_TEMPLATE, {"deleted": True, "row_id": pk}))
+
+    item = config.build_items(SimpleNamespace(object_list=rows), list_request, params)[0]
+    # Sin request: la fila no usa context processors (evita sus queries).
+    return HttpResponse(render_to_string(ROW_OOB_TEMPLATE, {"item": item, "crud_urls": crud_urls}))
+
+
+# --- Scroll infinito (bloques de <tr> por cursor keyset) ---
+def _rows_sentinel(config: CrudConfig, crud_urls: dict, params, cursor: str) -> str:
+    """<tr> que pide el bloque siguiente al hacerse visible (hx-trigger=revealed / crud.js)."""
+
+    data = {
+        k: v for k, v in params.as_dict().items() if k not in {"page", "cursor"} and v not in {"", "all"}
     }
+    data["cursor"] = cursor
+    return render_to_string(
+        ROWS_SENTINEL_TEMPLATE,
+        {
+            "url": f"{crud_urls['rows']}?{urlencode(data)}",
+            "streaming": config.scroll_streaming,
+            "colspan": len(config.list_columns) + 2,
+        },
+    )
+
+
+def _scroll_source(config: CrudConfig, request: HttpRequest):
+    params = config.parse_params(request)
+    found = config.scroll_queryset(config.queryset_for_list(request, params), params)
+    if found is None:
+        return params, None, None
+    return (params, *found)
+
+
+def _render_items(crud_urls: dict, items: list[dict]) -> str:
+    # Sin request: filas sin context processors (mismo criterio que render_row_update).
+    template = get_template(ROW_TEMPLATE)
+    return "".join(template.render({"item": item, "crud_urls": crud_urls}) for item in items)
+
+
+def _render_rows(config: CrudConfig, request: HttpRequest, crud_urls: dict, params, rows: list) -> str:
+    items = config.build_items(SimpleNamespace(object_list=rows), request, params)
+    return _render_items(crud_urls, items)
+
+
+@_replica_reads
+def render_rows(*, config: CrudConfig, request: HttpRequest, crud_urls: dict) -> HttpResponse:
+    """Bloque siguiente de filas (<tr>…) + sentinel del bloque posterior.
+
+    Con scroll_streaming: StreamingHttpResponse que emite tandas de scroll_stream_chunk
+    filas a medida que salen de .iterator(); las primeras se pintan antes de que termine
+    la query.
+    """
+
+    params, qs, cursor_for = _scroll_source(config, request)
+    if qs is None:
+        return HttpResponseBadRequest("Cursor inválido u ordering no apto para keyset.")
+    size = config.scroll_block_size
+
+    if not config.scroll_streaming:
+        rows = list(qs[: size + 1])
+        sentinel = ""
+        if len(rows) > size:
+            rows = rows[:size]
+            sentinel = _rows_sentinel(config, crud_urls, params, cursor_for(rows[-1]))
+        return HttpResponse(_render_rows(config, request, crud_urls, params, rows) + sentinel)
+
+    chunk = max(1, min(config.scroll_stream_chunk, size))
+
+    def stream():
+        rows = qs[: size + 1].iterator(chunk_size=chunk)
+        sent = 0
+        last = None
+        while batch := list(islice(rows, min(chunk, size + 1 - sent))):
+            if sent + len(batch) > size:
+                batch = batch[: size - sent]
+                yield _render_rows(config, request, crud_urls, params, batch) + ROWS_STREAM_MARK
+                yield _rows_sentinel(config, crud_urls, params, cursor_for((batch or [last])[-1]))
+                return
+            sent += len(batch)
+            last = batch[-1]
+            yield _render_rows(config, request, crud_urls, params, batch) + ROWS_STREAM_MARK
+
+    return StreamingHttpResponse(stream(), content_type="text/html; charset=utf-8")
+
+
+@_replica_reads
+async def arender_rows(*, config: CrudConfig, request: HttpRequest, crud_urls: dict) -> HttpResponse:
+    """render_rows para vistas async: la query avanza en un thread, el render en el loop."""
+
+    await aresolve_permissions(request)
+    if not config.scroll_streaming:
+        return await sync_to_async(render_rows)(config=config, request=request, crud_urls=crud_urls)
+
+    params, qs, cursor_for = await sync_to_async(_scroll_source)(config, request)
+    if qs is None:
+        return HttpResponseBadRequest("Cursor inválido u ordering no apto para keyset.")
+    size = config.scroll_block_size
+    chunk = max(1, min(config.scroll_stream_chunk, size))
+
+    async def stream():
+        # Mismo esquema que astream_csv: iterator sync avanzado por tandas en un thread.
+        rows = qs[: size + 1].iterator(chunk_size=chunk)
+        sent = 0
+        last = None
+        while batch := await sync_to_async(lambda n: list(islice(rows, n)))(min(chunk, size + 1 - sent)):
+            if sent + len(batch) > size:
+                batch = batch[: size - sent]
+                yield _render_rows(config, request, crud_urls, params, batch) + ROWS_STREAM_MARK
+                yield _rows_sentinel(config, crud_urls, params, cursor_for((batch or [last])[-1]))
+                return
+            sent += len(batch)
+            last = batch[-1]
+            yield _render_rows(config, request, crud_urls, params, batch) + ROWS_STREAM_MARK
+
+    return StreamingHttpResponse(stream(), content_type="text/html; charset=utf-8")
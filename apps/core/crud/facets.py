@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Q, QuerySet
+from django.http import HttpRequest
+
+from .cache import data_versions
+from .counting import _fingerprint
+from .defs import FilterDef
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .config import CrudConfig, CrudParams
+
+
+_FACET_PREFIX = "crud:facets"
+
+
+@dataclass(frozen=True)
+class FacetOption:
+    value: str
+    label: str
+    count: int
+    selected: bool
+
+
+@dataclass(frozen=True)
+class Facet:
+    """Conteos de un filtro para la búsqueda actual (con los demás filtros aplicados)."""
+
+    name: str
+    label: str
+    total: int
+    options: tuple[FacetOption, ...]
+
+
+def _model_field(config: "CrudConfig", f: FilterDef):
+    return config.model._meta.get_field(f.field)
+
+
+def facet_options(config: "CrudConfig", f: FilterDef) -> list[tuple[str, str]] | None:
+    """Opciones conocidas (FilterDef.options > status_options > choices); None = GROUP BY."""
+
+    if f.options:
+        return [(str(v), str(label)) for v, label in f.options]
+    if f.name == "status" and config.status_options:
+        return [(str(v), str(label)) for v, label in config.status_options if v != "all"]
+    choices = _model_field(config, f).flatchoices
+    if choices:
+        return [(str(v), str(label)) for v, label in choices]
+    return None
+
+
+def _equals(config: "CrudConfig", f: FilterDef, raw: str) -> Q:
+    try:
+        value = _model_field(config, f).to_python(raw)
+    except ValidationError:
+        return Q(pk__in=[])
+    return Q(**{f.field: value})
+
+
+def _facet_base(config: "CrudConfig", request: HttpRequest, params: "CrudParams") -> QuerySet:
+    """Queryset base + búsqueda + rango de fechas + filtros activos que no son facetas (sin orden)."""
+
+    data = params.as_dict()
+    qs = config.apply_search(config.get_base_queryset(request), params)
+    for f in config.filters:
+        raw = (data.get(f.name) or "").strip()
+        if f.facet or not raw or raw == "all":
+            continue
+        qs = f.apply_to(qs, raw, request)
+    return config.apply_date_range(qs, params).order_by()
+
+
+def compute_facets(
+    config: "CrudConfig", request: HttpRequest, params: "CrudParams"
+) -> dict[str, Facet]:
+    """Facetas declaradas (FilterDef.facet) → {name: Facet}.
+
+    Opciones conocidas: una sola query con agregados condicionales para todas las
+    facetas. Sin opciones: GROUP BY por faceta (top config.facet_limit).
+    Cada faceta cuenta con la búsqueda y los *otros* filtros aplicados.
+    """
+
+    defs = [f for f in config.filters if f.facet]
+    if not defs:
+        return {}
+
+    data = params.as_dict()
+    active = {
+        f.name: raw
+        for f in defs
+        if (raw := (data.get(f.name) or "").strip()) and raw != "all"
+    }
+    base = _facet_base(config, request, params)
+
+    key = None
+    timeout = int(config.facet_cache_timeout or 0)
+    if timeout > 0:
+        fp = _fingerprint(base)
+        if fp is not None:
+            raw_key = "|".join(
+                [fp, repr(sorted(active.items())), *map(str, data_versions(config.get_fragment_models()))]
+            )
+            key = f"{_FACET_PREFIX}:{config.crud_slug}:{hashlib.sha1(raw_key.encode('utf-8')).hexdigest()}"
+            found = cache.get(key)
+            if found is not None:
+                return found
+
+    others: dict[str, Q] = {}
+    for f in defs:
+        q = Q()
+        for other in defs:
+            if other is not f and other.name in active:
+                q &= _equals(config, other, active[other.name])
+        others[f.name] = q
+
+    aggregates = {}
+    known: dict[str, list[tuple[str, str]] | None] = {}
+    for i, f in enumerate(defs):
+        known[f.name] = facet_options(config, f)
+        aggregates[f"f{i}"] = Count("pk", filter=others[f.name] or None)
+        for j, (value, _) in enumerate(known[f.name] or ()):
+            aggregates[f"f{i}_{j}"] = Count("pk", filter=others[f.name] & _equals(config, f, value))
+    counts = base.aggregate(**aggregates)
+
+    facets: dict[str, Facet] = {}
+    for i, f in enumerate(defs):
+        selected = active.get(f.name, "")
+        options = known[f.name]
+        if options is not None:
+            rows = [(value, label, counts[f"f{i}_{j}"]) for j, (value, label) in enumerate(options)]
+        else:
+            grouped = (
+                base.filter(others[f.name])
+                .values_list(f.field)
+                .annotate(n=Count("pk"))
+                .order_by("-n", f.field)[: config.facet_limit]
+            )
+            rows = [("" if v is None else str(v), "—" if v is None else str(v), n) for v, n in grouped]
+        facets[f.name] = Facet(
+            name=f.name,
+            label=f.label or str(_model_field(config, f).verbose_name).capitalize(),
+            total=counts[f"f{i}"],
+            options=tuple(
+                FacetOption(value=value, label=label, count=n, selected=value == selected)
+                for value, label, n in rows
+            ),
+        )
+
+    if key:
+        cache.set(key, facets, timeout)
+    return facets
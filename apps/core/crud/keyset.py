@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from django.core import signing
+from django.db.models import Q, QuerySet
+
+
+CURSOR_SALT = "apps.core.crud.keyset"
+
+
+@dataclass
+class KeysetPage:
+    """Página por cursor (seek). Imita la API de Django Page usada por los templates.
+
+    No hay número de página ni total de páginas: solo vecinos (anterior/siguiente).
+    """
+
+    object_list: list
+    next_cursor: str = ""
+    previous_cursor: str = ""
+    total_count: int | None = None
+    count_is_estimate: bool = False
+    is_keyset: bool = field(default=True, init=False)
+    paginator: None = field(default=None, init=False)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return bool(self.next_cursor)
+
+    def has_previous(self) -> bool:
+        return bool(self.previous_cursor)
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+def _split(term: str) -> tuple[str, bool]:
+    if term.startswith("-"):
+        return term[1:], True
+    return term.lstrip("+"), False
+
+
+def _resolve_field(model, path: str):
+    """Devuelve el field final de un path ORM (ej: user__email, pk)."""
+
+    opts = model._meta
+    found = None
+    for part in path.split("__"):
+        found = opts.pk if part == "pk" else opts.get_field(part)
+        if found.is_relation and found.related_model is not None:
+            opts = found.related_model._meta
+    return found
+
+
+def nullable_path(model, path: str) -> bool:
+    """¿Puede el path valer NULL? Campo null=True o algún salto de relación opcional.
+
+    Relaciones inversas o m2m cuentan como nulables (el JOIN puede no encontrar fila).
+    """
+
+    opts = model._meta
+    for part in path.split("__"):
+        found = opts.pk if part == "pk" else opts.get_field(part)
+        if found.is_relation and not (found.many_to_one or (found.one_to_one and found.concrete)):
+            return True
+        if getattr(found, "null", False):
+            return True
+        if found.is_relation and found.related_model is not None:
+            opts = found.related_model._meta
+    return False
+
+
+def _path_getter(model, path: str) -> Callable[[Any], Any]:
+    parts = path.split("__")
+    last = _resolve_field(model, path)
+    # FK al final del path: compara por id, sin cargar el objeto relacionado.
+    if last is not None and last.is_relation and last.concrete:
+        parts[-1] = last.attname
+
+    def getter(obj: Any) -> Any:
+        for part in parts:
+            if obj is None:
+                return None
+            obj = obj.pk if part == "pk" else getattr(obj, part)
+        return obj
+
+    return getter
+
+
+def _dump_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, "isoformat"):
+        # isoformat conserva microsegundos (DjangoJSONEncoder los trunca).
+        return value.isoformat()
+    return str(value)
+
+
+def ordering_terms(qs: QuerySet) -> tuple[str, ...] | None:
+    """Ordering explícito del queryset si es apto para keyset (solo strings, termina en pk)."""
+
+    terms = tuple(qs.query.order_by)
+    if not terms or not all(isinstance(t, str) for t in terms):
+        return None
+    if _split(terms[-1])[0] not in {"pk", "id", qs.model._meta.pk.name}:
+        return None
+    return terms
+
+
+def encode_cursor(terms: tuple[str, ...], values: list[Any], *, backwards: bool, salt: str) -> str:
+    payload = {"o": list(terms), "v": [_dump_value(v) for v in values], "b": int(backwards)}
+    return signing.dumps(payload, salt=salt, compress=True)
+
+
+def decode_cursor(
+    model, token: str, terms: tuple[str, ...], *, salt: str
+) -> tuple[list[Any], bool] | None:
+    """Valida y decodifica el cursor. None si es inválido o de otro ordering."""
+
+    if not token:
+        return None
+    try:
+        payload = signing.loads(token, salt=salt)
+    except signing.BadSignature:
+        return None
+    if not isinstance(payload, dict) or payload.get("o") != list(terms):
+        return None
+    raw = payload.get("v")
+    if not isinstance(raw, list) or len(raw) != len(terms):
+        return None
+    if any(v is None for v in raw):
+        return None  # seek_filter no expande NULLs (col__gt=None no es válido).
+    try:
+        values = [
+            _resolve_field(model, _split(t)[0]).to_python(v)
+            for t, v in zip(terms, raw)
+        ]
+    except Exception:
+        return None
+    return values, bool(payload.get("b"))
+
+
+def seek_filter(terms: tuple[str, ...], values: list[Any], *, backwards: bool) -> Q:
+    """Expande (a, b, pk) > (x, y, z) a ORs anidados, respetando la dirección por campo.
+
+    Equivale a la comparación de tuplas de SQL y permite usar el índice compuesto.
+    Asume columnas NOT NULL (CrudConfig.prepare rechaza keyset con paths nulables).
+    """
+
+    query = Q()
+    equal = Q()
+    for term, value in zip(terms, values):
+        name, desc = _split(term)
+        op = "lt" if desc != backwards else "gt"
+        query |= equal & Q(**{f"{name}__{op}": value})
+        equal &= Q(**{name: value})
+    return query
+
+
+def paginate_keyset(
+    qs: QuerySet,
+    *,
+    cursor: str,
+    page_size: int,
+    salt: str,
+    getter_for: Callable[[str], Callable[[Any], Any] | None] | None = None,
+) -> KeysetPage | None:
+    """Pagina con WHERE (sort, pk) > (...) LIMIT n+1. None si el ordering no es apto.
+
+    getter_for permite leer el ordering de filas que no son instancias (ej: tuplas).
+    """
+
+    terms = ordering_terms(qs)
+    if terms is None:
+        return None
+
+    model = qs.model
+    if getter_for is None:
+        getters = [_path_getter(model, _split(t)[0]) for t in terms]
+    else:
+        getters = [getter_for(_split(t)[0]) for t in terms]
+        if any(g is None for g in getters):
+            return None
+    decoded = decode_cursor(model, cursor, terms, salt=salt)
+
+    backwards = False
+    if decoded is not None:
+        values, backwards = decoded
+        qs = qs.filter(seek_filter(terms, values, backwards=backwards))
+        if backwards:
+            qs = qs.reverse()
+
+    rows = list(qs[: page_size + 1])
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if backwards:
+        rows.reverse()
+
+    has_next = has_more if not backwards else True
+    has_previous = decoded is not None if not backwards else has_more
+
+    def cursor_for(obj: Any, *, to_back: bool) -> str:
+        return encode_cursor(terms, [g(obj) for g in getters], backwards=to_back, salt=salt)
+
+    page = KeysetPage(object_list=rows)
+    if rows and has_next:
+        page.next_cursor = cursor_for(rows[-1], to_back=False)
+    if rows and has_previous:
+        page.previous_cursor = cursor_for(rows[0], to_back=True)
+    return page
+
+
+def keyset_after(
+    qs: QuerySet,
+    *,
+    cursor: str,
+    salt: str,
+    getter_for: Callable[[str], Callable[[Any], Any] | None] | None = None,
+) -> tuple[QuerySet, Callable[[Any], str]] | None:
+    """Solo hacia adelante (scroll infinito): (queryset desde el cursor, cursor_for(fila)).
+
+    Sin LIMIT: quien llama corta el bloque (slice o iterator). None si el ordering no es
+    apto o el cursor es inválido (volver al inicio duplicaría filas ya pintadas).
+    """
+
+    terms = ordering_terms(qs)
+    if terms is None:
+        return None
+
+    model = qs.model
+    if getter_for is None:
+        getters = [_path_getter(model, _split(t)[0]) for t in terms]
+    else:
+        getters = [getter_for(_split(t)[0]) for t in terms]
+        if any(g is None for g in getters):
+            return None
+
+    if cursor:
+        decoded = decode_cursor(model, cursor, terms, salt=salt)
+        if decoded is None:
+            return None
+        qs = qs.filter(seek_filter(terms, decoded[0], backwards=False))
+
+    def cursor_for(obj: Any) -> str:
+        return encode_cursor(terms, [g(obj) for g in getters], backwards=False, salt=salt)
+
+    return qs, cursor_for
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
+from typing import Any
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpRequest
 
 
+_REQUEST_ATTR = "_crud_permission_resolver"
+_CACHE_PREFIX = "crud:perms"
+_GLOBAL_VERSION_KEY = "crud:perms:ver:global"
+
+
 @dataclass(frozen=True)
 class CrudPermissionSpec:
     """Spec mínimo (Step 9) para permisos declarativos.
@@ -26,16 +36,180 @@ class CrudPermissionSpec:
             return False
 
         raw = self.value.strip()
+        resolver = PermissionResolver.for_request(request)
         if raw.startswith("role:"):
             roles = {r.strip() for r in raw[len("role:") :].split(",") if r.strip()}
             if not roles:
                 return False
-            try:
-                from apps.orgs.services import user_has_org_role
-
-                return user_has_org_role(user, roles=roles)
-            except Exception:
-                return False
+            return resolver.has_org_role(roles)
 
         # Django permission string: "app_label.codename" (ej: "crud_example.view_item")
-        return bool(getattr(user, "has_perm", lambda p: False)(raw))
+        return resolver.has_perm(raw)
+
+
+def _user_version_key(user_id: Any) -> str:
+    return f"{_CACHE_PREFIX}:ver:user:{user_id}"
+
+
+def bump_permission_version(user_id: Any = None) -> None:
+    """Invalida el snapshot cacheado de un usuario (o de todos si user_id es None)."""
+
+    key = _GLOBAL_VERSION_KEY if user_id is None else _user_version_key(user_id)
+    cache.set(key, time.time_ns(), None)
+
+
+def permission_versions(user_id: Any) -> tuple[int, int]:
+    """(versión del usuario, versión global) del snapshot de permisos."""
+
+    keys = [_user_version_key(user_id), _GLOBAL_VERSION_KEY]
+    found = cache.get_many(keys)
+    values = []
+    for key in keys:
+        value = found.get(key)
+        if value is None:
+            cache.add(key, time.time_ns(), None)
+            value = cache.get(key) or 0
+        values.append(int(value))
+    return values[0], values[1]
+
+
+class PermissionResolver:
+    """Permisos Django + roles por organización del usuario, resueltos una vez por request.
+
+    - Una query de Membership (activas, org activa, por created_at) define org actual y
+      roles; los permisos salen de user.get_all_permissions() (cache propia del backend).
+    - Con settings.CRUD_PERMISSION_CACHE_TIMEOUT > 0 el snapshot se comparte entre
+      requests, con clave por usuario + versión (signals de Membership/permisos).
+    """
+
+    def __init__(self, user: Any) -> None:
+        self.user = user
+        self._snapshot: dict | None = None
+
+    @classmethod
+    def for_request(cls, request: HttpRequest) -> "PermissionResolver":
+        resolver = getattr(request, _REQUEST_ATTR, None)
+        user = getattr(request, "user", None)
+        if resolver is None or resolver.user is not user:
+            resolver = cls(user)
+            setattr(request, _REQUEST_ATTR, resolver)
+        return resolver
+
+    # --- carga ---
+    def _load(self) -> dict:
+        user = self.user
+        superuser = bool(user.is_active and user.is_superuser)
+        perms = frozenset() if superuser else frozenset(user.get_all_permissions())
+
+        from apps.orgs.models import Membership
+
+        memberships = list(
+            Membership.objects.select_related("organization")
+            .filter(user=user, is_active=True, organization__is_active=True)
+            .order_by("created_at")
+        )
+        if memberships and getattr(user, "_current_org_cache", None) is None:
+            # Misma regla que get_current_organization: evita su query aparte.
+            setattr(user, "_current_org_cache", memberships[0].organization)
+
+        return {
+            "superuser": superuser,
+            "perms": perms,
+            "current_org_id": memberships[0].organization_id if memberships else None,
+            "roles": {m.organization_id: m.role for m in memberships},
+        }
+
+    def snapshot(self) -> dict:
+        if self._snapshot is not None:
+            return self._snapshot
+
+        timeout = int(getattr(settings, "CRUD_PERMISSION_CACHE_TIMEOUT", 0) or 0)
+        if timeout <= 0:
+            self._snapshot = self._load()
+            return self._snapshot
+
+        user_version, global_version = permission_versions(self.user.pk)
+        key = f"{_CACHE_PREFIX}:{self.user.pk}:{user_version}:{global_version}"
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = self._load()
+            cache.set(key, snapshot, timeout)
+        self._snapshot = snapshot
+        return snapshot
+
+    # --- consultas ---
+    def has_perm(self, perm: str) -> bool:
+        snapshot = self.snapshot()
+        return snapshot["superuser"] or perm in snapshot["perms"]
+
+    def role_in(self, organization_id: Any) -> str | None:
+        return self.snapshot()["roles"].get(organization_id)
+
+    def has_org_role(self, roles: set[str], *, organization_id: Any = None) -> bool:
+        """Rol en la org indicada (default: org actual, igual que user_has_org_role)."""
+
+        snapshot = self.snapshot()
+        if organization_id is None:
+            organization_id = snapshot["current_org_id"]
+        if organization_id is None:
+            return False
+        return snapshot["roles"].get(organization_id) in roles
+
+
+async def aresolve_permissions(request: HttpRequest) -> PermissionResolver:
+    """Vistas async: resuelve request.user y el snapshot de permisos fuera del event loop.
+
+    Después, can_list/can_edit/... (sync) ya no consultan la BD.
+    """
+
+    auser = getattr(request, "auser", None)
+    if auser is not None:
+        request.user = await auser()
+    resolver = PermissionResolver.for_request(request)
+    user = getattr(request, "user", None)
+    if user is not None and getattr(user, "is_authenticated", False):
+        await sync_to_async(resolver.snapshot)()
+    return resolver
+
+
+def install_permission_signals() -> None:
+    """Versionado del snapshot cacheado: cambios de membresías, permisos y grupos."""
+
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Group
+    from django.db.models.signals import m2m_changed, post_delete, post_save
+
+    from apps.orgs.models import Membership, Organization
+
+    User = get_user_model()
+
+    def on_membership(sender, instance, **kwargs):
+        bump_permission_version(instance.user_id)
+
+    def on_user(sender, instance, **kwargs):
+        bump_permission_version(instance.pk)
+
+    def on_user_m2m(sender, instance, reverse, pk_set, **kwargs):
+        if not reverse:
+            bump_permission_version(instance.pk)
+        else:
+            # group.user_set.add(...) / permission.user_set.add(...)
+            for user_id in pk_set or ():
+                bump_permission_version(user_id)
+            if pk_set is None:
+                bump_permission_version()
+
+    def on_global(sender, **kwargs):
+        bump_permission_version()
+
+    uid = "crud_permissions"
+    post_save.connect(on_membership, sender=Membership, weak=False, dispatch_uid=f"{uid}:membership:save")
+    post_delete.connect(on_membership, sender=Membership, weak=False, dispatch_uid=f"{uid}:membership:delete")
+    post_save.connect(on_global, sender=Organization, weak=False, dispatch_uid=f"{uid}:org:save")
+    post_delete.connect(on_global, sender=Organization, weak=False, dispatch_uid=f"{uid}:org:delete")
+    post_save.connect(on_user, sender=User, weak=False, dispatch_uid=f"{uid}:user:save")
+    m2m_changed.connect(
+        on_user_m2m, sender=User.user_permissions.through, weak=False, dispatch_uid=f"{uid}:user:perms"
+    )
+    m2m_changed.connect(on_user_m2m, sender=User.groups.through, weak=False, dispatch_uid=f"{uid}:user:groups")
+    m2m_changed.connect(on_global, sender=Group.permissions.through, weak=False, dispatch_uid=f"{uid}:group:perms")
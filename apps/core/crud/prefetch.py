@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+# Claves en vuelo: dedupe + presupuesto por proceso (CRUD_PREFETCH_MAX_PENDING).
+_pending: set[str] = set()
+
+
+def _workers() -> int:
+    return int(getattr(settings, "CRUD_PREFETCH_WORKERS", 2) or 0)
+
+
+def _max_pending() -> int:
+    return int(getattr(settings, "CRUD_PREFETCH_MAX_PENDING", 8) or 0)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_workers(), thread_name_prefix="crud-prefetch")
+        return _executor
+
+
+def next_page_query(filters: dict[str, str], page_obj: Any) -> str:
+    """Querystring de la página siguiente ("" si no hay): offset → page+1, keyset → cursor."""
+
+    if page_obj is None or not page_obj.has_next():
+        return ""
+    data = {k: v for k, v in filters.items() if v not in {"", "all"} and k not in {"page", "cursor"}}
+    if getattr(page_obj, "is_keyset", False):
+        data["cursor"] = page_obj.next_cursor
+    else:
+        data["page"] = str(page_obj.next_page_number())
+    return urlencode(data)
+
+
+def schedule(key: str, task: Callable[[], None]) -> bool:
+    """Encola `task` en el pool si hay presupuesto y `key` no está en vuelo.
+
+    Best effort: sin cupo se descarta (False). El worker cierra sus conexiones al final.
+    """
+
+    if _workers() <= 0:
+        return False
+    with _lock:
+        if key in _pending or len(_pending) >= _max_pending():
+            return False
+        _pending.add(key)
+
+    def run() -> None:
+        try:
+            task()
+        except Exception:
+            logger.exception("crud prefetch falló (%s)", key)
+        finally:
+            with _lock:
+                _pending.discard(key)
+            connections.close_all()
+
+    # El worker hereda el contexto (p. ej. la réplica de lectura de apps.core.db_router).
+    _get_executor().submit(contextvars.copy_context().run, run)
+    return True
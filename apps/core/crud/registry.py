@@ -18,6 +18,7 @@ def register_crud(config: CrudConfig) -> None:
     if slug in _CRUDS:
         raise ValueError(f"CrudConfig ya registrado: {slug}")
 
+    config.prepare()
     _CRUDS[slug] = config
 
 
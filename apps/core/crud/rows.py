@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from operator import itemgetter
+from typing import TYPE_CHECKING, Any, Callable
+
+from django.urls import NoReverseMatch, reverse
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .config import CrudConfig
+
+
+# Valor centinela para compilar URLs por fila con un solo reverse().
+_URL_SENTINEL = 987654321
+
+
+def path_getter(path: str, default: Any = "") -> Callable[[Any], Any]:
+    """Getter de un path ORM sobre instancias (user__email -> obj.user.email)."""
+
+    parts = tuple(path.split("__"))
+    if len(parts) == 1:
+        name = parts[0]
+        return lambda obj: getattr(obj, name, default)
+
+    def getter(obj: Any) -> Any:
+        for part in parts:
+            if obj is None:
+                return default
+            obj = getattr(obj, part, default)
+        return obj
+
+    return getter
+
+
+def _tuple_getter(indexes: list[int]) -> Callable[[tuple], tuple]:
+    if not indexes:
+        return lambda row: ()
+    if len(indexes) == 1:
+        index = indexes[0]
+        return lambda row: (row[index],)
+    return itemgetter(*indexes)
+
+
+class RowPlan:
+    """Plan de render de filas, compilado una vez por CrudConfig (register_crud).
+
+    - columns: metadata de columnas compartida (to_template_dict una sola vez).
+    - cells_from_object: extractor de celdas sobre instancias del modelo.
+    - cells_from_values: extractor por índices sobre tuplas de values_list (row_source="values").
+    - URLs por fila: reverse() una vez por nombre; luego solo concatenación por fila.
+    """
+
+    def __init__(self, config: "CrudConfig") -> None:
+        columns = list(config.list_columns)
+        self.columns: tuple[dict, ...] = tuple(c.to_template_dict() for c in columns)
+
+        getters = []
+        for col in columns:
+            if col.value is not None:
+                getters.append(col.value)
+            else:
+                getters.append(path_getter(col.fields[0] if col.fields else col.key))
+        self._object_getters = tuple(getters)
+        self._pk_name = config.model._meta.pk.name
+
+        # values_list: (pk, celdas..., paths de ordering extra...).
+        self.values_fields: tuple[str, ...] | None = None
+        self._value_index: dict[str, int] = {}
+        if config.row_source == "values":
+            cell_paths = [col.fields[0] if col.fields else col.key for col in columns]
+            fields = ["pk", *cell_paths]
+            for path in config.ordering_paths():
+                if path not in fields:
+                    fields.append(path)
+            self.values_fields = tuple(fields)
+            for i, path in enumerate(fields):
+                self._value_index.setdefault(path, i)
+            self._values_cells = _tuple_getter(list(range(1, len(cell_paths) + 1)))
+
+        self._url_names: dict[str, str] = dict(config.row_url_names or {})
+        self._url_kwarg = config.row_url_kwarg
+        self._url_templates: dict[str, tuple[str, str] | None] | None = None
+
+    # --- celdas ---
+    def cells_from_object(self, obj: Any) -> tuple:
+        return tuple(g(obj) for g in self._object_getters)
+
+    def cells_from_values(self, row: tuple) -> tuple:
+        return self._values_cells(row)
+
+    def value_getter(self, path: str) -> Callable[[tuple], Any] | None:
+        """Getter por índice para keyset sobre tuplas (None si el path no se seleccionó)."""
+
+        if path in {"id", self._pk_name}:
+            path = "pk"
+        index = self._value_index.get(path)
+        return itemgetter(index) if index is not None else None
+
+    # --- URLs ---
+    @property
+    def has_url_templates(self) -> bool:
+        return bool(self._url_names)
+
+    def _compile_urls(self) -> dict[str, tuple[str, str] | None]:
+        # Lazy: reverse() en register_crud (AppConfig.ready) importaría el URLconf.
+        templates: dict[str, tuple[str, str] | None] = {}
+        token = str(_URL_SENTINEL)
+        for key, name in self._url_names.items():
+            try:
+                url = reverse(name, kwargs={self._url_kwarg: _URL_SENTINEL})
+            except NoReverseMatch:
+                templates[key] = None
+                continue
+            if url.count(token) != 1:
+                templates[key] = None
+                continue
+            prefix, suffix = url.split(token)
+            templates[key] = (prefix, suffix)
+        return templates
+
+    def url_builders(self, qs_with_page: str) -> dict[str, Callable[[Any], str]]:
+        """Builders pk -> url con el querystring ya precalculado para toda la página."""
+
+        if self._url_templates is None:
+            self._url_templates = self._compile_urls()
+
+        builders: dict[str, Callable[[Any], str]] = {}
+        for key, name in self._url_names.items():
+            template = self._url_templates.get(key)
+            if template is None:
+                builders[key] = self._reverse_builder(name, qs_with_page)
+                continue
+            prefix, suffix = template
+            if qs_with_page and "?" not in suffix:
+                suffix = f"{suffix}?{qs_with_page}"
+            builders[key] = lambda pk, _p=prefix, _s=suffix: f"{_p}{pk}{_s}"
+        return builders
+
+    def _reverse_builder(self, name: str, qs_with_page: str) -> Callable[[Any], str]:
+        kwarg = self._url_kwarg
+
+        def build(pk: Any) -> str:
+            url = reverse(name, kwargs={kwarg: pk})
+            if qs_with_page and "?" not in url:
+                url = f"{url}?{qs_with_page}"
+            return url
+
+        return build
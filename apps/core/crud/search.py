@@ -0,0 +1,321 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Dict
+
+from django.db import DatabaseError, connections, models, router, transaction
+from django.db.models import F, Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """Declaración de búsqueda: qué campos de qué modelo, con qué backend.
+
+    - backend: "icontains" | "postgres" | "sqlite_fts" | "auto" (según vendor de la BD).
+    - config: regconfig de PostgreSQL para tsvector (ej: "simple", "spanish").
+    """
+
+    name: str
+    model: type
+    fields: tuple[str, ...]
+    backend: str = "icontains"
+    config: str = "simple"
+
+    @property
+    def using(self) -> str:
+        return router.db_for_read(self.model)
+
+    def get_backend(self) -> "SearchBackend":
+        return get_search_backend(self.backend, using=self.using)
+
+    def apply(self, qs: QuerySet, term: str) -> QuerySet:
+        term = (term or "").strip()
+        if not term or not self.fields:
+            return qs
+        return self.get_backend().apply(qs, term, self)
+
+
+class SearchBackend:
+    """Backend base: OR de icontains (fallback universal, sin índices)."""
+
+    name = "icontains"
+
+    def apply(self, qs: QuerySet, term: str, index: SearchIndex) -> QuerySet:
+        query = Q()
+        for f in index.fields:
+            query |= Q(**{f"{f}__icontains": term})
+        return qs.filter(query)
+
+    def install(self, index: SearchIndex) -> None:
+        """Engancha sincronización (signals) si el backend la necesita."""
+
+    def sync(self, index: SearchIndex, pks, *, using: str) -> None:
+        """Re-sincroniza filas tocadas sin signals (update()/borrado masivo)."""
+
+    def build(self, index: SearchIndex, *, rebuild: bool = False) -> list[str]:
+        """Crea/reconstruye índices. Devuelve líneas de resumen para el comando."""
+
+        return [f"{index.name}: icontains no requiere índice"]
+
+
+def _final_field(model, path: str):
+    opts = model._meta
+    field = None
+    for part in path.split("__"):
+        field = opts.get_field(part)
+        if field.is_relation and field.related_model is not None:
+            opts = field.related_model._meta
+    return field
+
+
+def _short_name(prefix: str, *parts: str) -> str:
+    digest = hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:12]
+    return f"{prefix}_{digest}"
+
+
+class PostgresSearchBackend(SearchBackend):
+    """tsvector (GIN) sobre campos locales + pg_trgm (GIN) para coincidencias parciales.
+
+    Los icontains se mantienen (semántica idéntica) pero quedan servidos por índices
+    trigram sobre UPPER(col::text), la misma expresión que genera Django.
+    """
+
+    name = "postgres"
+
+    def _local_fields(self, index: SearchIndex) -> list[str]:
+        return [f for f in index.fields if "__" not in f]
+
+    def _vector(self, index: SearchIndex):
+        from django.contrib.postgres.search import SearchVector
+
+        return SearchVector(*self._local_fields(index), config=index.config)
+
+    def apply(self, qs: QuerySet, term: str, index: SearchIndex) -> QuerySet:
+        from django.contrib.postgres.search import SearchQuery
+
+        query = Q()
+        for f in index.fields:
+            query |= Q(**{f"{f}__icontains": term})
+        if self._local_fields(index):
+            qs = qs.alias(crud_search=self._vector(index))
+            query |= Q(crud_search=SearchQuery(term, config=index.config, search_type="websearch"))
+        return qs.filter(query)
+
+    def build(self, index: SearchIndex, *, rebuild: bool = False) -> list[str]:
+        conn = connections[index.using]
+        qn = conn.ops.quote_name
+        done: list[str] = []
+        statements: list[tuple[str, str]] = []
+
+        for path in index.fields:
+            field = _final_field(index.model, path)
+            table = field.model._meta.db_table
+            name = _short_name("crud_trgm", table, field.column)
+            statements.append(
+                (
+                    name,
+                    f"CREATE INDEX IF NOT EXISTS {qn(name)} ON {qn(table)} "
+                    f"USING gin ((UPPER(({qn(field.column)})::text)) gin_trgm_ops)",
+                )
+            )
+
+        local = self._local_fields(index)
+        if local:
+            # La expresión del índice se compila desde el mismo SearchVector del query.
+            table = index.model._meta.db_table
+            qs = index.model._default_manager.using(index.using).annotate(crud_search=self._vector(index))
+            compiler = qs.query.get_compiler(using=index.using)
+            sql, params = compiler.compile(qs.query.annotations["crud_search"])
+            expr = conn.ops.compose_sql(sql, params).replace(f"{qn(table)}.", "")
+            name = _short_name("crud_fts", table, *local, index.config)
+            statements.append(
+                (name, f"CREATE INDEX IF NOT EXISTS {qn(name)} ON {qn(table)} USING gin (({expr}))")
+            )
+
+        with conn.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for name, sql in statements:
+                if rebuild:
+                    cursor.execute(f"DROP INDEX IF EXISTS {qn(name)}")
+                cursor.execute(sql)
+                done.append(f"{index.name}: {name}")
+        return done
+
+
+class SqliteFtsSearchBackend(SearchBackend):
+    """Tabla sombra FTS5 (tokenizer trigram) sincronizada por triggers de SQLite.
+
+    Los triggers AFTER INSERT/UPDATE/DELETE (en la tabla del modelo y en las tablas
+    de cada FK de los paths, ej: user__email) cubren todo camino de escritura:
+    save(), bulk_create, update(), borrados masivos y SQL crudo.
+
+    trigram conserva la semántica de icontains (subcadena, sin mayúsculas) para
+    términos de 3+ caracteres; los más cortos usan icontains. Si la tabla o algún
+    trigger no existe (comando sin ejecutar, tabla borrada), también cae a icontains.
+    """
+
+    name = "sqlite_fts"
+
+    def table_name(self, index: SearchIndex) -> str:
+        return "crud_fts_" + re.sub(r"\W", "_", index.name).lower()
+
+    def _hops(self, index: SearchIndex) -> list[tuple[str, models.Field]]:
+        """(prefijo, FK) de cada salto de relación de los paths, sin repetir."""
+
+        hops: list[tuple[str, models.Field]] = []
+        for path in index.fields:
+            parts = path.split("__")
+            opts = index.model._meta
+            for i, part in enumerate(parts[:-1]):
+                field = opts.get_field(part)
+                if not (field.many_to_one or (field.one_to_one and field.concrete)):
+                    raise ValueError(
+                        f"{index.name}: sqlite_fts solo admite paths por FK directa ({path})"
+                    )
+                prefix = "__".join(parts[: i + 1])
+                if prefix not in {p for p, _ in hops}:
+                    hops.append((prefix, field))
+                opts = field.related_model._meta
+        return hops
+
+    def _trigger_names(self, index: SearchIndex) -> list[str]:
+        table = self.table_name(index)
+        names = [f"{table}_ai", f"{table}_au", f"{table}_ad"]
+        names += [f"{table}_r{j}_au" for j in range(len(self._hops(index)))]
+        return names
+
+    def _exists(self, index: SearchIndex, using: str) -> bool:
+        # Sin cache: un índice borrado o sin triggers (posible desfase) se detecta en el acto.
+        try:
+            names = [self.table_name(index), *self._trigger_names(index)]
+            marks = ", ".join(["%s"] * len(names))
+            with connections[using].cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM sqlite_master WHERE name IN ({marks})", names)
+                found = cursor.fetchone()[0]
+        except (DatabaseError, ValueError):
+            return False
+        return found == len(names)
+
+    def apply(self, qs: QuerySet, term: str, index: SearchIndex) -> QuerySet:
+        if len(term) < 3 or not self._exists(index, qs.db):
+            return super().apply(qs, term, index)
+        table = self.table_name(index)
+        phrase = '"' + term.replace('"', '""') + '"'
+        subquery = RawSQL(f'SELECT rowid FROM "{table}" WHERE "{table}" MATCH %s', [phrase])
+        return qs.filter(pk__in=subquery)
+
+    def _source_sql(self, index: SearchIndex, using: str, *, where: dict | None = None) -> str:
+        """SELECT (crud_pk, crud_f0..) compilado por el ORM (mismos JOINs que icontains).
+
+        where: filtros del trigger, ej: {"pk": 'NEW."id"'} (SQL crudo, sin parámetros).
+        """
+
+        exprs = {"crud_pk": F("pk")}
+        exprs.update({f"crud_f{i}": F(path) for i, path in enumerate(index.fields)})
+        qs = index.model._base_manager.using(using).order_by()
+        if where:
+            qs = qs.filter(**{k: RawSQL(v, []) for k, v in where.items()})
+        sql, params = qs.values(**exprs).query.sql_with_params()
+        if params:
+            raise ValueError(f"{index.name}: el queryset base del índice no puede tener parámetros")
+        return sql
+
+    def _trigger_sql(self, index: SearchIndex, using: str) -> list[str]:
+        table = self.table_name(index)
+        columns = ", ".join(f"f{i}" for i in range(len(index.fields)))
+        opts = index.model._meta
+        new_pk = f'NEW."{opts.pk.column}"'
+
+        def insert(where: dict) -> str:
+            return f'INSERT INTO "{table}" (rowid, {columns}) {self._source_sql(index, using, where=where)};'
+
+        statements = [
+            f'CREATE TRIGGER "{table}_ai" AFTER INSERT ON "{opts.db_table}" '
+            f'BEGIN {insert({"pk": new_pk})} END',
+            f'CREATE TRIGGER "{table}_au" AFTER UPDATE ON "{opts.db_table}" BEGIN '
+            f'DELETE FROM "{table}" WHERE rowid = OLD."{opts.pk.column}"; '
+            f'{insert({"pk": new_pk})} END',
+            f'CREATE TRIGGER "{table}_ad" AFTER DELETE ON "{opts.db_table}" BEGIN '
+            f'DELETE FROM "{table}" WHERE rowid = OLD."{opts.pk.column}"; END',
+        ]
+        # Cambio en un relacionado (ej: email del user): re-indexa las filas que lo apuntan.
+        for j, (prefix, field) in enumerate(self._hops(index)):
+            target = field.target_field
+            where = {prefix: f'NEW."{target.column}"'}
+            pks = index.model._base_manager.using(using).order_by()
+            pks = pks.filter(**{prefix: RawSQL(where[prefix], [])}).values("pk")
+            pks_sql, _ = pks.query.sql_with_params()
+            statements.append(
+                f'CREATE TRIGGER "{table}_r{j}_au" AFTER UPDATE ON "{target.model._meta.db_table}" BEGIN '
+                f'DELETE FROM "{table}" WHERE rowid IN ({pks_sql}); '
+                f"{insert(where)} END"
+            )
+        return statements
+
+    def build(self, index: SearchIndex, *, rebuild: bool = False) -> list[str]:
+        using = index.using
+        table = self.table_name(index)
+        columns = ", ".join(f"f{i}" for i in range(len(index.fields)))
+        triggers = self._trigger_sql(index, using)
+        with transaction.atomic(using=using), connections[using].cursor() as cursor:
+            # Triggers siempre recreados: los paths del índice pueden haber cambiado.
+            for name in self._trigger_names(index):
+                cursor.execute(f'DROP TRIGGER IF EXISTS "{name}"')
+            if rebuild:
+                cursor.execute(f'DROP TABLE IF EXISTS "{table}"')
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS "{table}" '
+                f"USING fts5({columns}, tokenize='trigram')"
+            )
+            cursor.execute(f'DELETE FROM "{table}"')
+            cursor.execute(f'INSERT INTO "{table}" (rowid, {columns}) {self._source_sql(index, using)}')
+            cursor.execute(f'SELECT COUNT(*) FROM "{table}"')
+            total = cursor.fetchone()[0]
+            for sql in triggers:
+                cursor.execute(sql)
+        return [f"{index.name}: {table} ({total} filas, {len(triggers)} triggers)"]
+
+
+SEARCH_BACKENDS: Dict[str, SearchBackend] = {
+    "icontains": SearchBackend(),
+    "postgres": PostgresSearchBackend(),
+    "sqlite_fts": SqliteFtsSearchBackend(),
+}
+
+_AUTO_BY_VENDOR = {"postgresql": "postgres", "sqlite": "sqlite_fts"}
+
+
+def get_search_backend(name: str, *, using: str = "default") -> SearchBackend:
+    name = (name or "icontains").strip().lower()
+    if name == "auto":
+        name = _AUTO_BY_VENDOR.get(connections[using].vendor, "icontains")
+    backend = SEARCH_BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Search backend desconocido: {name}")
+    return backend
+
+
+_INDEXES: Dict[str, SearchIndex] = {}
+
+
+def register_search_index(index: SearchIndex) -> None:
+    """Registro explícito (CrudConfig lo hace en register_crud; services, en ready())."""
+
+    if index.name in _INDEXES:
+        raise ValueError(f"SearchIndex ya registrado: {index.name}")
+    _INDEXES[index.name] = index
+    index.get_backend().install(index)
+
+
+def get_search_index(name: str) -> SearchIndex:
+    index = _INDEXES.get(name)
+    if not index:
+        raise KeyError(f"SearchIndex no registrado: {name}")
+    return index
+
+
+def indexes_for_model(model) -> list[SearchIndex]:
+    return [index for index in _INDEXES.values() if index.model is model]
@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
+
+
+class ColumnPathWarning(UserWarning):
+    """Una columna lee paths del modelo que no declaró en ColumnDef.fields."""
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    """Forma del queryset del listado derivada de las columnas declaradas.
+
+    - only: None si alguna columna no declara lo que lee (no se puede restringir).
+    - select_related: FKs/one-to-one hacia adelante (JOIN).
+    - prefetch_related: M2M y FKs inversas (query aparte, sin N+1).
+    """
+
+    only: tuple[str, ...] | None
+    select_related: tuple[str, ...]
+    prefetch_related: tuple[str, ...]
+
+    def apply(self, qs: QuerySet) -> QuerySet:
+        if self.select_related:
+            qs = qs.select_related(*self.select_related)
+        if self.prefetch_related:
+            qs = qs.prefetch_related(*self.prefetch_related)
+        if self.only:
+            only = self._only_for(qs)
+            if only:
+                qs = qs.only(*only)
+        return qs
+
+    def _only_for(self, qs: QuerySet) -> tuple[str, ...] | None:
+        # Respeta lo que ya hizo get_base_queryset: only()/defer() propios ganan,
+        # y no se puede diferir una relación que se traversa con select_related.
+        if qs.query.deferred_loading != (frozenset(), True):
+            return None
+        existing = qs.query.select_related
+        if existing is True:
+            return None
+        only = list(self.only or ())
+        if isinstance(existing, dict):
+            stack = [("", existing)]
+            while stack:
+                base, tree = stack.pop()
+                for name, sub in tree.items():
+                    path = f"{base}__{name}" if base else name
+                    if path not in only:
+                        only.append(path)
+                    stack.append((path, sub))
+        return tuple(only)
+
+
+def _get_field(model, name: str):
+    opts = model._meta
+    if name == "pk":
+        return opts.pk
+    try:
+        return opts.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def build_shape(model, paths: Iterable[str], *, restrict: bool) -> QueryShape:
+    """Clasifica paths ORM (ej: name, user__email, tags__name) en only/select/prefetch."""
+
+    only: list[str] = []
+    select: list[str] = []
+    prefetch: list[str] = []
+
+    def add(items: list[str], value: str) -> None:
+        if value not in items:
+            items.append(value)
+
+    for path in paths:
+        current = model
+        prefix: list[str] = []
+        loaded = True
+        for part in path.split("__"):
+            field = _get_field(current, part)
+            if field is None:
+                # Path no resoluble (ej: propiedad Python): no se puede restringir.
+                loaded = False
+                restrict = False
+                break
+            if not field.is_relation or field.related_model is None:
+                prefix.append(part)
+                break
+            prefix.append(part)
+            if field.many_to_many or field.one_to_many:
+                add(prefetch, "__".join(prefix))
+                if len(prefix) > 1:
+                    # El prefetch parte de un objeto JOINeado: necesita su pk.
+                    parent = "__".join(prefix[:-1])
+                    add(only, f"{parent}__{current._meta.pk.name}")
+                loaded = False
+                break
+            add(select, "__".join(prefix))
+            current = field.related_model
+        if loaded and prefix:
+            add(only, "__".join(prefix))
+
+    # select_related("a__b") ya incluye "a".
+    select = [s for s in select if not any(o.startswith(f"{s}__") for o in select)]
+    return QueryShape(
+        only=tuple(only) if restrict and only else None,
+        select_related=tuple(select),
+        prefetch_related=tuple(prefetch),
+    )
+
+
+def _code_names(func) -> set[str]:
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return set()
+    names = set(code.co_names)
+    for const in code.co_consts:
+        # Lambdas/comprehensions anidadas.
+        if hasattr(const, "co_names"):
+            names |= set(const.co_names)
+    return names
+
+
+def undeclared_reads(model, func, declared: Iterable[str]) -> list[str]:
+    """Heurística (bytecode) de atributos del modelo leídos por func y no declarados.
+
+    Detecta o.campo, o.get_campo_display() y o.relacion.campo. No ve lecturas
+    indirectas (métodos del modelo, __str__); por eso es un warning, no un error.
+    """
+
+    declared = set(declared)
+    heads = {p.split("__", 1)[0] for p in declared}
+    names = _code_names(func)
+    missing: list[str] = []
+
+    for name in sorted(names):
+        attr = name
+        if name.startswith("get_") and name.endswith("_display"):
+            attr = name[len("get_") : -len("_display")]
+        field = _get_field(model, attr)
+        if field is None or field.primary_key:
+            continue
+        if attr not in heads:
+            missing.append(attr)
+            continue
+        if not field.is_relation or field.related_model is None or attr in declared:
+            continue
+        for sub in sorted(names - {name}):
+            if _get_field(model, sub) is not None:
+                continue
+            if _get_field(field.related_model, sub) is None:
+                continue
+            path = f"{attr}__{sub}"
+            if not any(p == path or p.startswith(f"{path}__") for p in declared):
+                missing.append(path)
+    return missing
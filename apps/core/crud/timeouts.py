@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.db import DatabaseError, connections, transaction
+
+# Instrucciones de la VM de SQLite entre chequeos del reloj.
+SQLITE_PROGRESS_STEPS = 10_000
+# SQLSTATE query_canceled (statement_timeout).
+_PG_QUERY_CANCELED = "57014"
+
+
+class QueryTimeout(Exception):
+    """Una query del listado excedió CrudConfig.query_timeout_ms."""
+
+
+def _pg_canceled(exc: DatabaseError) -> bool:
+    cause = exc.__cause__
+    # psycopg2: pgcode · psycopg 3: sqlstate
+    return (getattr(cause, "pgcode", None) or getattr(cause, "sqlstate", None)) == _PG_QUERY_CANCELED
+
+
+@contextmanager
+def _pg_timeout(using: str, ms: int) -> Iterator[None]:
+    conn = connections[using]
+    try:
+        # set_config(..., true) = SET LOCAL: muere con la transacción (o el savepoint).
+        with transaction.atomic(using=using):
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "SELECT current_setting('statement_timeout'), "
+                    "set_config('statement_timeout', %s, true)",
+                    [f"{int(ms)}ms"],
+                )
+                previous = cursor.fetchone()[0]
+            yield
+            # Dentro de una transacción externa el savepoint no resetea el valor.
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT set_config('statement_timeout', %s, true)", [previous])
+    except DatabaseError as exc:
+        if _pg_canceled(exc):
+            raise QueryTimeout(f"statement_timeout={ms}ms") from exc
+        raise
+
+
+@contextmanager
+def _sqlite_timeout(using: str, ms: int) -> Iterator[None]:
+    conn = connections[using]
+    conn.ensure_connection()
+    state = {"deadline": None, "fired": False}
+
+    def progress() -> int:
+        deadline = state["deadline"]
+        if deadline is not None and time.monotonic() > deadline:
+            state["fired"] = True
+            return 1  # != 0 interrumpe la sentencia
+        return 0
+
+    def per_statement(execute, sql, params, many, context):
+        # El plazo corre por sentencia (mismo criterio que statement_timeout).
+        state["deadline"] = time.monotonic() + ms / 1000
+        return execute(sql, params, many, context)
+
+    raw = conn.connection
+    raw.set_progress_handler(progress, SQLITE_PROGRESS_STEPS)
+    try:
+        with conn.execute_wrapper(per_statement):
+            yield
+    except DatabaseError as exc:
+        if state["fired"]:
+            raise QueryTimeout(f"sqlite interrumpido a los {ms}ms") from exc
+        raise
+    finally:
+        raw.set_progress_handler(None, 0)
+
+
+@contextmanager
+def statement_timeout(using: str, ms: int | None) -> Iterator[None]:
+    """Corta cada query del bloque que tarde más de `ms` → QueryTimeout.
+
+    PostgreSQL: statement_timeout local (transacción o savepoint). SQLite: progress
+    handler. Otros motores o ms vacío: sin límite.
+    """
+
+    vendor = connections[using].vendor if ms else ""
+    if vendor == "postgresql":
+        with _pg_timeout(using, ms):
+            yield
+    elif vendor == "sqlite":
+        with _sqlite_timeout(using, ms):
+            yield
+    else:
+        yield
@@ -0,0 +1,173 @@
+"""Lecturas en réplica (opt-in) con read-your-writes.
+
+Por defecto todo va a "default". Una vista decorada con @replica_reads (o un
+CrudConfig con read_replica=True) manda sus lecturas al alias
+settings.DATABASE_REPLICA_ALIAS mientras corre, incluido el streaming de la respuesta.
+Las escrituras siempre van al primario.
+
+Read-your-writes: una request no segura (POST/PUT/PATCH/DELETE) lee del primario y
+ReplicaPinMiddleware deja una cookie que fija al usuario al primario durante
+CRUD_REPLICA_PIN_SECONDS (lag de replicación tolerado).
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial, wraps
+from typing import Iterator
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_COOKIE = "db_primary"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS", "TRACE"}
+# Nunca desde la réplica: una sesión recién creada todavía no existe ahí.
+PRIMARY_ONLY_APPS = {"sessions"}
+
+_read_alias: ContextVar[str | None] = ContextVar("db_read_alias", default=None)
+
+
+def replica_alias() -> str | None:
+    """Alias de la réplica si está configurada en DATABASES."""
+
+    alias = getattr(settings, "DATABASE_REPLICA_ALIAS", "replica")
+    return alias if alias in settings.DATABASES else None
+
+
+def pin_seconds() -> int:
+    return int(getattr(settings, "CRUD_REPLICA_PIN_SECONDS", 10) or 0)
+
+
+def is_pinned(request) -> bool:
+    """La request escribe o escribió hace poco: sus lecturas van al primario."""
+
+    return request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES
+
+
+def read_alias(request) -> str | None:
+    """Alias de lectura para esta request (None = primario)."""
+
+    alias = replica_alias()
+    if alias is None or is_pinned(request):
+        return None
+    return alias
+
+
+def reading_replica() -> bool:
+    """¿Las lecturas del contexto actual van a la réplica?"""
+
+    return _read_alias.get() is not None
+
+
+@contextmanager
+def reads_from(alias: str | None) -> Iterator[None]:
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def bind_streaming(response, alias: str | None):
+    """El iterador de un StreamingHttpResponse corre después de la vista: re-entra al alias."""
+
+    if alias is None or not getattr(response, "streaming", False):
+        return response
+
+    if response.is_async:
+        content = response.streaming_content
+
+        async def aiterate():
+            it = aiter(content)
+            while True:
+                with reads_from(alias):
+                    try:
+                        chunk = await anext(it)
+                    except StopAsyncIteration:
+                        return
+                yield chunk
+
+        response.streaming_content = aiterate()
+    else:
+        content = response.streaming_content
+
+        def iterate():
+            it = iter(content)
+            while True:
+                with reads_from(alias):
+                    try:
+                        chunk = next(it)
+                    except StopIteration:
+                        return
+                yield chunk
+
+        response.streaming_content = iterate()
+    return response
+
+
+def _resolve_user(request) -> None:
+    # request.user es lazy: que sesión y usuario se lean del primario, no de la réplica.
+    user = getattr(request, "user", None)
+    if user is not None:
+        user.is_authenticated
+
+
+def call_with_replica(request, call):
+    """call() con lecturas a la réplica salvo request fijada (sync)."""
+
+    alias = read_alias(request)
+    if alias is not None:
+        _resolve_user(request)
+    with reads_from(alias):
+        response = call()
+    return bind_streaming(response, alias)
+
+
+async def acall_with_replica(request, call):
+    alias = read_alias(request)
+    auser = getattr(request, "auser", None)
+    if alias is not None and auser is not None:
+        request.user = await auser()
+    with reads_from(alias):
+        response = await call()
+    return bind_streaming(response, alias)
+
+
+def replica_reads(view):
+    """Decorador de vistas (sync/async): lecturas a la réplica salvo request fijada."""
+
+    if iscoroutinefunction(view):
+
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            return await acall_with_replica(request, partial(view, request, *args, **kwargs))
+
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        return call_with_replica(request, partial(view, request, *args, **kwargs))
+
+    return wrapper
+
+
+class ReplicaRouter:
+    """Lecturas al alias activo (reads_from); escrituras y migraciones como siempre."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplica y primario tienen los mismos datos.
+        aliases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
@@ -0,0 +1,102 @@
+"""Jobs de apps.core (RQ: `python manage.py rqworker default`; ver apps.core.services.export_jobs)."""
+
+from __future__ import annotations
+
+import logging
+from tempfile import TemporaryFile
+
+from django.core.files import File
+from django.utils import timezone
+
+from apps.core.models import ExportJob
+from apps.core.services.export_jobs import build_export_spec, purge_expired_jobs
+from apps.core.services.exporting import (
+    export_cache_key,
+    export_filename,
+    open_cached_export,
+    pdf_max_rows,
+    store_export,
+    write_export,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def run_export_job(job_id: str) -> None:
+    """Genera el archivo de un ExportJob y lo guarda en el storage por defecto."""
+
+    # Claim atómico: un job reencolado (o tomado por otro worker) no corre dos veces.
+    claimed = ExportJob.objects.filter(pk=job_id, status=ExportJob.Status.PENDING).update(
+        status=ExportJob.Status.RUNNING, updated_at=timezone.now()
+    )
+    if not claimed:
+        return
+
+    job = ExportJob.objects.select_related("user").get(pk=job_id)
+
+    def progress(**fields) -> None:
+        # update() no toca auto_now: el latido (updated_at) va explícito (ver fail_stale_jobs).
+        ExportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now(), **fields)
+
+    try:
+        spec = build_export_spec(job.source, job.user, job.params)
+        total = spec.queryset.count()
+        if job.format == "pdf" and pdf_max_rows():
+            total = min(total, pdf_max_rows())
+        progress(total_rows=total)
+
+        filename = export_filename(spec.filename_base, job.format)
+
+        def write(out) -> int:
+            return write_export(
+                job.format,
+                queryset=spec.queryset,
+                fields=spec.fields,
+                headers=spec.headers,
+                out=out,
+                title=spec.title,
+                sheet_name=spec.sheet_name,
+                on_progress=lambda n: progress(processed_rows=n),
+            )
+
+        key = export_cache_key(
+            job.format,
+            queryset=spec.queryset,
+            fields=spec.fields,
+            headers=spec.headers,
+            title=spec.title,
+            sheet_name=spec.sheet_name,
+        )
+        # Con clave: el archivo sale del cache de exports (o se genera ahí) y se copia al storage.
+        out = open_cached_export(key, job.format) if key else None
+        if out is not None:
+            rows = total
+        elif key:
+            out, rows = store_export(key, job.format, write)
+        else:
+            out = TemporaryFile()
+            rows = write(out)
+            out.seek(0)
+        progress()
+        with out:
+            job.file.save(filename, File(out, name=filename), save=False)
+    except Exception as e:
+        logger.exception("Export %s falló", job.pk)
+        progress(status=ExportJob.Status.FAILED, error=str(e)[:1000], finished_at=timezone.now())
+        return
+
+    progress(
+        status=ExportJob.Status.DONE,
+        file=job.file.name,
+        filename=filename,
+        processed_rows=rows,
+        total_rows=rows,
+        finished_at=timezone.now(),
+    )
+
+
+def purge_export_jobs() -> None:
+    """Retención de exports para un scheduler RQ (equivale a `manage.py purge_export_jobs`)."""
+
+    jobs, files = purge_expired_jobs()
+    logger.info("Exports vencidos borrados: %s (%s archivos)", jobs, files)
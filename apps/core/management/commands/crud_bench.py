@@ -0,0 +1,348 @@
+from __future__ import annotations
+
+import json
+import math
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.core.crud.budget import BUDGET_URLS, EXPORT_FORMATS, _export_fields, seed_config
+from apps.core.crud.config import CrudConfig
+from apps.core.crud.engine import render_list_fragment
+from apps.core.crud.registry import _CRUDS
+from apps.core.crud.search import indexes_for_model
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(p * len(ordered)) - 1))]
+
+    return {
+        "p50": round(statistics.median(ordered), 3),
+        "p95": round(pct(0.95), 3),
+        "p99": round(pct(0.99), 3),
+        "mean": round(statistics.fmean(ordered), 3),
+        "min": round(ordered[0], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _analyze(using: str, table: str) -> None:
+    """Estadísticas del planner tras la carga (y estimated_count)."""
+
+    conn = connections[using]
+    with conn.cursor() as cursor:
+        if conn.vendor == "postgresql":
+            cursor.execute(f"ANALYZE {conn.ops.quote_name(table)}")
+        elif conn.vendor == "sqlite":
+            cursor.execute("ANALYZE")
+        elif conn.vendor == "mysql":
+            cursor.execute(f"ANALYZE TABLE {conn.ops.quote_name(table)}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark de CRUDs con datos sintéticos: completa N filas por modelo y mide "
+        "p50/p95/p99 de primera página, página profunda, búsqueda, filtro+orden y exports. "
+        "Usa la BD configurada (DJANGO_DB_ENGINE/DJANGO_DB_NAME): correr una vez por motor. "
+        "Usar una BD dedicada: las filas cargadas no se borran."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--slug", action="append", help="crud_slug a medir (repetible; default: todos).")
+        parser.add_argument(
+            "--rows", type=int, default=100_000, help="Filas objetivo por modelo (default: 100000)."
+        )
+        parser.add_argument("--batch", type=int, default=5_000, help="Filas por lote de carga (default: 5000).")
+        parser.add_argument("--iterations", type=int, default=30, help="Mediciones por escenario (default: 30).")
+        parser.add_argument("--warmup", type=int, default=3, help="Ejecuciones previas sin medir (default: 3).")
+        parser.add_argument(
+            "--export-rows",
+            type=int,
+            default=10_000,
+            help="Filas por export medido (default: 10000; 0 = sin límite).",
+        )
+        parser.add_argument(
+            "--export-iterations", type=int, default=5, help="Mediciones por formato (default: 5)."
+        )
+        parser.add_argument(
+            "--memory",
+            action="store_true",
+            help="Pico de memoria por export (tracemalloc) + XLSX bufferizado como referencia.",
+        )
+        parser.add_argument("--skip-load", action="store_true", help="No cargar filas (medir lo existente).")
+        parser.add_argument("--output", default=None, help="Ruta del JSON de resultados.")
+        parser.add_argument("--baseline", default=None, help="JSON de una corrida anterior para comparar p95.")
+        parser.add_argument(
+            "--fail-over",
+            type=float,
+            default=None,
+            help="Con --baseline: falla si algún p95 empeora más de este porcentaje.",
+        )
+
+    def handle(self, *args, **options):
+        slugs = options.get("slug") or []
+        unknown = [s for s in slugs if s not in _CRUDS]
+        if unknown:
+            raise CommandError(f"CrudConfig no registrado: {', '.join(unknown)}")
+        configs = [_CRUDS[s] for s in slugs] if slugs else list(_CRUDS.values())
+        configs = [c for c in configs if c.list_columns]
+        if not configs:
+            raise CommandError("No hay CRUDs con columnas de listado.")
+
+        user = get_user_model()._default_manager.filter(is_superuser=True, is_active=True).first()
+        if user is None:
+            raise CommandError("Se necesita un superusuario activo (createsuperuser).")
+
+        conn = connections[router.db_for_read(configs[0].model)]
+        report = {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "vendor": conn.vendor,
+                "database": str(conn.settings_dict.get("NAME")),
+                "django": django.get_version(),
+                "python": platform.python_version(),
+                "rows": options["rows"],
+                "iterations": options["iterations"],
+                "export_rows": options["export_rows"],
+                "memory": options["memory"],
+            },
+            "results": {},
+        }
+
+        for config in configs:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{config.crud_slug} ({conn.vendor})"))
+            if not options["skip_load"]:
+                self._load(config, options["rows"], options["batch"])
+            report["results"][config.crud_slug] = self._bench(config, user, options)
+
+        if options["output"]:
+            path = Path(options["output"])
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+            self.stdout.write(self.style.SUCCESS(f"Resultados: {path}"))
+
+        if options["baseline"]:
+            self._compare(report, options["baseline"], options["fail_over"])
+
+    # --- carga ---
+    def _load(self, config: CrudConfig, target: int, batch: int) -> None:
+        model = config.model
+        using = router.db_for_write(model)
+        existing = model._default_manager.using(using).count()
+        missing = max(target - existing, 0)
+        if not missing:
+            self.stdout.write(f"  {existing} filas (sin carga)")
+            return
+
+        start = time.perf_counter()
+        loaded = 0
+        while loaded < missing:
+            size = min(batch, missing - loaded)
+            with transaction.atomic(using=using):
+                loaded += seed_config(config, size, start=existing + loaded)
+            self.stdout.write(f"  cargadas {existing + loaded}/{target}", ending="\r")
+            self.stdout.flush()
+        self.stdout.write(f"  cargadas {loaded} filas en {time.perf_counter() - start:.1f}s")
+
+        # Índices de búsqueda (re)construidos sobre el dataset nuevo + estadísticas.
+        for index in indexes_for_model(model):
+            for line in index.get_backend().build(index, rebuild=True):
+                self.stdout.write(f"  [{index.backend}] {line}")
+        _analyze(using, model._meta.db_table)
+
+    # --- escenarios ---
+    def _scenarios(self, config: CrudConfig, user) -> list[tuple[str, dict, str | None]]:
+        model = config.model
+        request = RequestFactory().get("/")
+        request.user = user
+        base = config.get_base_queryset(request)
+        total = base.count()
+        pages = max(1, math.ceil(total / config.page_size))
+
+        scenarios: list[tuple[str, dict, str | None]] = [
+            ("first_page", {}, None),
+            # Página profunda en offset: el costo que keyset evita.
+            ("deep_page", {"page": str(max(1, int(pages * 0.9)))}, "offset"),
+        ]
+
+        if config.search_fields:
+            field = config.search_fields[0]
+            sample = base.order_by("-pk").values_list(field, flat=True).first()
+            if sample:
+                sample = str(sample)
+                scenarios.append(("search", {"q": sample}, None))
+                scenarios.append(("search_broad", {"q": sample[:3]}, None))
+
+        sortable = [c for c in config.list_columns if c.sortable and c.order_by]
+        filter_def = next((f for f in config.filters if f.field), None)
+        if filter_def is not None and sortable:
+            value = base.exclude(**{f"{filter_def.field}__isnull": True}).values_list(
+                filter_def.field, flat=True
+            ).first()
+            if value is not None:
+                scenarios.append(
+                    (
+                        "filter_sort",
+                        {filter_def.name: str(value), "sort": sortable[-1].key, "dir": "desc"},
+                        None,
+                    )
+                )
+        self.stdout.write(f"  {total} filas visibles · {pages} páginas")
+        return scenarios
+
+    def _run(self, fn, *, using: str, warmup: int, iterations: int) -> dict:
+        for _ in range(warmup):
+            fn()
+        samples: list[float] = []
+        queries = 0
+        for _ in range(iterations):
+            with CaptureQueriesContext(connections[using]) as ctx:
+                start = time.perf_counter()
+                fn()
+                samples.append((time.perf_counter() - start) * 1000)
+            queries = len(ctx.captured_queries)
+        return {**_percentiles(samples), "queries": queries}
+
+    def _bench(self, config: CrudConfig, user, options) -> dict:
+        using = router.db_for_read(config.model)
+        factory = RequestFactory()
+        results: dict[str, dict] = {}
+
+        def table(query: dict, mode: str | None):
+            def run():
+                request = factory.get("/", query)
+                request.user = user
+                # Sin CSRF_COOKIE: sin cache de fragmentos ni ETag (render en frío).
+                response = render_list_fragment(
+                    config=config, request=request, crud_urls=BUDGET_URLS, pagination_mode=mode
+                )
+                if response.status_code != 200:
+                    raise CommandError(f"{config.crud_slug}: status {response.status_code}")
+
+            return run
+
+        saved = config.facet_cache_timeout, config.count_cache_timeout
+        config.facet_cache_timeout = 0
+        config.count_cache_timeout = 0
+        try:
+            filter_query: dict = {}
+            for name, query, mode in self._scenarios(config, user):
+                results[name] = {
+                    "query": query,
+                    **self._run(
+                        table(query, mode),
+                        using=using,
+                        warmup=options["warmup"],
+                        iterations=options["iterations"],
+                    ),
+                }
+                if name == "filter_sort":
+                    filter_query = query
+                self._line(name, results[name])
+
+            if config.is_export_enabled():
+                results.update(self._bench_exports(config, user, filter_query, options, using))
+        finally:
+            config.facet_cache_timeout, config.count_cache_timeout = saved
+        return results
+
+    def _bench_exports(self, config: CrudConfig, user, query: dict, options, using: str) -> dict:
+        from apps.core.services.exporting import build_pdf_table, build_xlsx, stream_csv, stream_xlsx
+
+        builders = {"csv": stream_csv, "xlsx": stream_xlsx, "pdf": build_pdf_table}
+        formats = [(fmt, fmt) for fmt in EXPORT_FORMATS]
+        if options["memory"] and config.allows_format("xlsx"):
+            # Referencia: workbook openpyxl completo en memoria antes del primer byte.
+            builders["xlsx_buffered"] = build_xlsx
+            formats.append(("xlsx_buffered", "xlsx"))
+        fields, headers = _export_fields(config)
+        limit = options["export_rows"]
+        results: dict[str, dict] = {}
+        for name, fmt in formats:
+            if not config.allows_format(fmt):
+                continue
+
+            def run(name=name):
+                request = RequestFactory().get("/", query)
+                request.user = user
+                qs = config.queryset_for_list(request, config.parse_params(request))
+                if limit:
+                    qs = qs[:limit]
+                response = builders[name](queryset=qs, fields=fields, headers=headers, filename_base="bench")
+                if getattr(response, "streaming", False):
+                    for _ in response.streaming_content:
+                        pass
+
+            try:
+                stats = self._run(run, using=using, warmup=1, iterations=options["export_iterations"])
+                if options["memory"]:
+                    stats["peak_kb"] = self._peak_kb(run)
+            except RuntimeError as exc:  # Dependencia faltante: openpyxl/reportlab
+                self.stdout.write(self.style.WARNING(f"  export_{name}: omitido ({exc})"))
+                continue
+            key = f"export_{name}"
+            results[key] = {"query": query, "limit": limit, **stats}
+            self._line(key, results[key])
+        return results
+
+    @staticmethod
+    def _peak_kb(fn) -> float:
+        """Pico de memoria Python asignada durante fn() (aparte: tracemalloc distorsiona tiempos)."""
+
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return round(peak / 1024, 1)
+
+    def _line(self, name: str, stats: dict) -> None:
+        peak = f" · pico {stats['peak_kb']:.0f} KiB" if "peak_kb" in stats else ""
+        self.stdout.write(
+            f"  {name:<14} p50 {stats['p50']:>9.2f} ms · p95 {stats['p95']:>9.2f} ms · "
+            f"p99 {stats['p99']:>9.2f} ms · {stats['queries']} queries{peak}"
+        )
+
+    # --- baseline ---
+    def _compare(self, report: dict, baseline_path: str, fail_over: float | None) -> None:
+        try:
+            baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Baseline ilegible: {exc}") from exc
+
+        self.stdout.write("")
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"vs baseline {baseline_path} ({baseline.get('meta', {}).get('vendor', '?')}, "
+                f"{baseline.get('meta', {}).get('timestamp', '?')})"
+            )
+        )
+        regressions = []
+        for slug, scenarios in report["results"].items():
+            for name, stats in scenarios.items():
+                old = baseline.get("results", {}).get(slug, {}).get(name)
+                if not old or not old.get("p95"):
+                    continue
+                change = (stats["p95"] - old["p95"]) / old["p95"] * 100
+                line = f"  {slug} {name}: p95 {old['p95']:.2f} → {stats['p95']:.2f} ms ({change:+.1f}%)"
+                if fail_over is not None and change > fail_over:
+                    regressions.append(line)
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+        if regressions:
+            raise CommandError(f"{len(regressions)} escenario(s) empeoran más de {fail_over}% en p95.")
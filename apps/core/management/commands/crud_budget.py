@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.crud.budget import BudgetSeedError, run_budget
+from apps.core.crud.registry import _CRUDS
+
+
+class Command(BaseCommand):
+    help = (
+        "Presupuesto de queries y tiempo por CRUD registrado: siembra filas sintéticas "
+        "(transacción revertida), renderiza list/table/exports en varios page sizes y "
+        "falla si se excede CrudConfig.budget o las queries crecen con la página (N+1)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--slug", default=None, help="crud_slug a medir (default: todos).")
+        parser.add_argument(
+            "--only",
+            choices=["list", "table", "export"],
+            action="append",
+            help="Renders a medir (repetible; default: todos).",
+        )
+        parser.add_argument(
+            "--no-seed", action="store_true", help="Medir con los datos existentes (sin filas sintéticas)."
+        )
+
+    def handle(self, *args, **options):
+        slug = options.get("slug")
+        if slug and slug not in _CRUDS:
+            raise CommandError(f"CrudConfig no registrado: {slug}")
+        configs = [_CRUDS[slug]] if slug else list(_CRUDS.values())
+        renders = tuple(options["only"] or ("list", "table", "export"))
+
+        failures = 0
+        for config in configs:
+            if not config.list_columns:
+                self.stdout.write(f"{config.crud_slug}: sin columnas de listado; se omite.")
+                continue
+            self.stdout.write(self.style.MIGRATE_HEADING(config.crud_slug))
+            try:
+                results = run_budget(
+                    config,
+                    renders=renders,
+                    seed=not options["no_seed"],
+                    on_note=lambda msg: self.stdout.write(f"  · {msg}"),
+                )
+            except BudgetSeedError as exc:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"  seed: {exc} (declara CrudBudget.seed)"))
+                continue
+
+            for r in results:
+                size = f" page_size={r.page_size}" if r.page_size else ""
+                line = (
+                    f"  {r.render}{size}: {r.queries}/{r.max_queries} queries · "
+                    f"{r.ms:.1f}/{r.max_ms:.0f} ms · {r.rows} filas"
+                )
+                if r.error:
+                    line = f"  {r.render}{size}: {r.error}"
+                if r.ok:
+                    self.stdout.write(line)
+                else:
+                    failures += 1
+                    self.stdout.write(self.style.ERROR(f"{line}  ✗"))
+
+        if failures:
+            raise CommandError(f"{failures} render(s) fuera de presupuesto.")
+        self.stdout.write(self.style.SUCCESS("Todos los CRUDs dentro de presupuesto."))
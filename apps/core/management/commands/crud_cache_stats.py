@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.crud.cache import fragment_cache_stats
+from apps.core.crud.registry import _CRUDS
+
+
+class Command(BaseCommand):
+    help = "Hits/misses de la cache de fragmentos por crud_slug."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--slug", default=None, help="crud_slug (default: todos).")
+
+    def handle(self, *args, **options):
+        slug = options.get("slug")
+        if slug and slug not in _CRUDS:
+            raise CommandError(f"CrudConfig no registrado: {slug}")
+        configs = [_CRUDS[slug]] if slug else list(_CRUDS.values())
+
+        for config in configs:
+            if not config.fragment_cache_timeout:
+                self.stdout.write(f"{config.crud_slug}: cache desactivada")
+                continue
+            stats = fragment_cache_stats(config.crud_slug)
+            total = stats["hits"] + stats["misses"]
+            ratio = stats["hits"] / total * 100 if total else 0.0
+            self.stdout.write(
+                f"{config.crud_slug}: hits {stats['hits']} · misses {stats['misses']} · "
+                f"hit ratio {ratio:.1f}%"
+            )
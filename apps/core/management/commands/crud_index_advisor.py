@@ -0,0 +1,374 @@
+from __future__ import annotations
+
+import os
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, models, router
+from django.db.migrations import Migration
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.operations import AddIndex
+from django.db.migrations.writer import MigrationWriter
+from django.test import RequestFactory
+from django.utils import timezone
+
+from apps.core.crud.config import CrudConfig
+from apps.core.crud.registry import _CRUDS
+
+
+# pg_stats.correlation desde la que un BRIN descarta la mayoría de los bloques.
+BRIN_CORRELATION = 0.9
+
+
+@dataclass
+class Probe:
+    """Una combinación representativa (filtro + orden) del listado."""
+
+    label: str
+    query: dict
+    columns: tuple[str, ...]
+    skipped: list[str] = field(default_factory=list)
+
+
+def _explain_flags(vendor: str, plan: str) -> list[str]:
+    """Detecta full scans y sorts en la salida de EXPLAIN según el motor."""
+
+    flags: list[str] = []
+    lines = plan.splitlines()
+    if vendor == "sqlite":
+        if any("SCAN " in ln and "INDEX" not in ln for ln in lines):
+            flags.append("seq scan")
+        if any("TEMP B-TREE FOR ORDER BY" in ln for ln in lines):
+            flags.append("sort")
+    elif vendor == "postgresql":
+        if any("Seq Scan" in ln for ln in lines):
+            flags.append("seq scan")
+        if any(ln.strip().startswith(("Sort", "->  Sort", "Incremental Sort")) for ln in lines):
+            flags.append("sort")
+    elif vendor == "mysql":
+        if any("\tALL\t" in ln or " ALL " in ln for ln in lines):
+            flags.append("seq scan")
+        if "Using filesort" in plan:
+            flags.append("sort")
+    return flags
+
+
+def _column(model, path: str) -> str | None:
+    """Nombre de campo local indexable (None si cruza relaciones)."""
+
+    if "__" in path:
+        return None
+    if path == "pk":
+        return model._meta.pk.name
+    try:
+        f = model._meta.get_field(path)
+    except Exception:
+        return None
+    if not getattr(f, "concrete", False) or f.many_to_many:
+        return None
+    return f.name
+
+
+def _existing_indexes(model) -> list[tuple[str, ...]]:
+    opts = model._meta
+    existing: list[tuple[str, ...]] = [(opts.pk.name,)]
+    for idx in opts.indexes:
+        if idx.fields:
+            existing.append(tuple(f.lstrip("-") for f in idx.fields))
+    for together in opts.unique_together:
+        existing.append(tuple(together))
+    for constraint in opts.constraints:
+        fields = getattr(constraint, "fields", None)
+        if fields and getattr(constraint, "condition", None) is None:
+            existing.append(tuple(fields))
+    for f in opts.concrete_fields:
+        if f.db_index or f.unique:
+            existing.append((f.name,))
+    return existing
+
+
+def _covered(columns: tuple[str, ...], existing: list[tuple[str, ...]], pk: str) -> bool:
+    wanted = [columns]
+    if len(columns) > 1 and columns[-1] == pk:
+        # SQLite/InnoDB guardan el pk en cada índice secundario.
+        wanted.append(columns[:-1])
+    return any(e[: len(w)] == w for e in existing for w in wanted)
+
+
+def _append_only(config: CrudConfig, using: str) -> bool:
+    """date_field crece con el pk (auto_now_add o correlación física alta en pg_stats)."""
+
+    field = config.model._meta.get_field(config.date_field)
+    if getattr(field, "auto_now_add", False):
+        return True
+    with connections[using].cursor() as cursor:
+        cursor.execute(
+            "SELECT correlation FROM pg_stats WHERE tablename = %s AND attname = %s",
+            [config.model._meta.db_table, field.column],
+        )
+        row = cursor.fetchone()
+    return bool(row and row[0] is not None and abs(row[0]) >= BRIN_CORRELATION)
+
+
+def _has_brin(model, field_name: str) -> bool:
+    return any(
+        type(idx).__name__ == "BrinIndex" and list(idx.fields) == [field_name]
+        for idx in model._meta.indexes
+    )
+
+
+def _sample_value(config: CrudConfig, filter_field: str):
+    f = config.model._meta.get_field(filter_field)
+    if f.choices:
+        return f.choices[0][0]
+    value = (
+        config.model._default_manager.exclude(**{f"{filter_field}__isnull": True})
+        .values_list(filter_field, flat=True)
+        .first()
+    )
+    return value
+
+
+class Command(BaseCommand):
+    help = (
+        "Revisa los índices que necesita cada CRUD registrado: EXPLAIN por combinación de "
+        "filtro y orden (y rango de fechas), reporta seq scans/sorts y (opcional) genera "
+        "la migración. En PostgreSQL sugiere BRIN para date_field append-only."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--slug", default=None, help="crud_slug a revisar (default: todos).")
+        parser.add_argument(
+            "--emit-migration",
+            action="store_true",
+            help="Escribe una migración AddIndex por app con los índices faltantes.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Con --emit-migration: imprime la migración en lugar de escribirla.",
+        )
+        parser.add_argument("--verbose-plan", action="store_true", help="Imprime el EXPLAIN completo.")
+
+    def handle(self, *args, **options):
+        slug = options.get("slug")
+        if slug and slug not in _CRUDS:
+            raise CommandError(f"CrudConfig no registrado: {slug}")
+        configs = [_CRUDS[slug]] if slug else list(_CRUDS.values())
+
+        missing: dict[type, list[tuple[str, ...]]] = defaultdict(list)
+        brin: dict[type, list[str]] = defaultdict(list)
+        for config in configs:
+            if not config.list_columns:
+                self.stdout.write(f"{config.crud_slug}: sin columnas de listado; se omite.")
+                continue
+            for cols in self._advise(config, verbose=options["verbose_plan"]):
+                if cols not in missing[config.model]:
+                    missing[config.model].append(cols)
+            field_name = self._advise_brin(config)
+            if field_name and field_name not in brin[config.model]:
+                brin[config.model].append(field_name)
+
+        if not any(missing.values()) and not any(brin.values()):
+            self.stdout.write(self.style.SUCCESS("Sin índices faltantes."))
+            return
+
+        self.stdout.write("")
+        self.stdout.write("Índices sugeridos (agregar a Meta.indexes del modelo):")
+        by_app: dict[str, list[tuple[type, models.Index]]] = defaultdict(list)
+        for model in {**missing, **brin}:
+            wanted = missing.get(model, [])
+            # (a, b) sobra si ya se sugiere (a, b, ...).
+            wanted = [w for w in wanted if not any(o != w and o[: len(w)] == w for o in wanted)]
+            self.stdout.write(f"  {model._meta.label}:")
+            for cols in wanted:
+                index = models.Index(fields=list(cols), name="")
+                index.set_name_with_model(model)
+                by_app[model._meta.app_label].append((model, index))
+                self.stdout.write(f"    models.Index(fields={list(cols)!r}, name={index.name!r}),")
+            for field_name in brin.get(model, []):
+                from django.contrib.postgres.indexes import BrinIndex
+
+                index = BrinIndex(fields=[field_name], name="")
+                index.set_name_with_model(model)
+                by_app[model._meta.app_label].append((model, index))
+                self.stdout.write(f"    BrinIndex(fields={[field_name]!r}, name={index.name!r}),")
+
+        if options["emit_migration"]:
+            for app_label, items in by_app.items():
+                self._emit(app_label, items, dry_run=options["dry_run"])
+
+    # --- análisis ---
+    def _probes(self, config: CrudConfig) -> list[Probe]:
+        model = config.model
+        pk = model._meta.pk.name
+
+        sorts: list[tuple[str, tuple[str, ...]]] = []
+        for col in config.list_columns:
+            if col.sortable and col.order_by:
+                order = (col.order_by,) if isinstance(col.order_by, str) else tuple(col.order_by)
+                sorts.append((col.key, order))
+        if not sorts:
+            sorts.append(("", ("pk",)))
+
+        filters: list[tuple[str | None, str | None]] = [(None, None)]
+        for f in config.filters:
+            filters.append((f.name, f.field))
+
+        probes: list[Probe] = []
+        for name, filter_field in filters:
+            query: dict = {}
+            prefix: list[str] = []
+            if name:
+                column = _column(model, filter_field) if filter_field else None
+                if column is None:
+                    reason = "sin FilterDef.field" if not filter_field else f"por relación ({filter_field})"
+                    self.stdout.write(f"  filtro '{name}' {reason}: se omite")
+                    continue
+                value = _sample_value(config, column)
+                if value is None:
+                    self.stdout.write(f"  filtro '{name}': sin valores de muestra; se omite")
+                    continue
+                query[name] = str(value)
+                prefix.append(column)
+            for key, order in sorts:
+                cols = list(prefix)
+                sort_skipped: list[str] = []
+                for path in (*order, "pk"):
+                    column = _column(model, path)
+                    if column is None:
+                        sort_skipped.append(f"orden por relación ({path})")
+                        cols = []
+                        break
+                    if column not in cols:
+                        cols.append(column)
+                if cols == [pk]:
+                    cols = []
+                label = f"{name}=… " if name else ""
+                probes.append(
+                    Probe(
+                        label=f"{label}sort={key or '(pk)'}",
+                        query={**query, "sort": key, "dir": "asc"},
+                        columns=tuple(cols),
+                        skipped=sort_skipped,
+                    )
+                )
+        return probes + self._date_probes(config, filters)
+
+    def _date_probes(self, config: CrudConfig, filters: list[tuple[str | None, str | None]]) -> list[Probe]:
+        """Rango from/to (30 días) solo y con cada filtro de igualdad: (filtro, date_field, pk)."""
+
+        if not config.date_field:
+            return []
+        model = config.model
+        today = timezone.localdate()
+        window = {"from": (today - timedelta(days=30)).isoformat(), "to": today.isoformat()}
+        probes: list[Probe] = []
+        for name, filter_field in filters:
+            query = dict(window)
+            cols: list[str] = []
+            if name:
+                column = _column(model, filter_field) if filter_field else None
+                value = _sample_value(config, column) if column else None
+                if value is None:
+                    continue
+                query[name] = str(value)
+                cols.append(column)
+            cols += [config.date_field, model._meta.pk.name]
+            label = f"{name}=… " if name else ""
+            probes.append(Probe(label=f"{label}{config.date_field}=[from, to)", query=query, columns=tuple(cols)))
+        return probes
+
+    def _advise(self, config: CrudConfig, *, verbose: bool) -> list[tuple[str, ...]]:
+        model = config.model
+        vendor = connections[router.db_for_read(model)].vendor
+        existing = _existing_indexes(model)
+        pk = model._meta.pk.name
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f"{config.crud_slug} ({model._meta.label}, {vendor})"))
+        if config.search_fields and config.search_backend == "icontains":
+            self.stdout.write(
+                "  búsqueda: icontains sobre "
+                f"{', '.join(config.search_fields)} (sin índice B-tree posible; "
+                "ver search_backend + crud_search_index)"
+            )
+
+        factory = RequestFactory()
+        needed: list[tuple[str, ...]] = []
+        for probe in self._probes(config):
+            request = factory.get("/", probe.query)
+            request.user = AnonymousUser()
+            try:
+                params = config.parse_params(request)
+                qs = config.queryset_for_list(request, params)
+                plan = qs[: config.page_size].explain()
+            except Exception as exc:  # ej: get_base_queryset que exige un request real
+                self.stdout.write(self.style.WARNING(f"  {probe.label}: no se pudo EXPLAIN ({exc})"))
+                continue
+
+            flags = _explain_flags(vendor, plan)
+            covered = not probe.columns or _covered(probe.columns, existing, pk)
+            status = ", ".join(flags) if flags else "ok"
+            line = f"  {probe.label}: {status}"
+            if probe.columns and not covered:
+                line += f" → índice sugerido {probe.columns}"
+                needed.append(probe.columns)
+            for note in probe.skipped:
+                line += f" [{note}]"
+            self.stdout.write(self.style.WARNING(line) if flags else line)
+            if verbose:
+                for plan_line in plan.splitlines():
+                    self.stdout.write(f"      {plan_line}")
+        return needed
+
+    def _advise_brin(self, config: CrudConfig) -> str | None:
+        """PostgreSQL: BRIN sobre date_field append-only (rango → pocos bloques, índice mínimo)."""
+
+        if not config.date_field:
+            return None
+        using = router.db_for_read(config.model)
+        if connections[using].vendor != "postgresql" or _has_brin(config.model, config.date_field):
+            return None
+        if not _append_only(config, using):
+            self.stdout.write(
+                f"  {config.date_field}: sin correlación física con el orden de inserción; BRIN no aplica"
+            )
+            return None
+        self.stdout.write(
+            f"  {config.date_field}: append-only → BRIN sugerido para rangos from/to "
+            "(complementa al B-tree compuesto; requiere django.contrib.postgres)"
+        )
+        return config.date_field
+
+    # --- migración ---
+    def _emit(self, app_label: str, items: list[tuple[type, models.Index]], *, dry_run: bool) -> None:
+        loader = MigrationLoader(None, ignore_no_migrations=True)
+        leaves = loader.graph.leaf_nodes(app_label)
+        number = 1
+        if leaves:
+            number = (MigrationAutodetector.parse_number(leaves[0][1]) or 0) + 1
+
+        migration = Migration(f"{number:04d}_crud_indexes", app_label)
+        migration.dependencies = list(leaves)
+        migration.operations = [
+            AddIndex(model_name=model._meta.model_name, index=index) for model, index in items
+        ]
+        writer = MigrationWriter(migration)
+
+        if dry_run:
+            self.stdout.write("")
+            self.stdout.write(self.style.MIGRATE_HEADING(f"# {writer.path}"))
+            self.stdout.write(writer.as_string())
+            return
+
+        if os.path.exists(writer.path):
+            raise CommandError(f"La migración ya existe: {writer.path}")
+        os.makedirs(os.path.dirname(writer.path), exist_ok=True)
+        with open(writer.path, "w", encoding="utf-8") as fh:
+            fh.write(writer.as_string())
+        self.stdout.write(self.style.SUCCESS(f"Migración escrita: {writer.path}"))
+        self.stdout.write("Recuerda declarar los mismos índices en Meta.indexes (ver arriba).")
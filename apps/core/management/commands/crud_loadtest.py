@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import asyncio
+import queue
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from itertools import cycle
+
+from asgiref.sync import ThreadSensitiveContext
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import AsyncClient, Client
+from django.urls import NoReverseMatch, reverse
+
+from apps.core.crud.registry import _CRUDS
+
+
+HTMX_HEADERS = {"HX-Request": "true"}
+# Combinaciones de filtros/orden/página: el mismo tráfico para WSGI y ASGI.
+DEFAULT_QUERIES = (
+    "",
+    "status=active",
+    "status=inactive&sort=name&dir=desc",
+    "sort=created_at&dir=desc&page=2",
+    "q=item",
+)
+
+
+@contextmanager
+def _db_latency(ms: float):
+    """Suma `ms` por query (simula una BD remota). Bloquea el thread, no el event loop."""
+
+    if ms <= 0:
+        yield
+        return
+
+    delay = ms / 1000
+
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(delay)
+        return execute(sql, params, many, context)
+
+    def on_created(sender, connection, **kwargs):
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
+
+    connection_created.connect(on_created, weak=False, dispatch_uid="crud_loadtest:latency")
+    for conn in connections.all(initialized_only=True):
+        on_created(None, conn)
+    try:
+        yield
+    finally:
+        connection_created.disconnect(dispatch_uid="crud_loadtest:latency")
+        for conn in connections.all(initialized_only=True):
+            if wrapper in conn.execute_wrappers:
+                conn.execute_wrappers.remove(wrapper)
+
+
+def _summary(label: str, latencies: list[float], elapsed: float, errors: int) -> str:
+    if not latencies:
+        return f"{label}: sin respuestas ({errors} errores)"
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"{label}: {len(latencies)} req en {elapsed:.2f}s → {len(latencies) / elapsed:.1f} req/s · "
+        f"p50 {statistics.median(ordered) * 1000:.1f} ms · p95 {p95 * 1000:.1f} ms · "
+        f"max {ordered[-1] * 1000:.1f} ms · errores {errors}"
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Carga concurrente de requests HTMX al partial de tabla: WSGI (pool de threads, "
+        "como gunicorn --threads) vs ASGI (un event loop con vistas async)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", default=None, help="URL a cargar (default: crud_example:table).")
+        parser.add_argument("--requests", type=int, default=200, help="Requests por modo (default: 200).")
+        parser.add_argument(
+            "--concurrency", type=int, default=50, help="Requests en vuelo a la vez (default: 50)."
+        )
+        parser.add_argument(
+            "--threads", type=int, default=8, help="Threads del worker WSGI simulado (default: 8)."
+        )
+        parser.add_argument(
+            "--db-latency-ms",
+            type=float,
+            default=20.0,
+            help="Latencia artificial por query, en ms (default: 20; 0 = BD local).",
+        )
+        parser.add_argument("--mode", choices=["both", "wsgi", "asgi"], default="both")
+        parser.add_argument("--username", default=None, help="Usuario (default: primer superusuario).")
+        parser.add_argument(
+            "--keep-fragment-cache",
+            action="store_true",
+            help="No desactivar la cache de fragmentos durante la prueba.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not path:
+            try:
+                path = reverse("crud_example:table")
+            except NoReverseMatch as exc:
+                raise CommandError("Indica --path (crud_example no está en las URLs).") from exc
+
+        user = self._user(options["username"])
+        total = max(int(options["requests"]), 1)
+        concurrency = max(int(options["concurrency"]), 1)
+        threads = max(int(options["threads"]), 1)
+        urls = [f"{path}?{q}" if q else path for q in DEFAULT_QUERIES]
+        targets = [url for url, _ in zip(cycle(urls), range(total))]
+
+        saved = {}
+        if not options["keep_fragment_cache"]:
+            # Cada request debe llegar a la BD: es lo que se compara.
+            saved = {slug: cfg.fragment_cache_timeout for slug, cfg in _CRUDS.items()}
+            for cfg in _CRUDS.values():
+                cfg.fragment_cache_timeout = 0
+
+        self.stdout.write(
+            f"{path} · {total} req · concurrencia {concurrency} · "
+            f"latencia BD {options['db_latency_ms']:.0f} ms/query"
+        )
+        try:
+            with _db_latency(options["db_latency_ms"]):
+                if options["mode"] in {"both", "wsgi"}:
+                    self.stdout.write(self._run_wsgi(user, targets, threads=threads))
+                if options["mode"] in {"both", "asgi"}:
+                    self.stdout.write(asyncio.run(self._run_asgi(user, targets, concurrency=concurrency)))
+        finally:
+            for slug, timeout in saved.items():
+                _CRUDS[slug].fragment_cache_timeout = timeout
+
+    def _user(self, username: str | None):
+        User = get_user_model()
+        qs = User.objects.filter(is_active=True)
+        user = qs.filter(username=username).first() if username else qs.filter(is_superuser=True).first()
+        if user is None:
+            raise CommandError("Usuario no encontrado (usa --username o crea un superusuario).")
+        return user
+
+    # --- WSGI: el worker atiende a lo sumo `threads` requests a la vez ---
+    def _run_wsgi(self, user, targets: list[str], *, threads: int) -> str:
+        # Un Client (sesión) por thread; el login va antes de medir.
+        idle: queue.SimpleQueue = queue.SimpleQueue()
+        for _ in range(threads):
+            client = Client()
+            client.force_login(user)
+            idle.put(client)
+
+        def one(url: str):
+            client = idle.get()
+            try:
+                start = time.perf_counter()
+                response = client.get(url, headers=HTMX_HEADERS)
+                return time.perf_counter() - start, response.status_code
+            finally:
+                idle.put(client)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            results = list(pool.map(one, targets))
+        elapsed = time.perf_counter() - start
+        for conn in connections.all(initialized_only=True):
+            conn.close()
+
+        latencies = [t for t, status in results if status == 200]
+        return _summary(f"WSGI ({threads} threads)", latencies, elapsed, len(results) - len(latencies))
+
+    # --- ASGI: un event loop; el tiempo de BD corre en threads sin bloquear el loop ---
+    async def _run_asgi(self, user, targets: list[str], *, concurrency: int) -> str:
+        client = AsyncClient()
+        await client.aforce_login(user)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(url: str):
+            # ASGIHandler abre un ThreadSensitiveContext por request (AsyncClient no):
+            # sin él, todo sync_to_async compartiría un único thread.
+            async with semaphore, ThreadSensitiveContext():
+                start = time.perf_counter()
+                response = await client.get(url, headers=HTMX_HEADERS)
+                return time.perf_counter() - start, response.status_code
+
+        start = time.perf_counter()
+        results = await asyncio.gather(*(one(url) for url in targets))
+        elapsed = time.perf_counter() - start
+
+        latencies = [t for t, status in results if status == 200]
+        return _summary(
+            f"ASGI (concurrencia {concurrency})", latencies, elapsed, len(results) - len(latencies)
+        )
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import time
+from itertools import cycle, islice
+from types import SimpleNamespace
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.urls import reverse
+
+from apps.core.crud.config import CrudConfig
+from apps.core.crud.registry import _CRUDS
+
+
+def _legacy_build_items(config: CrudConfig, objects, request, params) -> list[dict]:
+    """build_items previo al RowPlan (baseline): to_template_dict por celda, URLs por fila."""
+
+    data = {k: v for k, v in params.as_dict().items() if v not in {"", "all"}}
+    qs_with_page = urlencode(data)
+
+    rows: list[dict] = []
+    for obj in objects:
+        if config.row_url_names:
+            urls = {"detail": None, "edit": "#", "delete": "#"}
+            for key, name in config.row_url_names.items():
+                urls[key] = reverse(name, kwargs={config.row_url_kwarg: obj.pk})
+        else:
+            urls = config.row_urls(obj, request, params)
+        if qs_with_page:
+            for k in ("edit", "delete", "detail"):
+                if urls.get(k) and urls[k] not in {"#", None} and "?" not in str(urls[k]):
+                    urls[k] = f"{urls[k]}?{qs_with_page}"
+
+        raw_cells = []
+        for c in config.list_columns:
+            raw_cells.append(c.value(obj) if c.value else getattr(obj, c.key, ""))
+        rich_cells = []
+        for i, val in enumerate(raw_cells):
+            rich_cells.append({"value": val, "col": config.list_columns[i].to_template_dict()})
+
+        rows.append({"id": getattr(obj, "pk"), "cells": rich_cells, "urls": urls})
+    return rows
+
+
+def _per_row_us(fn, *, iterations: int, rows: int) -> float:
+    fn()  # warm-up (compila URLs, caches de templates/urls)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    return elapsed / (iterations * rows) * 1_000_000
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark de build_items: costo por fila antes (legacy) y después (RowPlan)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--slug", default=None, help="crud_slug a medir (default: todos).")
+        parser.add_argument("--rows", type=int, default=100, help="Filas por página (default: 100).")
+        parser.add_argument("--iterations", type=int, default=200, help="Repeticiones (default: 200).")
+
+    def handle(self, *args, **options):
+        slug = options.get("slug")
+        rows = max(int(options["rows"]), 1)
+        iterations = max(int(options["iterations"]), 1)
+
+        if slug and slug not in _CRUDS:
+            raise CommandError(f"CrudConfig no registrado: {slug}")
+        configs = [_CRUDS[slug]] if slug else list(_CRUDS.values())
+
+        request = RequestFactory().get("/", {"sort": "", "page": "1"})
+        request.user = AnonymousUser()
+
+        for config in configs:
+            if not config.list_columns:
+                continue
+            params = config.parse_params(request)
+            qs = config.queryset_for_list(request, params)
+
+            objects = list(qs[:rows])
+            if not objects:
+                self.stdout.write(self.style.WARNING(f"{config.crud_slug}: sin filas; se omite."))
+                continue
+            # Con pocas filas reales se repiten para llegar al tamaño de página.
+            objects = list(islice(cycle(objects), rows))
+            values = list(config.rows_queryset(qs)[:rows])
+            values = list(islice(cycle(values), rows))
+
+            page = SimpleNamespace(object_list=values)
+            legacy = _per_row_us(
+                lambda: _legacy_build_items(config, objects, request, params),
+                iterations=iterations,
+                rows=rows,
+            )
+            compiled = _per_row_us(
+                lambda: config.build_items(page, request, params),
+                iterations=iterations,
+                rows=rows,
+            )
+
+            self.stdout.write(
+                f"{config.crud_slug} ({len(config.list_columns)} columnas, {rows} filas, "
+                f"row_source={config.row_source}): "
+                f"legacy {legacy:.2f} µs/fila · compilado {compiled:.2f} µs/fila · "
+                f"x{legacy / compiled if compiled else 0:.1f}"
+            )
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.crud.search import _INDEXES
+
+
+class Command(BaseCommand):
+    help = "Crea (o reconstruye) los índices de búsqueda de los SearchIndex registrados."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--index", default=None, help="Nombre del índice (default: todos).")
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Elimina y vuelve a crear los índices (tabla FTS / índices GIN).",
+        )
+
+    def handle(self, *args, **options):
+        name = options.get("index")
+        rebuild = bool(options.get("rebuild"))
+
+        if name and name not in _INDEXES:
+            raise CommandError(f"SearchIndex no registrado: {name}")
+        indexes = [_INDEXES[name]] if name else list(_INDEXES.values())
+
+        for index in indexes:
+            backend = index.get_backend()
+            for line in backend.build(index, rebuild=rebuild):
+                self.stdout.write(f"[{backend.name}] {line}")
+
+        self.stdout.write(self.style.SUCCESS(f"Índices de búsqueda listos: {len(indexes)}"))
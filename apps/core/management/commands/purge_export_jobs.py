@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from apps.core.services.export_jobs import purge_expired_jobs, retention_seconds
+
+
+class Command(BaseCommand):
+    help = "Borra los exports en segundo plano (archivo + fila) vencidos según EXPORT_JOB_RETENTION."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Solo cuenta, no borra.")
+
+    def handle(self, *args, **options):
+        dry_run = bool(options.get("dry_run"))
+        if retention_seconds() <= 0:
+            self.stdout.write("EXPORT_JOB_RETENTION=0: los exports se conservan sin límite")
+            return
+
+        jobs, files = purge_expired_jobs(dry_run=dry_run)
+        verb = "Vencidos" if dry_run else "Borrados"
+        self.stdout.write(self.style.SUCCESS(f"{verb}: {jobs} exports ({files} archivos)"))
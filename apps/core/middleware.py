@@ -1,28 +1,89 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
 from django.shortcuts import redirect
 from django.urls import reverse
+from . import db_router
 from .models import GlobalConfig
 
 class SetupMiddleware:
-    """Redirige al wizard de setup si la configuración no está completa."""
-    
+    """Redirige al wizard de setup si la configuración no está completa.
+
+    Sync + async: bajo ASGI no obliga a las vistas async a correr en un thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
-    def __call__(self, request):
+    @staticmethod
+    def _is_exempt(request) -> bool:
         # Rutas exentas de redirección
-        if request.path.startswith("/setup/") or \
-           request.path.startswith("/static/") or \
-           request.path.startswith("/media/") or \
-           request.path.startswith("/admin/"):
-            return self.get_response(request)
+        return request.path.startswith(("/setup/", "/static/", "/media/", "/admin/"))
 
-        # Verificar estado del setup
+    @staticmethod
+    def _setup_pending() -> bool:
         try:
-            config = GlobalConfig.load()
-            if not config.setup_complete:
-                return redirect("setup_wizard")
+            return not GlobalConfig.load().setup_complete
         except Exception:
             # Si falla la DB (ej. migraciones pendientes), dejar pasar para no bloquear
-            pass
+            return False
 
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not self._is_exempt(request) and self._setup_pending():
+            return redirect("setup_wizard")
         return self.get_response(request)
+
+    async def __acall__(self, request):
+        if not self._is_exempt(request) and await sync_to_async(self._setup_pending)():
+            return redirect("setup_wizard")
+        return await self.get_response(request)
+
+
+class ReplicaPinMiddleware:
+    """Read-your-writes: tras una escritura exitosa fija al usuario al primario.
+
+    Cookie PIN_COOKIE por CRUD_REPLICA_PIN_SECONDS; mientras exista, read_alias()
+    ignora la réplica (ver apps.core.db_router). Sin réplica configurada no hace nada.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _pin(request, response):
+        seconds = db_router.pin_seconds()
+        if (
+            seconds
+            and db_router.replica_alias() is not None
+            and request.method not in db_router.SAFE_METHODS
+            and response.status_code < 400
+        ):
+            response.set_cookie(
+                db_router.PIN_COOKIE,
+                "1",
+                max_age=seconds,
+                httponly=True,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+                secure=settings.SESSION_COOKIE_SECURE,
+            )
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._pin(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._pin(request, await self.get_response(request))
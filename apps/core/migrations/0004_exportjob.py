@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:14
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_globalconfig_login_icon_globalconfig_setup_complete_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('source', models.CharField(max_length=100, verbose_name='Origen')),
+                ('format', models.CharField(max_length=10, verbose_name='Formato')),
+                ('params', models.JSONField(blank=True, default=dict, verbose_name='Parámetros')),
+                ('status', models.CharField(choices=[('pending', 'En cola'), ('running', 'Generando'), ('done', 'Listo'), ('failed', 'Falló')], default='pending', max_length=10, verbose_name='Estado')),
+                ('backend', models.CharField(blank=True, max_length=10, verbose_name='Backend')),
+                ('total_rows', models.PositiveIntegerField(blank=True, null=True, verbose_name='Filas estimadas')),
+                ('processed_rows', models.PositiveIntegerField(default=0, verbose_name='Filas procesadas')),
+                ('file', models.FileField(blank=True, upload_to='exports/%Y/%m/', verbose_name='Archivo')),
+                ('filename', models.CharField(blank=True, max_length=255, verbose_name='Nombre de descarga')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Terminado')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Export',
+                'verbose_name_plural': 'Exports',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', '-created_at'], name='core_export_user_id_5e38ea_idx')],
+            },
+        ),
+    ]
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import uuid
 
+from django.conf import settings
 from django.core.cache import cache
 from django.db import models
 from django.utils.translation import gettext_lazy as _
@@ -130,3 +131,53 @@ class GlobalConfig(SingletonModel):
 
     def __str__(self):
         return "Configuración del Sistema"
+
+
+class ExportJob(UUIDModel, TimeStampedModel):
+    """Export en segundo plano (apps.core.exports): estado, progreso y archivo generado."""
+
+    class Status(models.TextChoices):
+        PENDING = "pending", _("En cola")
+        RUNNING = "running", _("Generando")
+        DONE = "done", _("Listo")
+        FAILED = "failed", _("Falló")
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="export_jobs",
+    )
+    source = models.CharField(_("Origen"), max_length=100)
+    format = models.CharField(_("Formato"), max_length=10)
+    params = models.JSONField(_("Parámetros"), default=dict, blank=True)
+    status = models.CharField(_("Estado"), max_length=10, choices=Status.choices, default=Status.PENDING)
+    backend = models.CharField(_("Backend"), max_length=10, blank=True)
+    total_rows = models.PositiveIntegerField(_("Filas estimadas"), null=True, blank=True)
+    processed_rows = models.PositiveIntegerField(_("Filas procesadas"), default=0)
+    file = models.FileField(_("Archivo"), upload_to="exports/%Y/%m/", blank=True)
+    filename = models.CharField(_("Nombre de descarga"), max_length=255, blank=True)
+    error = models.TextField(_("Error"), blank=True)
+    finished_at = models.DateTimeField(_("Terminado"), null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Export"
+        verbose_name_plural = "Exports"
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["user", "-created_at"])]
+
+    def __str__(self):
+        return f"{self.source} ({self.format}) · {self.get_status_display()}"
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in {self.Status.DONE, self.Status.FAILED}
+
+    @property
+    def progress(self) -> int | None:
+        """Porcentaje 0-100 (None si no hay total estimado)."""
+
+        if self.status == self.Status.DONE:
+            return 100
+        if not self.total_rows:
+            return None
+        return min(99, int(self.processed_rows * 100 / self.total_rows))
@@ -0,0 +1,354 @@
+"""Exports en segundo plano: ExportJob + worker RQ o pool de threads.
+
+Las vistas de export siguen respondiendo en la request mientras el export sea chico.
+Si el conteo estimado supera settings.EXPORT_ASYNC_THRESHOLD filas, handoff_export()
+crea un ExportJob y redirige a su página de progreso (polling HTMX); el job
+(apps.core.jobs.run_export_job) reconstruye el queryset desde su origen registrado,
+escribe el archivo en el storage y deja un link de descarga.
+
+Backends (settings.EXPORT_JOBS_BACKEND):
+- "auto": RQ si django-rq está instalado, Redis responde y hay un worker escuchando
+  la cola; si no, threads del proceso web.
+- "rq": RQ siempre que Redis responda (los jobs esperan a un worker).
+- "thread": ThreadPoolExecutor en el proceso (EXPORT_JOBS_THREADS). Un reinicio
+  del proceso pierde los jobs en curso.
+
+Latido: el job actualiza updated_at al avanzar. Uno sin latido (proceso reiniciado,
+worker muerto o cortado por EXPORT_JOB_TIMEOUT) se marca FAILED (fail_stale_jobs) y
+deja de reutilizarse.
+
+Retención: `python manage.py purge_export_jobs` (cron, o apps.core.jobs.purge_export_jobs
+en un scheduler RQ) borra archivos y filas terminados hace más de EXPORT_JOB_RETENTION.
+
+Orígenes: register_export_source(nombre, builder) con builder(user, params) → ExportSpec
+(callable o dotted path).
+"crud" viene registrado (params: slug + querystring del listado).
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Callable
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.shortcuts import redirect
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.core.crud.counting import _planner_estimate
+from apps.core.db_router import reads_from
+from apps.core.models import ExportJob
+
+from .exporting import EXPORT_CONTENT_TYPES, pdf_max_rows
+
+logger = logging.getLogger(__name__)
+
+JOB_FUNC = "apps.core.jobs.run_export_job"
+# Querystring del listado que no cambia el contenido del export.
+_VOLATILE_PARAMS = {"page", "cursor"}
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    """Qué exportar: queryset + columnas + presentación."""
+
+    queryset: QuerySet
+    fields: list[str]
+    headers: list[str]
+    title: str = "Export"
+    filename_base: str = "export"
+    sheet_name: str = "Export"
+
+
+ExportSourceBuilder = Callable[[Any, dict], ExportSpec]
+
+_SOURCES: dict[str, ExportSourceBuilder | str] = {}
+
+
+def register_export_source(name: str, builder: ExportSourceBuilder | str) -> None:
+    """Registro explícito (AppConfig.ready). El worker RQ lo hereda del setup de Django.
+
+    builder puede ser un dotted path: se importa recién al correr el primer job.
+    """
+
+    if name in _SOURCES:
+        raise ValueError(f"Origen de export ya registrado: {name}")
+    _SOURCES[name] = builder
+
+
+def build_export_spec(source: str, user, params: dict) -> ExportSpec:
+    builder = _SOURCES.get(source)
+    if builder is None:
+        raise KeyError(f"Origen de export no registrado: {source}")
+    if isinstance(builder, str):
+        builder = _SOURCES[source] = import_string(builder)
+    return builder(user, params)
+
+
+# --- Origen CRUD ---
+
+
+def crud_export_params(
+    request: HttpRequest,
+    slug: str,
+    *,
+    title: str = "Export",
+    filename_base: str = "export",
+    sheet_name: str = "Export",
+) -> dict:
+    """Params del origen "crud": filtros del listado actual + presentación."""
+
+    query = {k: v for k, v in request.GET.items() if k not in _VOLATILE_PARAMS and v}
+    return {
+        "slug": slug,
+        "query": query,
+        "title": title,
+        "filename_base": filename_base,
+        "sheet_name": sheet_name,
+    }
+
+
+def _crud_spec(user, params: dict) -> ExportSpec:
+    from apps.core.crud.registry import get_crud
+
+    config = get_crud(params["slug"])
+    if not config.exports_declared():
+        raise ValueError(f"CrudConfig {config.crud_slug} sin export_fields")
+
+    # Mismo camino que la vista: request sintética con los filtros y el usuario del job.
+    # Si get_base_queryset depende de atributos de middleware (ej: org), registrar un origen propio.
+    request = RequestFactory().get("/", data=params.get("query") or {})
+    request.user = user
+    list_params = config.parse_params(request)
+    return ExportSpec(
+        queryset=config.queryset_for_list(request=request, params=list_params),
+        fields=config.get_export_fields(),
+        headers=config.get_export_headers(),
+        title=params.get("title") or "Export",
+        filename_base=params.get("filename_base") or "export",
+        sheet_name=params.get("sheet_name") or "Export",
+    )
+
+
+register_export_source("crud", _crud_spec)
+
+
+# --- Handoff ---
+
+
+def async_threshold() -> int:
+    return int(getattr(settings, "EXPORT_ASYNC_THRESHOLD", 5000) or 0)
+
+
+def should_export_async(queryset: QuerySet, fmt: str = "") -> bool:
+    """¿Supera el export el umbral de filas para ir a segundo plano?
+
+    Sin filtros: estimado del planner (gratis). Con filtros: sonda acotada
+    (qs[umbral:umbral+1].exists()), que como mucho recorre `umbral` filas.
+    """
+
+    threshold = async_threshold()
+    if threshold <= 0:
+        return False
+    if fmt == "pdf" and 0 < pdf_max_rows() <= threshold:
+        return False  # El tope de filas ya acota el PDF por debajo del umbral.
+
+    query = queryset.query
+    if not (query.has_filters() or query.distinct or query.is_sliced):
+        estimate = _planner_estimate(queryset)
+        if estimate is not None:
+            return estimate > threshold
+    return queryset.order_by()[threshold : threshold + 1].exists()
+
+
+def stale_seconds() -> int:
+    return int(getattr(settings, "EXPORT_JOB_STALE_SECONDS", 600) or 0)
+
+
+def fail_stale_jobs(queryset: QuerySet | None = None) -> int:
+    """Marca FAILED los jobs sin latido. Devuelve cuántos.
+
+    RUNNING: sin avance en EXPORT_JOB_STALE_SECONDS. PENDING: además puede esperar en
+    la cola detrás de otros jobs, así que se le suma EXPORT_JOB_TIMEOUT.
+    """
+
+    seconds = stale_seconds()
+    if seconds <= 0:
+        return 0
+    if queryset is None:
+        queryset = ExportJob.objects.all()
+    now = timezone.now()
+    running_cutoff = now - timedelta(seconds=seconds)
+    pending_cutoff = running_cutoff - timedelta(seconds=int(getattr(settings, "EXPORT_JOB_TIMEOUT", 1800)))
+    return queryset.filter(
+        Q(status=ExportJob.Status.RUNNING, updated_at__lt=running_cutoff)
+        | Q(status=ExportJob.Status.PENDING, updated_at__lt=pending_cutoff)
+    ).update(
+        status=ExportJob.Status.FAILED,
+        error="El export se interrumpió (sin avance). Vuelve a pedirlo.",
+        finished_at=now,
+        updated_at=now,
+    )
+
+
+def retention_seconds() -> int:
+    return int(getattr(settings, "EXPORT_JOB_RETENTION", 7 * 24 * 3600) or 0)
+
+
+def purge_expired_jobs(*, dry_run: bool = False) -> tuple[int, int]:
+    """Borra jobs terminados hace más de EXPORT_JOB_RETENTION y sus archivos.
+
+    Antes marca FAILED los jobs sin latido, así los perdidos también vencen.
+    Devuelve (jobs, archivos). dry_run solo cuenta.
+    """
+
+    seconds = retention_seconds()
+    if seconds <= 0:
+        return 0, 0
+    if not dry_run:
+        fail_stale_jobs()
+    expired = ExportJob.objects.filter(
+        status__in=[ExportJob.Status.DONE, ExportJob.Status.FAILED],
+        finished_at__lt=timezone.now() - timedelta(seconds=seconds),
+    )
+    jobs = files = 0
+    for job in expired.only("pk", "file").iterator():
+        jobs += 1
+        if not job.file:
+            continue
+        files += 1
+        if dry_run:
+            continue
+        try:
+            job.file.delete(save=False)
+        except OSError:
+            logger.warning("No se pudo borrar %s (export %s)", job.file.name, job.pk, exc_info=True)
+            continue
+        job.delete()
+    if not dry_run:
+        # Sin archivo (fallidos) o ya borrado arriba: el resto en una query.
+        expired.filter(file="").delete()
+    return jobs, files
+
+
+def start_export_job(*, user, source: str, fmt: str, params: dict) -> ExportJob:
+    """Crea (o reutiliza) el ExportJob y lo encola al confirmar la transacción.
+
+    Un job idéntico del mismo usuario todavía en curso (y con latido) se reutiliza:
+    recargar el link de export no dispara otro.
+    """
+
+    if fmt not in EXPORT_CONTENT_TYPES:
+        raise ValueError(f"Formato de export no soportado: {fmt}")
+
+    # Del primario aunque la vista de export lea de la réplica (el job puede ser de hace un instante).
+    with reads_from(None):
+        fail_stale_jobs(ExportJob.objects.filter(user=user, source=source, format=fmt))
+        active = ExportJob.objects.filter(
+            user=user,
+            source=source,
+            format=fmt,
+            params=params,
+            status__in=[ExportJob.Status.PENDING, ExportJob.Status.RUNNING],
+        ).first()
+    if active is not None:
+        return active
+
+    job = ExportJob.objects.create(user=user, source=source, format=fmt, params=params)
+    transaction.on_commit(lambda: enqueue(job))
+    return job
+
+
+def export_job_url(job: ExportJob) -> str:
+    return reverse("core:export_job", args=[job.pk])
+
+
+def handoff_export(request: HttpRequest, *, source: str, fmt: str, params: dict) -> HttpResponse:
+    """Crea el job y manda al usuario a su página de progreso (HX-Redirect si es HTMX)."""
+
+    job = start_export_job(user=request.user, source=source, fmt=fmt, params=params)
+    url = export_job_url(job)
+    if request.headers.get("HX-Request") == "true":
+        response = HttpResponse(status=204)
+        response["HX-Redirect"] = url
+        return response
+    return redirect(url)
+
+
+# --- Backends ---
+
+
+def _rq_queue(*, require_worker: bool):
+    """Cola RQ lista para usar, o None (sin django-rq, sin Redis o sin worker)."""
+
+    try:
+        django_rq = importlib.import_module("django_rq")
+        rq = importlib.import_module("rq")
+    except ImportError:
+        return None
+
+    queue_name = getattr(settings, "EXPORT_JOBS_QUEUE", "default")
+    try:
+        queue = django_rq.get_queue(queue_name)
+        queue.connection.ping()
+        if require_worker and not rq.Worker.count(queue=queue):
+            return None
+    except Exception:
+        logger.warning("Redis no disponible para exports; se usa el pool de threads", exc_info=True)
+        return None
+    return queue
+
+
+def _backend_queue():
+    backend = getattr(settings, "EXPORT_JOBS_BACKEND", "auto")
+    if backend == "thread":
+        return None
+    return _rq_queue(require_worker=backend != "rq")
+
+
+_lock = threading.Lock()
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            workers = max(1, int(getattr(settings, "EXPORT_JOBS_THREADS", 2) or 1))
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export-job")
+        return _executor
+
+
+def _run_in_thread(job_id: str) -> None:
+    from apps.core.jobs import run_export_job
+
+    try:
+        run_export_job(job_id)
+    finally:
+        connections.close_all()
+
+
+def enqueue(job: ExportJob) -> None:
+    queue = _backend_queue()
+    if queue is not None:
+        queue.enqueue(
+            JOB_FUNC,
+            str(job.pk),
+            job_timeout=int(getattr(settings, "EXPORT_JOB_TIMEOUT", 1800)),
+        )
+        backend = "rq"
+    else:
+        # Sin contexto heredado: igual que en el worker RQ, el job lee del primario.
+        _get_executor().submit(_run_in_thread, str(job.pk))
+        backend = "thread"
+    ExportJob.objects.filter(pk=job.pk).update(backend=backend)
@@ -1,13 +1,47 @@
 from __future__ import annotations
 
+import contextlib
 import csv
+import hashlib
 import importlib
+import os
+import re
+import tempfile
+import time
 from io import BytesIO
-from typing import Iterable
+from pathlib import Path
+from tempfile import SpooledTemporaryFile
+from itertools import islice
+from typing import IO, Any, Callable, Iterable, Iterator
 from datetime import datetime
 
-from django.http import FileResponse, StreamingHttpResponse
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+from django.http import (
+    FileResponse,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.http.response import HttpResponseBase
 from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+
+from apps.core.crud.cache import data_versions, has_version_signals
+from apps.core.db_router import reads_from
+
+from .pdf_chunked import PdfLayout, write_pdf
+from .xlsx_stream import XlsxStreamWriter
+
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+# Filas por tanda del export en streaming (también el tamaño de chunk del iterator).
+EXPORT_CHUNK_ROWS = 2000
+# A4 apaisado en puntos (el mismo landscape(A4) de build_pdf_table, sin importar reportlab).
+PDF_PAGE_SIZE = (841.8897637795277, 595.2755905511812)
 
 
 class _Echo:
@@ -58,6 +92,96 @@ def stream_csv(
     return resp
 
 
+def astream_csv(
+    *,
+    queryset,
+    fields: list[str],
+    headers: list[str],
+    filename_base: str = "export",
+) -> StreamingHttpResponse:
+    """stream_csv para vistas async: iterador async (aiterator) servido por ASGI."""
+
+    if len(fields) != len(headers):
+        raise ValueError("fields y headers deben tener el mismo tamaño")
+
+    pseudo_buffer = _Echo()
+    writer = csv.writer(pseudo_buffer)
+
+    async def row_iter():
+        yield b"\xef\xbb\xbf"
+        yield writer.writerow(headers).encode("utf-8")
+        # values_list().aiterator() ejecuta el SQL al crear el iterable (dentro del loop):
+        # mismo esquema que aiterator, con el iterator sync avanzado en un thread.
+        rows = queryset.values_list(*fields).iterator(chunk_size=2000)
+        next_chunk = sync_to_async(lambda: list(islice(rows, 2000)))
+        while chunk := await next_chunk():
+            for row in chunk:
+                yield writer.writerow(["" if v is None else v for v in row]).encode("utf-8")
+
+    resp = StreamingHttpResponse(row_iter(), content_type="text/csv; charset=utf-8")
+    resp["Content-Disposition"] = f'attachment; filename="{_default_filename(filename_base, "csv")}"'
+    return resp
+
+
+def _xlsx_response(content, filename_base: str) -> StreamingHttpResponse:
+    resp = StreamingHttpResponse(content, content_type=XLSX_CONTENT_TYPE)
+    resp["Content-Disposition"] = f'attachment; filename="{_default_filename(filename_base, "xlsx")}"'
+    return resp
+
+
+def stream_xlsx(
+    *,
+    queryset,
+    fields: list[str],
+    headers: list[str],
+    filename_base: str = "export",
+    sheet_name: str = "Export",
+) -> StreamingHttpResponse:
+    """XLSX en streaming: filas → XML de la hoja → zip → respuesta, por tandas.
+
+    Memoria acotada por EXPORT_CHUNK_ROWS filas, sin importar el total (ver XlsxStreamWriter).
+    Sin dependencias: no usa openpyxl.
+    """
+
+    if len(fields) != len(headers):
+        raise ValueError("fields y headers deben tener el mismo tamaño")
+
+    def chunks() -> Iterable[bytes]:
+        writer = XlsxStreamWriter(headers=headers, sheet_name=sheet_name)
+        yield writer.start()
+        rows = queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_ROWS)
+        while chunk := list(islice(rows, EXPORT_CHUNK_ROWS)):
+            yield writer.rows(chunk)
+        yield writer.finish()
+
+    return _xlsx_response(chunks(), filename_base)
+
+
+def astream_xlsx(
+    *,
+    queryset,
+    fields: list[str],
+    headers: list[str],
+    filename_base: str = "export",
+    sheet_name: str = "Export",
+) -> StreamingHttpResponse:
+    """stream_xlsx para vistas async: mismo esquema que astream_csv (tandas en un thread)."""
+
+    if len(fields) != len(headers):
+        raise ValueError("fields y headers deben tener el mismo tamaño")
+
+    async def chunks():
+        writer = XlsxStreamWriter(headers=headers, sheet_name=sheet_name)
+        yield writer.start()
+        rows = queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_ROWS)
+        next_chunk = sync_to_async(lambda: list(islice(rows, EXPORT_CHUNK_ROWS)))
+        while chunk := await next_chunk():
+            yield writer.rows(chunk)
+        yield writer.finish()
+
+    return _xlsx_response(chunks(), filename_base)
+
+
 def build_xlsx(
     *,
     queryset,
@@ -66,7 +190,11 @@ def build_xlsx(
     filename_base: str = "export",
     sheet_name: str = "Export",
 ) -> FileResponse:
-    """Generate XLSX (Excel). Uses write_only mode to reduce memory, but returns a bytes response."""
+    """Generate XLSX (Excel). Uses write_only mode to reduce memory, but returns a bytes response.
+
+    El workbook completo queda en memoria antes del primer byte: para exports grandes usar
+    stream_xlsx/astream_xlsx.
+    """
 
     if len(fields) != len(headers):
         raise ValueError("fields y headers deben tener el mismo tamaño")
@@ -95,7 +223,7 @@ def build_xlsx(
         bio,
         as_attachment=True,
         filename=filename,
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        content_type=XLSX_CONTENT_TYPE,
     )
 
 
@@ -106,12 +234,49 @@ def build_pdf_table(
     headers: list[str],
     title: str = "Export",
     filename_base: str = "export",
+    chunked: bool | None = None,
+    max_rows: int | None = None,
+    workers: int | None = None,
 ) -> FileResponse:
-    """Generate a simple professional PDF table (landscape) with header title + date."""
+    """Generate a simple professional PDF table (landscape) with header title + date.
+
+    chunked (default settings.EXPORT_PDF_CHUNKED, desactivado): página a página, ver
+    build_pdf_table_chunked. Opt-in: corta en max_rows (con aviso en la primera página).
+    """
 
     if len(fields) != len(headers):
         raise ValueError("fields y headers deben tener el mismo tamaño")
 
+    if chunked is None:
+        chunked = pdf_chunked()
+    if chunked:
+        return build_pdf_table_chunked(
+            queryset=queryset,
+            fields=fields,
+            headers=headers,
+            title=title,
+            filename_base=filename_base,
+            max_rows=max_rows,
+            workers=workers,
+        )
+
+    rows = (
+        ["" if v is None else str(v) for v in row]
+        for row in queryset.values_list(*fields).iterator(chunk_size=2000)
+    )
+    buffer = BytesIO()
+    _write_pdf_table(buffer, rows, headers=headers, title=title)
+    buffer.seek(0)
+    return FileResponse(
+        buffer,
+        as_attachment=True,
+        filename=_default_filename(filename_base, "pdf"),
+        content_type="application/pdf",
+    )
+
+
+def _write_pdf_table(out: IO[bytes], rows: Iterable[list[str]], *, headers: list[str], title: str) -> None:
+    # Modo clásico (LongTable de platypus): todas las filas en memoria y layout del documento entero.
     try:
         colors = importlib.import_module("reportlab.lib.colors")
         pagesizes = importlib.import_module("reportlab.lib.pagesizes")
@@ -133,13 +298,10 @@ def build_pdf_table(
     subtitle = now.strftime("%Y-%m-%d %H:%M")
 
     # Construimos data (header + rows). Para PDFs muy grandes, esto puede crecer.
-    data: list[list[str]] = [headers]
-    for row in queryset.values_list(*fields).iterator(chunk_size=2000):
-        data.append(["" if v is None else str(v) for v in row])
+    data: list[list[str]] = [headers, *rows]
 
-    buffer = BytesIO()
     doc = SimpleDocTemplate(
-        buffer,
+        out,
         pagesize=landscape(A4),
         leftMargin=24,
         rightMargin=24,
@@ -176,10 +338,448 @@ def build_pdf_table(
     story.append(table)
     doc.build(story)
 
-    buffer.seek(0)
+
+def pdf_chunked() -> bool:
+    """¿PDF por páginas por defecto? (settings.EXPORT_PDF_CHUNKED, opt-in)."""
+
+    return bool(getattr(settings, "EXPORT_PDF_CHUNKED", False))
+
+
+def pdf_max_rows() -> int:
+    """Tope de filas del PDF por páginas (settings.EXPORT_PDF_MAX_ROWS; 0 = sin límite).
+
+    Solo aplica al modo por páginas: el PDF clásico no corta filas.
+    """
+
+    if not pdf_chunked():
+        return 0
+    return int(getattr(settings, "EXPORT_PDF_MAX_ROWS", 0) or 0)
+
+
+def _pdf_rows(queryset, fields, headers, *, title: str, max_rows: int | None) -> tuple[PdfLayout, Iterator]:
+    if max_rows is None:
+        max_rows = int(getattr(settings, "EXPORT_PDF_MAX_ROWS", 0) or 0)
+
+    now = timezone.localtime(timezone.now())
+    subtitle = now.strftime("%Y-%m-%d %H:%M")
+    notice = ""
+    rows_qs = queryset.values_list(*fields)
+    if max_rows:
+        if queryset[max_rows : max_rows + 1].exists():
+            # Aviso visible en la primera página: el PDF no trae el listado completo.
+            notice = (
+                f"Atención: PDF limitado a las primeras {max_rows} filas. "
+                "Exporta en CSV o Excel para el listado completo."
+            )
+        rows_qs = rows_qs[:max_rows]
+
+    layout = PdfLayout(
+        headers=tuple(str(h) for h in headers),
+        title=title,
+        subtitle=subtitle,
+        width=PDF_PAGE_SIZE[0],
+        height=PDF_PAGE_SIZE[1],
+        notice=notice,
+    )
+    rows = (
+        ["" if v is None else str(v) for v in row]
+        for row in rows_qs.iterator(chunk_size=EXPORT_CHUNK_ROWS)
+    )
+    return layout, rows
+
+
+def build_pdf_table_chunked(
+    *,
+    queryset,
+    fields: list[str],
+    headers: list[str],
+    title: str = "Export",
+    filename_base: str = "export",
+    max_rows: int | None = None,
+    workers: int | None = None,
+) -> FileResponse:
+    """PDF de tabla por bloques del tamaño de una página (ver apps.core.services.pdf_chunked).
+
+    Cada página se arma por separado (columnas de ancho fijo, celdas con ajuste de línea
+    y alto de fila calculado): el costo de layout es lineal. No acota la memoria: ReportLab
+    guarda cada página comprimida hasta el final (ver write_pdf). Con workers > 0 las
+    tandas de páginas se renderizan en procesos y se unen (pypdf). max_rows corta el
+    export con un aviso en la primera página (settings.EXPORT_PDF_MAX_ROWS; 0 = sin
+    límite). La salida va a un archivo temporal (en memoria hasta EXPORT_SPOOL_MAX_BYTES)
+    servido por FileResponse.
+    """
+
+    if len(fields) != len(headers):
+        raise ValueError("fields y headers deben tener el mismo tamaño")
+
+    layout, rows = _pdf_rows(queryset, fields, headers, title=title, max_rows=max_rows)
+    if workers is None:
+        workers = int(getattr(settings, "EXPORT_PDF_WORKERS", 0) or 0)
+
+    out = SpooledTemporaryFile(max_size=int(getattr(settings, "EXPORT_SPOOL_MAX_BYTES", 8 * 1024 * 1024)))
+    try:
+        write_pdf(layout, rows, out, title=title, workers=workers)
+    except BaseException:
+        out.close()
+        raise
+    out.seek(0)
     return FileResponse(
-        buffer,
+        out,
         as_attachment=True,
         filename=_default_filename(filename_base, "pdf"),
         content_type="application/pdf",
     )
+
+
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": XLSX_CONTENT_TYPE,
+    "pdf": "application/pdf",
+}
+
+
+def export_filename(base: str, fmt: str) -> str:
+    """Nombre de descarga con timestamp (mismo formato que las respuestas directas)."""
+
+    return _default_filename(base, fmt)
+
+
+class _Counter:
+    """Iterable de filas que cuenta lo consumido por el writer y avisa cada EXPORT_CHUNK_ROWS."""
+
+    def __init__(self, rows: Iterable, on_progress: Callable[[int], None] | None) -> None:
+        self._rows = rows
+        self._on_progress = on_progress
+        self.count = 0
+
+    def __iter__(self) -> Iterator:
+        for row in self._rows:
+            yield row
+            self.count += 1
+            if self._on_progress is not None and self.count % EXPORT_CHUNK_ROWS == 0:
+                self._on_progress(self.count)
+
+
+def write_export(
+    fmt: str,
+    *,
+    queryset,
+    fields: list[str],
+    headers: list[str],
+    out: IO[bytes],
+    title: str = "Export",
+    sheet_name: str = "Export",
+    on_progress: Callable[[int], None] | None = None,
+) -> int:
+    """Escribe el export completo en `out` (archivo binario) y devuelve las filas escritas.
+
+    Mismo contenido que las respuestas directas (stream_csv/stream_xlsx/build_pdf_table
+    según EXPORT_PDF_CHUNKED), pensado para jobs en segundo plano (apps.core.services.export_jobs).
+    """
+
+    if len(fields) != len(headers):
+        raise ValueError("fields y headers deben tener el mismo tamaño")
+
+    if fmt == "pdf":
+        if not pdf_chunked():
+            counted = _Counter(
+                (
+                    ["" if v is None else str(v) for v in row]
+                    for row in queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_ROWS)
+                ),
+                on_progress,
+            )
+            _write_pdf_table(out, counted, headers=headers, title=title)
+            return counted.count
+        layout, pdf_rows = _pdf_rows(queryset, fields, headers, title=title, max_rows=None)
+        counted = _Counter(pdf_rows, on_progress)
+        workers = int(getattr(settings, "EXPORT_PDF_WORKERS", 0) or 0)
+        write_pdf(layout, iter(counted), out, title=title, workers=workers)
+        return counted.count
+
+    rows = _Counter(queryset.values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_ROWS), on_progress)
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        out.write(b"\xef\xbb\xbf")
+        out.write(writer.writerow(headers).encode("utf-8"))
+        for row in rows:
+            out.write(writer.writerow(["" if v is None else v for v in row]).encode("utf-8"))
+    elif fmt == "xlsx":
+        writer = XlsxStreamWriter(headers=headers, sheet_name=sheet_name)
+        out.write(writer.start())
+        it = iter(rows)
+        while chunk := list(islice(it, EXPORT_CHUNK_ROWS)):
+            out.write(writer.rows(chunk))
+        out.write(writer.finish())
+    else:
+        raise ValueError(f"Formato de export no soportado: {fmt}")
+    return rows.count
+
+
+# --- Cache de archivos de export ---
+# Un archivo por clave en settings.EXPORT_CACHE_DIR. LRU por tamaño: cada hit renueva el
+# mtime y al guardar se borran los más viejos hasta EXPORT_CACHE_MAX_BYTES.
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+# Temporales de escrituras interrumpidas (crash a mitad de export): se limpian al desalojar.
+_TEMP_PREFIX = ".tmp-"
+_TEMP_MAX_AGE = 3600
+
+
+def export_cache_dir() -> Path | None:
+    """Directorio del cache, o None si está desactivado (EXPORT_CACHE_MAX_BYTES = 0)."""
+
+    if _cache_max_bytes() <= 0:
+        return None
+    directory = getattr(settings, "EXPORT_CACHE_DIR", None)
+    return Path(directory) if directory else Path(tempfile.gettempdir()) / "export_cache"
+
+
+def _cache_max_bytes() -> int:
+    return int(getattr(settings, "EXPORT_CACHE_MAX_BYTES", 0) or 0)
+
+
+def _query_models(queryset, sql: str) -> list[type]:
+    # Toda tabla nombrada en el SQL (joins y subqueries: búsqueda, filtros por relación).
+    quote = connections[queryset.db].ops.quote_name
+    return [m for m in apps.get_models() if quote(m._meta.db_table) in sql]
+
+
+def export_cache_key(
+    fmt: str,
+    *,
+    queryset,
+    fields: list[str],
+    headers: list[str],
+    title: str = "Export",
+    sheet_name: str = "Export",
+) -> str | None:
+    """Clave del archivo cacheado, o None si el export no se puede cachear.
+
+    Huella: SQL + params de values_list(*fields), headers, formato, opciones que cambian
+    el archivo y versión de datos de cada tabla de la query (apps.core.crud.cache). Solo
+    si todas esas tablas tienen signals de versión (CrudConfig.export_cache): sin ellos
+    un cambio no invalidaría el archivo. No ejecuta queries.
+    """
+
+    if export_cache_dir() is None or fmt not in EXPORT_CONTENT_TYPES:
+        return None
+    try:
+        sql, params = queryset.values_list(*fields).query.sql_with_params()
+    except Exception:
+        # EmptyResultSet y similares: sin clave (mismo criterio que cached_count).
+        return None
+
+    models = _query_models(queryset, sql)
+    if not models or not all(has_version_signals(m) for m in models):
+        return None
+    options = {"pdf": (title, pdf_chunked(), pdf_max_rows()), "xlsx": (sheet_name,)}.get(fmt, ())
+    versions = data_versions(models)
+    raw = "|".join(
+        [
+            fmt,
+            sql,
+            repr(params),
+            repr([str(h) for h in headers]),
+            repr(options),
+            *(f"{m._meta.label_lower}={v}" for m, v in zip(models, versions)),
+        ]
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_path(key: str, fmt: str) -> Path:
+    return export_cache_dir() / f"{key}.{fmt}"
+
+
+def open_cached_export(key: str, fmt: str) -> IO[bytes] | None:
+    """Archivo cacheado abierto (y renovado en el LRU), o None si no está."""
+
+    path = _cache_path(key, fmt)
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass  # Desalojado entre open y utime: el handle abierto sigue sirviendo.
+    return f
+
+
+def store_export(key: str, fmt: str, write: Callable[[IO[bytes]], Any]) -> tuple[IO[bytes], Any]:
+    """Genera el archivo con write(out) y lo publica en el cache de forma atómica.
+
+    Devuelve (archivo abierto para leer, resultado de write). Dos misses concurrentes de
+    la misma clave generan dos veces; el último os.replace gana (mismo contenido).
+    write corre contra el primario aunque la vista lea de la réplica: el archivo queda
+    bajo la versión de datos de la clave y sin TTL, una réplica atrasada lo dejaría viejo.
+    """
+
+    directory = export_cache_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.NamedTemporaryFile(dir=directory, prefix=_TEMP_PREFIX, suffix=f".{fmt}", delete=False)
+    try:
+        with tmp, reads_from(None):
+            result = write(tmp)
+        path = _cache_path(key, fmt)
+        os.replace(tmp.name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp.name)
+        raise
+    f = open(path, "rb")
+    _evict(directory, _cache_max_bytes())
+    return f, result
+
+
+def _evict(directory: Path, max_bytes: int) -> None:
+    now = time.time()
+    entries: list[tuple[float, int, str]] = []
+    for entry in os.scandir(directory):
+        if not entry.is_file():
+            continue
+        try:
+            st = entry.stat()
+        except FileNotFoundError:
+            continue
+        if entry.name.startswith(_TEMP_PREFIX):
+            if now - st.st_mtime > _TEMP_MAX_AGE:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(entry.path)
+            continue
+        entries.append((st.st_mtime, st.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(path)
+        total -= size
+
+
+class _FileRange:
+    """Tramo [start, start + length) de un archivo para FileResponse (Content-Length manual)."""
+
+    def __init__(self, f: IO[bytes], start: int, length: int) -> None:
+        f.seek(start)
+        self._f = f
+        self._left = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self._left <= 0:
+            return b""
+        size = self._left if size is None or size < 0 else min(size, self._left)
+        data = self._f.read(size)
+        self._left -= len(data)
+        return data
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def ranged_file_response(
+    request: HttpRequest,
+    f: IO[bytes],
+    *,
+    size: int,
+    content_type: str,
+    filename: str,
+    etag: str | None = None,
+) -> HttpResponseBase:
+    """FileResponse de descarga con Range de un tramo (bytes=a-b, a-, -n) e If-Range por ETag.
+
+    Varios tramos, un Range mal formado o un If-Range que no coincide → 200 con el archivo
+    completo (RFC 9110 permite ignorar Range). Tramo fuera del archivo → 416.
+    """
+
+    if etag and etag in parse_etags(request.headers.get("If-None-Match", "")):
+        f.close()
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    start, end, status = 0, size - 1, 200
+    range_header = (request.headers.get("Range") or "").strip()
+    if_range = request.headers.get("If-Range")
+    if range_header and (if_range is None or (etag is not None and if_range == etag)):
+        match = _RANGE_RE.match(range_header)
+        if match and (match[1] or match[2]):
+            if match[1]:
+                start = int(match[1])
+                end = min(int(match[2]), size - 1) if match[2] else size - 1
+            else:
+                start = max(0, size - int(match[2]))
+            if start >= size or start > end or (not match[1] and int(match[2]) == 0):
+                f.close()
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{size}"
+                return response
+            status = 206
+
+    body = f if status == 200 else _FileRange(f, start, end - start + 1)
+    response = FileResponse(body, as_attachment=True, filename=filename, content_type=content_type, status=status)
+    response["Content-Length"] = str(max(0, end - start + 1))
+    response["Accept-Ranges"] = "bytes"
+    if status == 206:
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    if etag:
+        response["ETag"] = etag
+    patch_cache_control(response, private=True)
+    return response
+
+
+def cached_export_response(
+    request: HttpRequest, key: str, *, fmt: str, filename_base: str = "export"
+) -> HttpResponseBase | None:
+    """Hit: el archivo desde el disco, sin DB (ETag = clave). Miss: None."""
+
+    f = open_cached_export(key, fmt)
+    if f is None:
+        return None
+    return ranged_file_response(
+        request,
+        f,
+        size=os.fstat(f.fileno()).st_size,
+        content_type=EXPORT_CONTENT_TYPES[fmt],
+        filename=export_filename(filename_base, fmt),
+        etag=f'"{key}"',
+    )
+
+
+def build_cached_export(
+    request: HttpRequest,
+    key: str,
+    *,
+    fmt: str,
+    queryset,
+    fields: list[str],
+    headers: list[str],
+    filename_base: str = "export",
+    title: str = "Export",
+    sheet_name: str = "Export",
+) -> HttpResponseBase:
+    """Miss: genera el archivo en el cache (write_export) y lo sirve igual que un hit."""
+
+    f, _ = store_export(
+        key,
+        fmt,
+        lambda out: write_export(
+            fmt,
+            queryset=queryset,
+            fields=fields,
+            headers=headers,
+            out=out,
+            title=title,
+            sheet_name=sheet_name,
+        ),
+    )
+    return ranged_file_response(
+        request,
+        f,
+        size=os.fstat(f.fileno()).st_size,
+        content_type=EXPORT_CONTENT_TYPES[fmt],
+        filename=export_filename(filename_base, fmt),
+        etag=f'"{key}"',
+    )
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import importlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from itertools import islice
+from typing import IO, Iterable, Iterator
+
+# Geometría fija: cada página es un bloque independiente (mismo aspecto que build_pdf_table).
+MARGIN = 24
+FONT_SIZE = 9
+LEADING = FONT_SIZE * 1.2
+ROW_HEIGHT = 16  # alto mínimo de fila (una línea)
+TITLE_BLOCK = 52  # título + fecha + espacio sobre la tabla en la primera página
+NOTICE_BLOCK = 16  # aviso bajo la fecha (ej: tope de filas)
+FOOTER_BLOCK = 14
+CELL_PADDING = 6
+CELL_VPADDING = 2
+# Páginas por tarea del pool: menos = más paralelismo, más = menos overhead de merge.
+PAGES_PER_TASK = 20
+
+_STYLE = [
+    ("BACKGROUND", (0, 0), (-1, 0), "#F2F4F7"),
+    ("TEXTCOLOR", (0, 0), (-1, 0), "#111827"),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), FONT_SIZE),
+    ("LEADING", (0, 0), (-1, -1), LEADING),
+    ("GRID", (0, 0), (-1, -1), 0.25, "#D0D5DD"),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("LEFTPADDING", (0, 0), (-1, -1), CELL_PADDING),
+    ("RIGHTPADDING", (0, 0), (-1, -1), CELL_PADDING),
+    ("TOPPADDING", (0, 0), (-1, -1), CELL_VPADDING),
+    ("BOTTOMPADDING", (0, 0), (-1, -1), CELL_VPADDING),
+]
+
+# Fila ya ajustada: (alto, celdas con saltos de línea). Picklable: viaja a los workers.
+WrappedRow = tuple[float, list[str]]
+
+
+@dataclass(frozen=True)
+class PdfLayout:
+    """Geometría compartida por todas las páginas (picklable: viaja a los workers)."""
+
+    headers: tuple[str, ...]
+    title: str
+    subtitle: str
+    width: float
+    height: float
+    notice: str = ""
+
+    @property
+    def col_width(self) -> float:
+        return (self.width - 2 * MARGIN) / len(self.headers)
+
+    @property
+    def text_width(self) -> float:
+        return self.col_width - 2 * CELL_PADDING
+
+    def title_block(self) -> float:
+        return TITLE_BLOCK + (NOTICE_BLOCK if self.notice else 0)
+
+    def table_height(self, page_no: int) -> float:
+        """Alto disponible para la tabla (headers incluidos) en la página page_no."""
+
+        usable = self.height - 2 * MARGIN - FOOTER_BLOCK
+        return usable - (self.title_block() if page_no == 1 else 0)
+
+
+def _reportlab():
+    try:
+        return (
+            importlib.import_module("reportlab.pdfgen.canvas"),
+            importlib.import_module("reportlab.pdfbase.pdfmetrics"),
+            importlib.import_module("reportlab.platypus.tables"),
+            importlib.import_module("reportlab.lib.colors"),
+            importlib.import_module("reportlab.lib.utils"),
+        )
+    except Exception as e:
+        raise RuntimeError("Dependencia faltante: reportlab") from e
+
+
+def _wrap(text: str, width: float, font: str, string_width, split) -> list[str]:
+    # Ajuste por palabras (como LongTable); palabras más anchas que la celda se cortan por letras.
+    lines: list[str] = []
+    for paragraph in text.split("\n"):
+        for line in split(paragraph, font, FONT_SIZE, width) or [""]:
+            while len(line) > 1 and string_width(line, font, FONT_SIZE) > width:
+                cut = max(1, int(len(line) * width / string_width(line, font, FONT_SIZE)))
+                while cut > 1 and string_width(line[:cut], font, FONT_SIZE) > width:
+                    cut -= 1
+                lines.append(line[:cut])
+                line = line[cut:]
+            lines.append(line)
+    return lines
+
+
+class _RowWrapper:
+    """Ajusta filas al ancho de columna y calcula su alto (paginación por alto acumulado)."""
+
+    def __init__(self, layout: PdfLayout) -> None:
+        _, pdfmetrics, _, _, utils = _reportlab()
+        self._string_width = pdfmetrics.stringWidth
+        self._split = utils.simpleSplit
+        self._width = layout.text_width
+        self._max_lines: int | None = None
+        self.header = self.wrap(layout.headers, font="Helvetica-Bold")
+        # Una fila nunca supera una página: una celda más larga se corta con "…" (caso extremo).
+        room = layout.table_height(1) - self.header[0] - 2 * CELL_VPADDING - 2
+        self._max_lines = max(1, int(room // LEADING))
+
+    def wrap(self, values, *, font: str = "Helvetica") -> WrappedRow:
+        max_lines = self._max_lines
+        cells: list[str] = []
+        height_lines = 1
+        for value in values:
+            lines = _wrap(value, self._width, font, self._string_width, self._split)
+            if max_lines and len(lines) > max_lines:
+                lines = [*lines[: max_lines - 1], lines[max_lines - 1][:-1] + "…"]
+            height_lines = max(height_lines, len(lines))
+            cells.append("\n".join(lines))
+        return max(ROW_HEIGHT, height_lines * LEADING + 2 * CELL_VPADDING + 2), cells
+
+
+def _draw_pages(canvas, layout: PdfLayout, pages: Iterable[list[WrappedRow]], first_page: int) -> None:
+    _, _, tables_mod, colors, _ = _reportlab()
+    style = tables_mod.TableStyle(
+        [
+            tuple(colors.HexColor(v) if isinstance(v, str) and v.startswith("#") else v for v in cmd)
+            for cmd in _STYLE
+        ]
+    )
+    header_height, header = _RowWrapper(layout).header
+    col_w = layout.col_width
+
+    page_no = first_page
+    for rows in pages:
+        top = layout.height - MARGIN
+        if page_no == 1:
+            canvas.setFont("Helvetica-Bold", 18)
+            canvas.drawString(MARGIN, top - 18, layout.title)
+            canvas.setFont("Helvetica", 10)
+            canvas.drawString(MARGIN, top - 36, layout.subtitle)
+            if layout.notice:
+                canvas.setFont("Helvetica-Bold", 10)
+                canvas.setFillColor(colors.HexColor("#B42318"))
+                canvas.drawString(MARGIN, top - 36 - NOTICE_BLOCK, layout.notice)
+                canvas.setFillColor(colors.black)
+            top -= layout.title_block()
+        data = [header, *(cells for _, cells in rows)]
+        heights = [header_height, *(h for h, _ in rows)]
+        table = tables_mod.Table(data, colWidths=[col_w] * len(header), rowHeights=heights, style=style)
+        _, h = table.wrapOn(canvas, layout.width - 2 * MARGIN, top - MARGIN)
+        table.drawOn(canvas, MARGIN, top - h)
+        canvas.setFont("Helvetica", 8)
+        canvas.drawRightString(layout.width - MARGIN, MARGIN, f"Página {page_no}")
+        canvas.showPage()
+        page_no += 1
+
+
+def render_pages(layout: PdfLayout, pages: list[list[WrappedRow]], first_page: int) -> bytes:
+    """PDF con las páginas dadas (worker del pool: función top-level, picklable)."""
+
+    canvas_mod, *_ = _reportlab()
+    buffer = BytesIO()
+    canvas = canvas_mod.Canvas(buffer, pagesize=(layout.width, layout.height), pageCompression=1)
+    _draw_pages(canvas, layout, pages, first_page)
+    canvas.save()
+    return buffer.getvalue()
+
+
+def paginate_rows(layout: PdfLayout, rows: Iterator[list[str]]) -> Iterator[list[WrappedRow]]:
+    """Filas ajustadas, agrupadas por página según su alto (la primera lleva el título)."""
+
+    wrapper = _RowWrapper(layout)
+    header_height = wrapper.header[0]
+    page_no = 1
+    block: list[WrappedRow] = []
+    used = header_height
+    for row in rows:
+        wrapped = wrapper.wrap(row)
+        if block and used + wrapped[0] > layout.table_height(page_no):
+            yield block
+            page_no += 1
+            block, used = [], header_height
+        block.append(wrapped)
+        used += wrapped[0]
+    if block or page_no == 1:
+        yield block  # Export vacío: igual una página con título y headers.
+
+
+def write_pdf(
+    layout: PdfLayout, rows: Iterator[list[str]], out: IO[bytes], *, title: str, workers: int = 0
+) -> None:
+    """Escribe el PDF en `out` página a página.
+
+    Solo las filas de una página (o de las tareas en vuelo del pool) viven como objetos
+    Python; ReportLab conserva las páginas ya comprimidas hasta save().
+    workers > 0: tandas de PAGES_PER_TASK páginas en un ProcessPoolExecutor, unidas con pypdf.
+    """
+
+    pages = paginate_rows(layout, rows)
+    canvas_mod, *_ = _reportlab()
+    if workers <= 0:
+        canvas = canvas_mod.Canvas(out, pagesize=(layout.width, layout.height), pageCompression=1)
+        canvas.setTitle(title)
+        _draw_pages(canvas, layout, pages, 1)
+        canvas.save()
+        return
+
+    try:
+        PdfWriter = getattr(importlib.import_module("pypdf"), "PdfWriter")
+        PdfReader = getattr(importlib.import_module("pypdf"), "PdfReader")
+    except Exception as e:
+        raise RuntimeError("Dependencia faltante: pypdf") from e
+
+    writer = PdfWriter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        first_page = 1
+
+        def collect(limit: int) -> None:
+            while len(pending) > limit:
+                writer.append(PdfReader(BytesIO(pending.pop(0).result())))
+
+        while batch := list(islice(pages, PAGES_PER_TASK)):
+            pending.append(pool.submit(render_pages, layout, batch, first_page))
+            first_page += len(batch)
+            # Presupuesto de memoria: como mucho 2 tareas por worker en vuelo.
+            collect(workers * 2)
+        collect(0)
+    writer.add_metadata({"/Title": title})
+    writer.write(out)
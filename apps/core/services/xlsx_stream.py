@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import math
+import re
+import zipfile
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import chain, islice
+from typing import Iterable
+from xml.sax.saxutils import escape
+
+# Caracteres de control que XML 1.0 no admite (openpyxl los rechaza; aquí se eliminan).
+_ILLEGAL_XML = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+_INVALID_SHEET = re.compile(r"[\[\]:*?/\\]")
+_EPOCH = datetime(1899, 12, 30)
+
+# Estilos fijos (styles.xml): 0 general, 1 fecha+hora, 2 fecha, 3 hora.
+_STYLE_DATETIME = 1
+_STYLE_DATE = 2
+_STYLE_TIME = 3
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    "{sheets}"
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    "</Types>"
+)
+_CONTENT_TYPE_SHEET = (
+    '<Override PartName="/xl/worksheets/sheet{n}.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    "<sheets>{sheets}</sheets>"
+    "</workbook>"
+)
+_WORKBOOK_SHEET = '<sheet name="{name}" sheetId="{n}" r:id="rId{n}"/>'
+# rId de hojas: 1..N; styles va después de la última.
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    "{sheets}"
+    '<Relationship Id="rId{styles}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    "</Relationships>"
+)
+_WORKBOOK_REL_SHEET = (
+    '<Relationship Id="rId{n}" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet{n}.xml"/>'
+)
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="1"><numFmt numFmtId="164" formatCode="yyyy-mm-dd hh:mm:ss"/></numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="4">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="21" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    "</cellXfs>"
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    "</styleSheet>"
+)
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+# Límite de filas por hoja de Excel (encabezado incluido).
+MAX_SHEET_ROWS = 1_048_576
+
+
+def _column_letter(index: int) -> str:
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _serial(value: datetime) -> float:
+    return (value - _EPOCH).total_seconds() / 86400
+
+
+def _cell(ref: str, value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{ref}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, Decimal)) or (isinstance(value, float) and math.isfinite(value)):
+        return f'<c r="{ref}"><v>{value}</v></c>'
+    if isinstance(value, datetime):
+        # Excel no guarda zona horaria: misma conversión a naive que _convert_datetime.
+        return f'<c r="{ref}" s="{_STYLE_DATETIME}"><v>{_serial(value.replace(tzinfo=None))}</v></c>'
+    if isinstance(value, date):
+        return f'<c r="{ref}" s="{_STYLE_DATE}"><v>{(value - _EPOCH.date()).days}</v></c>'
+    if isinstance(value, time):
+        seconds = value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6
+        return f'<c r="{ref}" s="{_STYLE_TIME}"><v>{seconds / 86400}</v></c>'
+    if isinstance(value, timedelta):
+        value = str(value)
+    text = escape(_ILLEGAL_XML.sub("", str(value)))
+    return f'<c r="{ref}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+class _Sink:
+    """Destino de ZipFile sin seek: acumula lo escrito hasta el próximo drain()."""
+
+    def __init__(self) -> None:
+        self._parts: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        return data
+
+
+class XlsxStreamWriter:
+    """XLSX escrito en streaming: el zip sale a medida que llegan filas.
+
+    La memoria queda acotada por la tanda de filas en curso, sin importar el total:
+    la hoja se escribe con strings inline (sin sharedStrings) y cada entrada del zip
+    lleva data descriptor (no hace falta volver atrás a escribir tamaños). Las hojas
+    van con Zip64 (pueden pasar de 2 GiB sin comprimir).
+
+    Al llegar a max_rows filas (encabezado incluido; por defecto el límite de Excel)
+    sigue en una hoja nueva "<nombre> (2)", "<nombre> (3)"… que repite el encabezado.
+    workbook.xml y [Content_Types].xml se escriben en finish(), con todas las hojas.
+
+    Uso: start() → rows(tanda)… → finish(); cada llamada devuelve los bytes listos.
+    """
+
+    def __init__(
+        self, *, headers: list[str], sheet_name: str = "Export", max_rows: int = MAX_SHEET_ROWS
+    ) -> None:
+        if max_rows < 2:
+            raise ValueError("max_rows debe dejar lugar al encabezado y al menos una fila")
+        self.headers = headers
+        self.sheet_name = _INVALID_SHEET.sub("_", sheet_name)[:31] or "Export"
+        self.max_rows = max_rows
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED)
+        self._sheet = None
+        self._sheet_names: list[str] = []
+        self._row = 0
+        self._letters: list[str] = []
+
+    def _ref_letters(self, width: int) -> list[str]:
+        while len(self._letters) < width:
+            self._letters.append(_column_letter(len(self._letters)))
+        return self._letters
+
+    def _next_sheet_name(self) -> str:
+        n = len(self._sheet_names) + 1
+        if n == 1:
+            return self.sheet_name
+        suffix = f" ({n})"
+        return self.sheet_name[: 31 - len(suffix)] + suffix
+
+    def _open_sheet(self) -> None:
+        if self._sheet is not None:
+            self._sheet.write(_SHEET_TAIL.encode("utf-8"))
+            self._sheet.close()
+        self._sheet_names.append(self._next_sheet_name())
+        n = len(self._sheet_names)
+        # force_zip64: el tamaño no se conoce de antemano y una hoja grande pasa de 2 GiB.
+        self._sheet = self._zip.open(f"xl/worksheets/sheet{n}.xml", "w", force_zip64=True)
+        self._sheet.write(_SHEET_HEAD.encode("utf-8"))
+        self._row = 0
+        self._sheet.write(self._render([self.headers]))
+
+    def _render(self, rows: Iterable[Iterable]) -> bytes:
+        parts: list[str] = []
+        for row in rows:
+            self._row += 1
+            values = list(row)
+            letters = self._ref_letters(len(values))
+            n = self._row
+            cells = "".join(_cell(f"{letters[i]}{n}", v) for i, v in enumerate(values))
+            parts.append(f'<row r="{n}">{cells}</row>')
+        return "".join(parts).encode("utf-8")
+
+    def start(self) -> bytes:
+        self._zip.writestr("_rels/.rels", _ROOT_RELS)
+        self._zip.writestr("xl/styles.xml", _STYLES)
+        self._open_sheet()
+        return self._sink.drain()
+
+    def rows(self, rows: Iterable[Iterable]) -> bytes:
+        rows = iter(rows)
+        while True:
+            data = self._render(islice(rows, self.max_rows - self._row))
+            if data:
+                self._sheet.write(data)
+            if self._row < self.max_rows:
+                break
+            # Hoja llena: se abre otra sólo si quedan filas (sin hojas vacías al final).
+            first = next(rows, None)
+            if first is None:
+                break
+            self._open_sheet()
+            rows = chain([first], rows)
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._sheet.write(_SHEET_TAIL.encode("utf-8"))
+        self._sheet.close()
+        numbers = range(1, len(self._sheet_names) + 1)
+        self._zip.writestr(
+            "xl/workbook.xml",
+            _WORKBOOK.format(
+                sheets="".join(
+                    _WORKBOOK_SHEET.format(name=escape(name, {'"': "&quot;"}), n=n)
+                    for n, name in zip(numbers, self._sheet_names)
+                )
+            ),
+        )
+        self._zip.writestr(
+            "xl/_rels/workbook.xml.rels",
+            _WORKBOOK_RELS.format(
+                sheets="".join(_WORKBOOK_REL_SHEET.format(n=n) for n in numbers),
+                styles=len(self._sheet_names) + 1,
+            ),
+        )
+        self._zip.writestr(
+            "[Content_Types].xml",
+            _CONTENT_TYPES.format(sheets="".join(_CONTENT_TYPE_SHEET.format(n=n) for n in numbers)),
+        )
+        self._zip.close()
+        return self._sink.drain()
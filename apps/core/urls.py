@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path("<uuid:pk>/", views.export_job_status, name="export_job"),
+    path("<uuid:pk>/download/", views.export_job_download, name="export_job_download"),
+]
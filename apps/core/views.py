@@ -1,8 +1,12 @@
-from django.shortcuts import render, redirect
+from django.shortcuts import get_object_or_404, render, redirect
 from django.urls import reverse
 from django.contrib.auth import get_user_model, login
+from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from .models import GlobalConfig
+from django.http import Http404
+from .models import ExportJob, GlobalConfig
+from .services.export_jobs import fail_stale_jobs
+from .services.exporting import EXPORT_CONTENT_TYPES, ranged_file_response
 from .forms import SetupForm
 
 User = get_user_model()
@@ -58,3 +62,33 @@ def setup_wizard(request):
         form = SetupForm(instance=config)
         
     return render(request, "core/setup_wizard.html", {"form": form, "has_superuser": has_superuser})
+
+
+@login_required
+def export_job_status(request, pk):
+    """Progreso de un export en segundo plano (el partial se re-pide por HTMX hasta terminar)."""
+    job = get_object_or_404(ExportJob, pk=pk, user=request.user)
+    # Job sin latido (proceso reiniciado / worker muerto): se muestra como fallido, no en curso.
+    if not job.is_finished and fail_stale_jobs(ExportJob.objects.filter(pk=job.pk)):
+        job.refresh_from_db()
+    context = {"job": job}
+    if request.headers.get("HX-Request") == "true":
+        return render(request, "core/exports/_job.html", context)
+    return render(request, "core/exports/job.html", context)
+
+
+@login_required
+def export_job_download(request, pk):
+    """Descarga del archivo generado (solo el dueño del job)."""
+    job = get_object_or_404(ExportJob, pk=pk, user=request.user, status=ExportJob.Status.DONE)
+    if not job.file:
+        raise Http404("Export sin archivo")
+    # El archivo de un job no cambia: ETag fijo y Range para reanudar descargas.
+    return ranged_file_response(
+        request,
+        job.file.open("rb"),
+        size=job.file.size,
+        content_type=EXPORT_CONTENT_TYPES.get(job.format, "application/octet-stream"),
+        filename=job.filename or job.file.name.rsplit("/", 1)[-1],
+        etag=f'"{job.pk}"',
+    )
@@ -2,9 +2,8 @@ from __future__ import annotations
 
 from django.db.models import QuerySet
 from django.http import HttpRequest
-from django.urls import reverse
 
-from apps.core.crud import ColumnDef, CrudConfig, FilterDef, register_crud
+from apps.core.crud import BulkActionDef, ColumnDef, CrudConfig, FilterDef, register_crud
 
 from .models import Item
 from .forms import ItemForm
@@ -29,6 +28,25 @@ class ItemCrudConfig(CrudConfig):
 
     # Match Step 2 behavior exactly
     search_fields = ["name"]
+    search_backend = "auto"
+
+    # Filas desde values_list + URLs compiladas (sin instancias ni reverse() por fila).
+    row_source = "values"
+    row_url_names = {
+        "edit": "crud_example:edit",
+        "delete": "crud_example:delete",
+    }
+
+    # Partial de tabla cacheado; create/edit/delete invalidan por signals.
+    fragment_cache_timeout = 300
+    # Paginación secuencial: la página siguiente queda en cache antes del click.
+    prefetch_next_page = True
+    # ETag por versión de datos: sort/back/history restore repetidos responden 304.
+    conditional_get = True
+    # Búsquedas patológicas (q de 1 carácter): corte a los 2s y respuesta degradada.
+    query_timeout_ms = 2000
+    # Listado desde la réplica si DJANGO_DB_REPLICA_* está configurada (si no, sin efecto).
+    read_replica = True
 
     list_columns = [
         ColumnDef(
@@ -37,7 +55,7 @@ class ItemCrudConfig(CrudConfig):
             sortable=True,
             nowrap=True,
             order_by=("name",),
-            value=lambda o: o.name,
+            fields=("name",),
         ),
         ColumnDef(
             key="status",
@@ -50,7 +68,7 @@ class ItemCrudConfig(CrudConfig):
             sortable=True,
             nowrap=True,
             order_by=("status",),
-            value=lambda o: o.status,
+            fields=("status",),
         ),
         ColumnDef(
             key="created_at",
@@ -59,11 +77,18 @@ class ItemCrudConfig(CrudConfig):
             sortable=True,
             nowrap=True,
             order_by=("created_at",),
-            value=lambda o: o.created_at,
+            fields=("created_at",),
         ),
     ]
 
-    filters = [FilterDef(name="status", apply=_filter_status)]
+    filters = [FilterDef(name="status", apply=_filter_status, field="status", facet=True, label="Estado")]
+    facet_cache_timeout = 300
+
+    bulk_actions = [
+        BulkActionDef(name="activate", label="Activar", values={"status": Item.Status.ACTIVE}),
+        BulkActionDef(name="deactivate", label="Desactivar", values={"status": Item.Status.INACTIVE}),
+        BulkActionDef(name="delete", label="Eliminar", kind="delete"),
+    ]
 
     # Default sort: created_at asc (same as Step 2)
     default_sort_key = "created_at"
@@ -71,6 +96,9 @@ class ItemCrudConfig(CrudConfig):
 
     status_options = [("all", "Todos"), ("active", "Activo"), ("inactive", "Inactivo")]
 
+    # from/to → created_at >= / < (índices [created_at, id] y [status, created_at, id]).
+    date_field = "created_at"
+
     # Step 8 (MVP): forms + modal metadata (sin auto-generación)
     create_form_class = ItemForm
     edit_form_class = ItemForm
@@ -100,13 +128,8 @@ class ItemCrudConfig(CrudConfig):
         "created_at": "Creado",
     }
     export_formats = {"csv", "xlsx", "pdf"}
-
-    def row_urls(self, obj: Item, request: HttpRequest, params) -> dict:
-        return {
-            "detail": None,
-            "edit": reverse("crud_example:edit", kwargs={"id": obj.pk}),
-            "delete": reverse("crud_example:delete", kwargs={"id": obj.pk}),
-        }
+    # Mismo filtro + mismos datos → el archivo sale del disco (con Range), sin tocar la DB.
+    export_cache = True
 
 
 def register() -> None:
@@ -10,5 +10,15 @@ class Item(models.Model):
     status = models.CharField(max_length=16, choices=Status.choices, default=Status.ACTIVE)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        # Orden + filtro del listado CRUD (generados con `manage.py crud_index_advisor`).
+        indexes = [
+            models.Index(fields=["name", "id"], name="crud_exampl_name_e18527_idx"),
+            models.Index(fields=["status", "id"], name="crud_exampl_status_af917c_idx"),
+            models.Index(fields=["created_at", "id"], name="crud_exampl_created_ba0fef_idx"),
+            models.Index(fields=["status", "name", "id"], name="crud_exampl_status_8d2ecf_idx"),
+            models.Index(fields=["status", "created_at", "id"], name="crud_exampl_status_29abf6_idx"),
+        ]
+
     def __str__(self) -> str:
         return self.name
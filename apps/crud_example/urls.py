@@ -7,7 +7,9 @@ app_name = "crud_example"
 urlpatterns = [
     path("", views.list_view, name="list"),
     path("table/", views.table_view, name="table"),
+    path("rows/", views.rows_view, name="rows"),
     path("create/", views.create_view, name="create"),
+    path("bulk/", views.bulk_view, name="bulk"),
     path("<int:id>/edit/", views.edit_view, name="edit"),
     path("<int:id>/delete/", views.delete_view, name="delete"),
     path("export/csv/", views.export_csv_view, name="export_csv"),
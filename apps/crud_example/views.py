@@ -1,25 +1,41 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from urllib.parse import parse_qs
-from urllib.parse import urlparse
 from urllib.parse import urlencode
 
+from asgiref.sync import sync_to_async
 from django.core.paginator import Paginator
 from django.db import transaction
-from django.db.models import Q
 from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
 from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404, render
+from django.views.decorators.http import require_POST
 from django.urls import reverse
 
 from .models import Item
 
-from apps.core.crud.engine import build_list_context
+from apps.core.crud.engine import (
+    arender_list_fragment,
+    arender_list_page,
+    arender_rows,
+    handle_bulk_action,
+    render_row_update,
+    render_table_refresh,
+)
+from apps.core.crud.permissions import aresolve_permissions
+from apps.core.db_router import replica_reads
 from apps.core.crud.registry import get_crud
 from .crud_config import CRUD_SLUG_ITEM
 
-from apps.core.services.exporting import build_pdf_table, build_xlsx, stream_csv
+from apps.core.services.export_jobs import crud_export_params, handoff_export, should_export_async
+from apps.core.services.exporting import (
+    astream_csv,
+    astream_xlsx,
+    build_cached_export,
+    build_pdf_table,
+    cached_export_response,
+    export_cache_key,
+)
 
 
 @dataclass(frozen=True)
@@ -57,46 +73,12 @@ def _build_qs_without_page(params: dict[str, str]) -> str:
     return urlencode(data)
 
 
-def _get_params_from_mapping(data: dict[str, str]) -> dict[str, str]:
-    q = (data.get("q") or "").strip()
-    status = (data.get("status") or "").strip()
-    sort = (data.get("sort") or "").strip()
-    direction = (data.get("dir") or "").strip().lower()
-    page = (data.get("page") or "1").strip()
-
-    if direction not in {"asc", "desc"}:
-        direction = "asc"
-
-    return {
-        "q": q,
-        "status": status,
-        "sort": sort,
-        "dir": direction,
-        "page": page,
-        "from": (data.get("from") or "").strip(),
-        "to": (data.get("to") or "").strip(),
-    }
-
-
-def _get_params_from_hx_current_url(request: HttpRequest) -> dict[str, str] | None:
-    current = request.headers.get("HX-Current-URL") or ""
-    if not current:
-        return None
-
-    parsed = urlparse(current)
-    if not parsed.query:
-        return None
-
-    raw = parse_qs(parsed.query)
-    flat = {k: (v[-1] if v else "") for k, v in raw.items()}
-    return _get_params_from_mapping(flat)
-
-
 def _queryset(params: dict[str, str]):
     qs = Item.objects.all()
 
     if params["q"]:
-        qs = qs.filter(Q(name__icontains=params["q"]))
+        # Mismo backend de búsqueda que el listado declarativo (FTS si está indexado).
+        qs = get_crud(CRUD_SLUG_ITEM).get_search_index().apply(qs, params["q"])
 
     if params["status"] and params["status"] != "all":
         qs = qs.filter(status=params["status"])
@@ -141,64 +123,30 @@ def _items(page_obj, *, params: dict[str, str]) -> list[dict]:
     return rows
 
 
-def _context(request: HttpRequest) -> dict:
-    params = _get_params(request)
-    qs = _queryset(params)
-
-    paginator = Paginator(qs, 10)
-    page_obj = paginator.get_page(params["page"] or 1)
+def _crud_urls() -> dict[str, str]:
+    """Endpoints del CRUD para el engine y los templates (un solo lugar al sumar uno)."""
 
-    crud_urls = {
+    return {
         "list": reverse("crud_example:list"),
         "table": reverse("crud_example:table"),
-        # No implementados en Step 2
+        "rows": reverse("crud_example:rows"),
         "create": reverse("crud_example:create"),
-        "bulk": "#",
+        "bulk": reverse("crud_example:bulk"),
         "export_csv": reverse("crud_example:export_csv"),
         "export_xlsx": reverse("crud_example:export_xlsx"),
         "export_pdf": reverse("crud_example:export_pdf"),
     }
 
-    return {
-        "crud_urls": crud_urls,
-        "page_title": "CRUD Example",
-        "entity_label": "Item",
-        "entity_label_plural": "Items",
-        "current_filters": params,
-        "status_options": [("all", "Todos"), ("active", "Activo"), ("inactive", "Inactivo")],
-        "columns": _columns(),
-        "items": _items(page_obj, params=params),
-        "page_obj": page_obj,
-        "total_count": qs.count(),
-        "qs": _build_qs_without_page(params),
-    }
 
-
-def _context_for_refresh(request: HttpRequest) -> dict:
-    """Context para refrescar tabla tras modales.
-
-    Prioriza HX-Current-URL (URL actual del navegador) para preservar filtros/sort/page.
-    Fallback: usa request.GET.
-    """
-
-    params = _get_params_from_hx_current_url(request) or _get_params(request)
+def _context(request: HttpRequest) -> dict:
+    params = _get_params(request)
     qs = _queryset(params)
 
     paginator = Paginator(qs, 10)
     page_obj = paginator.get_page(params["page"] or 1)
 
-    crud_urls = {
-        "list": reverse("crud_example:list"),
-        "table": reverse("crud_example:table"),
-        "create": reverse("crud_example:create"),
-        "bulk": "#",
-        "export_csv": reverse("crud_example:export_csv"),
-        "export_xlsx": reverse("crud_example:export_xlsx"),
-        "export_pdf": reverse("crud_example:export_pdf"),
-    }
-
     return {
-        "crud_urls": crud_urls,
+        "crud_urls": _crud_urls(),
         "page_title": "CRUD Example",
         "entity_label": "Item",
         "entity_label_plural": "Items",
@@ -212,40 +160,39 @@ def _context_for_refresh(request: HttpRequest) -> dict:
     }
 
 
-def list_view(request: HttpRequest) -> HttpResponse:
+async def list_view(request: HttpRequest) -> HttpResponse:
     config = get_crud(CRUD_SLUG_ITEM)
+    await aresolve_permissions(request)
     if not config.can_list(request):
         return HttpResponseForbidden("Forbidden")
-    crud_urls = {
-        "list": reverse("crud_example:list"),
-        "table": reverse("crud_example:table"),
-        # Aunque Step 7 es list-only, el UI existente requiere estas URLs.
-        "create": reverse("crud_example:create"),
-        "bulk": "#",
-        "export_csv": reverse("crud_example:export_csv"),
-        "export_xlsx": reverse("crud_example:export_xlsx"),
-        "export_pdf": reverse("crud_example:export_pdf"),
-    }
-    ctx = build_list_context(config=config, request=request, crud_urls=crud_urls)
-    return render(request, "crud/list.html", ctx)
+    return await arender_list_page(config=config, request=request, crud_urls=_crud_urls())
 
 
-def table_view(request: HttpRequest) -> HttpResponse:
+async def table_view(request: HttpRequest) -> HttpResponse:
     # Endpoint HTMX: solo el partial de tabla
     config = get_crud(CRUD_SLUG_ITEM)
+    await aresolve_permissions(request)
     if not config.can_list(request):
         return HttpResponseForbidden("Forbidden")
-    crud_urls = {
-        "list": reverse("crud_example:list"),
-        "table": reverse("crud_example:table"),
-        "create": reverse("crud_example:create"),
-        "bulk": "#",
-        "export_csv": reverse("crud_example:export_csv"),
-        "export_xlsx": reverse("crud_example:export_xlsx"),
-        "export_pdf": reverse("crud_example:export_pdf"),
-    }
-    ctx = build_list_context(config=config, request=request, crud_urls=crud_urls)
-    return render(request, "crud/_table.html", ctx)
+    return await arender_list_fragment(config=config, request=request, crud_urls=_crud_urls())
+
+
+async def rows_view(request: HttpRequest) -> HttpResponse:
+    # Endpoint HTMX: bloque siguiente de filas (scroll infinito, CrudConfig.infinite_scroll)
+    config = get_crud(CRUD_SLUG_ITEM)
+    await aresolve_permissions(request)
+    if not config.can_list(request):
+        return HttpResponseForbidden("Forbidden")
+    return await arender_rows(config=config, request=request, crud_urls=_crud_urls())
+
+
+@require_POST
+def bulk_view(request: HttpRequest) -> HttpResponse:
+    # Endpoint HTMX: acción masiva + tabla refrescada.
+    config = get_crud(CRUD_SLUG_ITEM)
+    if not config.can_list(request):
+        return HttpResponseForbidden("Forbidden")
+    return handle_bulk_action(config=config, request=request, crud_urls=_crud_urls())
 
 
 def _export_queryset(request: HttpRequest):
@@ -253,8 +200,46 @@ def _export_queryset(request: HttpRequest):
     return _queryset(params)
 
 
-def export_csv_view(request: HttpRequest) -> HttpResponseBase:
+async def _export_shortcut(
+    request: HttpRequest, config, qs, fmt: str, fields: list[str], headers: list[str]
+) -> HttpResponseBase | None:
+    """Antes del export en la request: archivo cacheado → job si es grande → generar al cache.
+
+    None: export sin cache posible y chico (la vista responde como siempre).
+    """
+
+    opts = {"title": "CRUD Example · Items", "sheet_name": "Items"}
+    key = await sync_to_async(export_cache_key)(fmt, queryset=qs, fields=fields, headers=headers, **opts)
+    if key is not None:
+        hit = await sync_to_async(cached_export_response)(
+            request, key, fmt=fmt, filename_base="crud_example_items"
+        )
+        if hit is not None:
+            return hit
+
+    if config.exports_declared() and await sync_to_async(should_export_async)(qs, fmt):
+        # Export grande → job en segundo plano (apps.core.services.export_jobs).
+        params = crud_export_params(request, CRUD_SLUG_ITEM, filename_base="crud_example_items", **opts)
+        return await sync_to_async(handoff_export)(request, source="crud", fmt=fmt, params=params)
+
+    if key is not None:
+        return await sync_to_async(build_cached_export)(
+            request,
+            key,
+            fmt=fmt,
+            queryset=qs,
+            fields=fields,
+            headers=headers,
+            filename_base="crud_example_items",
+            **opts,
+        )
+    return None
+
+
+@replica_reads
+async def export_csv_view(request: HttpRequest) -> HttpResponseBase:
     config = get_crud(CRUD_SLUG_ITEM)
+    await aresolve_permissions(request)
     if not config.can_export(request):
         return HttpResponseForbidden("Forbidden")
     if not config.is_export_enabled():
@@ -263,11 +248,13 @@ def export_csv_view(request: HttpRequest) -> HttpResponseBase:
         return HttpResponseForbidden("Format not allowed")
 
     params = config.parse_params(request)
-    qs = config.queryset_for_list(request=request, params=params)
-
+    qs = await sync_to_async(config.queryset_for_list)(request=request, params=params)
     fields = config.get_export_fields() or ["name", "status", "created_at"]
     headers = config.get_export_headers() or ["Nombre", "Estado", "Creado"]
-    return stream_csv(
+    if shortcut := await _export_shortcut(request, config, qs, "csv", fields, headers):
+        return shortcut
+
+    return astream_csv(
         queryset=qs,
         fields=fields,
         headers=headers,
@@ -275,8 +262,10 @@ def export_csv_view(request: HttpRequest) -> HttpResponseBase:
     )
 
 
-def export_xlsx_view(request: HttpRequest) -> HttpResponseBase:
+@replica_reads
+async def export_xlsx_view(request: HttpRequest) -> HttpResponseBase:
     config = get_crud(CRUD_SLUG_ITEM)
+    await aresolve_permissions(request)
     if not config.can_export(request):
         return HttpResponseForbidden("Forbidden")
     if not config.is_export_enabled():
@@ -285,11 +274,14 @@ def export_xlsx_view(request: HttpRequest) -> HttpResponseBase:
         return HttpResponseForbidden("Format not allowed")
 
     params = config.parse_params(request)
-    qs = config.queryset_for_list(request=request, params=params)
-
+    qs = await sync_to_async(config.queryset_for_list)(request=request, params=params)
     fields = config.get_export_fields() or ["name", "status", "created_at"]
     headers = config.get_export_headers() or ["Nombre", "Estado", "Creado"]
-    return build_xlsx(
+    if shortcut := await _export_shortcut(request, config, qs, "xlsx", fields, headers):
+        return shortcut
+
+    # Streaming: las filas se leen por tandas en un thread a medida que sale el zip.
+    return astream_xlsx(
         queryset=qs,
         fields=fields,
         headers=headers,
@@ -298,8 +290,10 @@ def export_xlsx_view(request: HttpRequest) -> HttpResponseBase:
     )
 
 
-def export_pdf_view(request: HttpRequest) -> HttpResponseBase:
+@replica_reads
+async def export_pdf_view(request: HttpRequest) -> HttpResponseBase:
     config = get_crud(CRUD_SLUG_ITEM)
+    await aresolve_permissions(request)
     if not config.can_export(request):
         return HttpResponseForbidden("Forbidden")
     if not config.is_export_enabled():
@@ -308,11 +302,13 @@ def export_pdf_view(request: HttpRequest) -> HttpResponseBase:
         return HttpResponseForbidden("Format not allowed")
 
     params = config.parse_params(request)
-    qs = config.queryset_for_list(request=request, params=params)
-
+    qs = await sync_to_async(config.queryset_for_list)(request=request, params=params)
     fields = config.get_export_fields() or ["name", "status", "created_at"]
     headers = config.get_export_headers() or ["Nombre", "Estado", "Creado"]
-    return build_pdf_table(
+    if shortcut := await _export_shortcut(request, config, qs, "pdf", fields, headers):
+        return shortcut
+
+    return await sync_to_async(build_pdf_table)(
         queryset=qs,
         fields=fields,
         headers=headers,
@@ -321,14 +317,29 @@ def export_pdf_view(request: HttpRequest) -> HttpResponseBase:
     )
 
 
-def _hx_modal_success_refresh(request: HttpRequest) -> HttpResponse:
+def _hx_modal_success_refresh(
+    request: HttpRequest, *, pk=None, changed_fields=None, deleted: bool = False
+) -> HttpResponse:
     """Respuesta estándar de éxito para modales:
 
     - Cierra modal vía HX-Trigger
-    - Refresca tabla preservando filtros/sort/page vía OOB swap
+    - Edit/delete: solo la fila afectada vía OOB swap (filtros/sort/page de HX-Current-URL)
+    - Create (pk=None) o edit que cambia el orden: tabla completa vía OOB swap
     """
 
-    resp = render(request, "crud_example/_oob_table_refresh.html", _context_for_refresh(request))
+    config = get_crud(CRUD_SLUG_ITEM)
+    crud_urls = _crud_urls()
+    if pk is None:
+        resp = render_table_refresh(config=config, request=request, crud_urls=crud_urls)
+    else:
+        resp = render_row_update(
+            config=config,
+            request=request,
+            crud_urls=crud_urls,
+            pk=pk,
+            changed_fields=changed_fields,
+            deleted=deleted,
+        )
     resp["HX-Trigger"] = '{"modalClose": true}'
     return resp
 
@@ -396,7 +407,7 @@ def edit_view(request: HttpRequest, id: int) -> HttpResponseBase:
         if form.is_valid():
             with transaction.atomic():
                 form.save()
-            return _hx_modal_success_refresh(request)
+            return _hx_modal_success_refresh(request, pk=obj.pk, changed_fields=form.changed_data)
 
         return render(
             request,
@@ -433,9 +444,10 @@ def delete_view(request: HttpRequest, id: int) -> HttpResponseBase:
     obj = get_object_or_404(Item, pk=id)
 
     if request.method == "POST":
+        pk = obj.pk  # delete() deja obj.pk en None
         with transaction.atomic():
             obj.delete()
-        return _hx_modal_success_refresh(request)
+        return _hx_modal_success_refresh(request, pk=pk, deleted=True)
 
     return render(
         request,
@@ -24,6 +24,7 @@ from django.core.paginator import Paginator
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render, redirect
 
+from apps.core.db_router import replica_reads
 from apps.core.dashboard.defs import KpiDef, ChartDef, ChartDataset
 from apps.orgs.decorators import organization_required
 from apps.orgs.utils import SESSION_KEY
@@ -51,6 +52,7 @@ def dashboard(request: HttpRequest) -> HttpResponse:
 
 
 @login_required
+@replica_reads
 def kpis(request: HttpRequest) -> HttpResponse:
     User = get_user_model()
     user_count = User.objects.count()
@@ -91,6 +93,7 @@ def kpis(request: HttpRequest) -> HttpResponse:
 
 
 @login_required
+@replica_reads
 def charts(request: HttpRequest) -> HttpResponse:
     # Gráfico real: Usuarios registrados últimos 7 días
     User = get_user_model()
@@ -7,3 +7,16 @@ class UsuariosConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.usuarios"
     verbose_name = "Usuarios (Business)"
+
+    def ready(self) -> None:
+        # Índice de búsqueda de miembros (ver apps.core.crud.search).
+        from . import search
+
+        search.register()
+
+        # Exports de miembros en segundo plano (ver apps.core.services.export_jobs).
+        from apps.core.services.export_jobs import register_export_source
+
+        register_export_source(
+            "usuarios.members", "apps.usuarios.services.export_members.members_export_spec"
+        )
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from apps.core.crud.search import SearchIndex, get_search_index, register_search_index
+
+
+MEMBERS_SEARCH = "usuarios.members"
+
+
+def register() -> None:
+    from apps.orgs.models import Membership
+
+    register_search_index(
+        SearchIndex(
+            name=MEMBERS_SEARCH,
+            model=Membership,
+            fields=("user__first_name", "user__last_name", "user__email"),
+            backend="auto",
+        )
+    )
+
+
+def members_search() -> SearchIndex:
+    return get_search_index(MEMBERS_SEARCH)
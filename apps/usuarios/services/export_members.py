@@ -3,15 +3,28 @@ from __future__ import annotations
 from typing import Any
 
 from django.db import transaction
-from django.db.models import Q
 from django.utils import timezone
 from django.utils.text import slugify
 
 from apps.core.services import exporting
+from apps.core.services.export_jobs import ExportSpec, should_export_async, start_export_job
 from apps.orgs.models import Membership
 from apps.core.services import BaseService, ServiceError, ServiceResult
+from apps.usuarios.search import members_search
 from apps.usuarios.domain.inputs import ExportMembersInput
 
+# Registrado en UsuariosConfig.ready (ver members_export_spec).
+EXPORT_SOURCE = "usuarios.members"
+MEMBER_EXPORT_FIELDS = [
+    "user__email",
+    "user__first_name",
+    "user__last_name",
+    "role",
+    "is_active",
+    "created_at",
+]
+MEMBER_EXPORT_HEADERS = ["Email", "Nombre", "Apellido", "Rol", "Activo", "Fecha Alta"]
+
 
 class ExportMembersService(BaseService):
     def execute(self, input_data: Any, *, actor: Any = None, context: Any = None) -> ServiceResult:
@@ -48,15 +61,21 @@ class ExportMembersService(BaseService):
         org_slug = org_slug or "org"
         filename_base = f"miembros_{slugify(org_slug)}"
 
-        fields = [
-            "user__email",
-            "user__first_name",
-            "user__last_name",
-            "role",
-            "is_active",
-            "created_at",
-        ]
-        headers = ["Email", "Nombre", "Apellido", "Rol", "Activo", "Fecha Alta"]
+        fields = MEMBER_EXPORT_FIELDS
+        headers = MEMBER_EXPORT_HEADERS
+
+        if should_export_async(qs, fmt):
+            # Export grande: job en segundo plano (la vista redirige a su progreso).
+            params = {
+                "organization_id": input_data.organization_id,
+                "include_inactive": input_data.include_inactive,
+                "search": input_data.search,
+                "role": input_data.role,
+                "is_active": input_data.is_active,
+                "filename_base": filename_base,
+            }
+            job = start_export_job(user=actor, source=EXPORT_SOURCE, fmt=fmt, params=params)
+            return ServiceResult.success(data={"export_job": job})
 
         if fmt == "csv":
             resp = exporting.stream_csv(
@@ -66,7 +85,7 @@ class ExportMembersService(BaseService):
                 filename_base=filename_base,
             )
         elif fmt == "xlsx":
-            resp = exporting.build_xlsx(
+            resp = exporting.stream_xlsx(
                 queryset=qs,
                 fields=fields,
                 headers=headers,
@@ -93,11 +112,7 @@ class ExportMembersService(BaseService):
         if input_data.search:
             term = input_data.search.strip()
             if term:
-                qs = qs.filter(
-                    Q(user__first_name__icontains=term)
-                    | Q(user__last_name__icontains=term)
-                    | Q(user__email__icontains=term)
-                )
+                qs = members_search().apply(qs, term)
 
         if input_data.role:
             qs = qs.filter(role=input_data.role)
@@ -108,3 +123,29 @@ class ExportMembersService(BaseService):
             qs = qs.filter(is_active=True)
 
         return qs.order_by("user__email", "user__username")
+
+
+def members_export_spec(user, params: dict) -> ExportSpec:
+    """Origen "usuarios.members" de apps.core.services.export_jobs (corre en el worker)."""
+
+    # El rol pudo cambiar desde que se encoló: se vuelve a exigir admin activo.
+    if not Membership.objects.filter(
+        user=user, organization_id=params["organization_id"], is_active=True, role="admin"
+    ).exists():
+        raise PermissionError("No tienes permisos para exportar miembros.")
+
+    input_data = ExportMembersInput(
+        organization_id=params["organization_id"],
+        include_inactive=params.get("include_inactive", False),
+        search=params.get("search"),
+        role=params.get("role"),
+        is_active=params.get("is_active"),
+    )
+    return ExportSpec(
+        queryset=ExportMembersService()._build_queryset(input_data),
+        fields=MEMBER_EXPORT_FIELDS,
+        headers=MEMBER_EXPORT_HEADERS,
+        title="Miembros",
+        filename_base=params.get("filename_base") or "miembros",
+        sheet_name="Miembros",
+    )
@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from typing import Any
 
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
 
 from apps.orgs.models import Membership
 from apps.core.services import BaseService, ServiceResult
+from apps.usuarios.search import members_search
 from apps.usuarios.domain.inputs import ListMembersInput
 
 
@@ -37,11 +38,7 @@ class ListMembersService(BaseService):
         if input_data.search:
             term = input_data.search.strip()
             if term:
-                qs = qs.filter(
-                    Q(user__first_name__icontains=term)
-                    | Q(user__last_name__icontains=term)
-                    | Q(user__email__icontains=term)
-                )
+                qs = members_search().apply(qs, term)
 
         if input_data.role:
             qs = qs.filter(role=input_data.role)
@@ -9,6 +9,7 @@ from apps.orgs.decorators import organization_required
 from apps.orgs.models import Membership
 from apps.orgs.utils import get_active_organization
 from apps.core.services import ExecutionContext, ServiceError
+from apps.core.services.export_jobs import export_job_url
 from apps.usuarios.domain.inputs import (
     CreateMemberInput,
     ExportMembersInput,
@@ -314,6 +315,8 @@ def export_members(request: HttpRequest) -> HttpResponse:
     service = ExportMembersService(context=context)
     result = service.execute(input_obj, actor=request.user)
 
+    if result.ok and result.data.get("export_job"):
+        return redirect(export_job_url(result.data["export_job"]))
     if result.ok and result.data.get("http_response"):
         return result.data["http_response"]
 
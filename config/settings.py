@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import os
 import secrets
+from importlib.util import find_spec
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -92,6 +93,7 @@ MIDDLEWARE = [
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "apps.core.middleware.SetupMiddleware",
+    "apps.core.middleware.ReplicaPinMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -144,6 +146,25 @@ if not DEBUG and DATABASES["default"]["ENGINE"] != "django.db.backends.sqlite3":
     if missing:
         raise RuntimeError("Faltan variables de BD en producción: " + ", ".join(missing))
 
+# Réplica de lectura opcional (apps.core.db_router): solo las vistas/CrudConfig que la
+# piden leen de ahí; escrituras, sesiones y migraciones van a "default".
+# Local: DJANGO_DB_REPLICA_NAME=db.replica.sqlite3 (copia de db.sqlite3) basta para probar.
+DATABASE_REPLICA_ALIAS = "replica"
+if os.getenv("DJANGO_DB_REPLICA_NAME") or os.getenv("DJANGO_DB_REPLICA_HOST"):
+    DATABASES[DATABASE_REPLICA_ALIAS] = {
+        **DATABASES["default"],
+        "NAME": os.getenv("DJANGO_DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "USER": os.getenv("DJANGO_DB_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": os.getenv("DJANGO_DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": os.getenv("DJANGO_DB_REPLICA_HOST", DATABASES["default"]["HOST"]),
+        "PORT": os.getenv("DJANGO_DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        # Tests: la réplica es la misma BD de test que default.
+        "TEST": {"MIRROR": "default"},
+    }
+DATABASE_ROUTERS = ["apps.core.db_router.ReplicaRouter"]
+# Read-your-writes: segundos que un usuario lee del primario tras escribir.
+CRUD_REPLICA_PIN_SECONDS = int(os.getenv("CRUD_REPLICA_PIN_SECONDS", "10"))
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -200,6 +221,31 @@ if not DEBUG:
     if _env_bool("DJANGO_BEHIND_PROXY", default=False):
         SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
 
+# CRUD: snapshot de permisos/roles por usuario compartido entre requests (segundos).
+# 0 = solo cache por request. Requiere cache compartida (Redis/Memcached) en multi-proceso.
+CRUD_PERMISSION_CACHE_TIMEOUT = int(os.getenv("CRUD_PERMISSION_CACHE_TIMEOUT", "0"))
+
+# CRUD: prefetch de la página siguiente (CrudConfig.prefetch_next_page). Threads por proceso
+# y renders en vuelo como máximo; sin cupo el prefetch se descarta. 0 workers = desactivado.
+CRUD_PREFETCH_WORKERS = int(os.getenv("CRUD_PREFETCH_WORKERS", "2"))
+CRUD_PREFETCH_MAX_PENDING = int(os.getenv("CRUD_PREFETCH_MAX_PENDING", "8"))
+
+# Exports PDF (apps.core.services.exporting.build_pdf_table): modo por páginas opt-in (layout
+# lineal, celdas con ajuste de línea; la memoria igual crece con las páginas comprimidas),
+# procesos para renderizar tandas de páginas (0 = en el mismo proceso; requiere pypdf), tope
+# de filas del modo por páginas (0 = sin límite; con aviso en el PDF) y bytes en RAM antes
+# de pasar a disco.
+EXPORT_PDF_CHUNKED = _env_bool("EXPORT_PDF_CHUNKED", default=False)
+EXPORT_PDF_WORKERS = int(os.getenv("EXPORT_PDF_WORKERS", "0"))
+EXPORT_PDF_MAX_ROWS = int(os.getenv("EXPORT_PDF_MAX_ROWS", "100000"))
+EXPORT_SPOOL_MAX_BYTES = int(os.getenv("EXPORT_SPOOL_MAX_BYTES", str(8 * 1024 * 1024)))
+
+# Cache de archivos de export (apps.core.services.exporting.export_cache_key): mismo SQL +
+# misma versión de datos → el archivo sale del disco con soporte de Range. LRU por tamaño
+# total (0 = desactivado); sin directorio se usa <tmp>/export_cache. Por host: no se comparte.
+EXPORT_CACHE_DIR = os.getenv("EXPORT_CACHE_DIR", "")
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
 # RQ (infraestructura opcional: solo se usa si habilitas Redis y worker)
 RQ_QUEUES = {
     "default": {
@@ -210,6 +256,23 @@ RQ_QUEUES = {
 
 # Convención de jobs: definir funciones en apps/<module>/jobs.py.
 # El servidor web no debe ejecutar tareas largas; usar worker RQ cuando aplique.
+# django-rq (comando rqworker) se habilita solo si está instalado.
+if find_spec("django_rq") is not None:
+    INSTALLED_APPS.append("django_rq")
+
+# Exports en segundo plano (apps.core.services.export_jobs): sobre este estimado de filas el
+# export pasa a un job con página de progreso (0 = siempre en la request). Backend "auto":
+# RQ si hay django-rq + Redis + un worker en la cola; si no, threads del proceso web.
+EXPORT_ASYNC_THRESHOLD = int(os.getenv("EXPORT_ASYNC_THRESHOLD", "5000"))
+EXPORT_JOBS_BACKEND = os.getenv("EXPORT_JOBS_BACKEND", "auto")  # auto | rq | thread
+EXPORT_JOBS_QUEUE = "default"
+EXPORT_JOBS_THREADS = int(os.getenv("EXPORT_JOBS_THREADS", "2"))
+EXPORT_JOB_TIMEOUT = int(os.getenv("EXPORT_JOB_TIMEOUT", "1800"))
+# Job en curso sin avance en estos segundos = interrumpido (FAILED, no se reutiliza; 0 = nunca).
+EXPORT_JOB_STALE_SECONDS = int(os.getenv("EXPORT_JOB_STALE_SECONDS", "600"))
+# Segundos que se conservan archivo y fila de un export terminado (0 = sin límite).
+# Se aplica con `python manage.py purge_export_jobs` (cron) o el job apps.core.jobs.purge_export_jobs.
+EXPORT_JOB_RETENTION = int(os.getenv("EXPORT_JOB_RETENTION", str(7 * 24 * 3600)))
 
 # --- Authentication ---
 LOGIN_URL = "/accounts/login/"
@@ -21,6 +21,8 @@ urlpatterns = [
         "accounts-auth/",
         include(("django.contrib.auth.urls", "accounts_auth"), namespace="accounts-auth"),
     ),
+    # Exports en segundo plano (progreso + descarga)
+    path("exports/", include(("apps.core.urls", "core"), namespace="core")),
     # Apps
     path("crud-example/", include("apps.crud_example.urls")),
     path("dashboard/", include(("apps.dashboard.urls", "dashboard"), namespace="dashboard")),
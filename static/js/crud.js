@@ -2,8 +2,9 @@
 CRUD UI KIT JS (mínimo)
 
 Objetivo:
-- UX de selección masiva (select-all, contador, ids)
+- UX de selección masiva (select-all, "todos los que coinciden", contador, ids)
 - Cerrar modal bootstrap tras éxito (disparado por HX-Trigger)
+- Scroll infinito en streaming (filas por tandas desde crud_urls.rows)
 
 No hace SPA, no maneja negocio.
 */
@@ -28,13 +29,44 @@ No hace SPA, no maneja negocio.
     const ids = getSelectedIds();
     const countEl = $("[data-crud-selected-count]");
     const idsEl = $("[data-crud-selected-ids]");
+    const tokenEl = $("[data-crud-select-all-token]");
+    const matchingBtn = $("[data-crud-select-matching]");
+    const total = parseInt(bulk.dataset.crudTotal || "0", 10);
+    const allChecks = $all("[data-crud-row-check]");
+    const pageFullySelected = allChecks.length > 0 && ids.length === allChecks.length;
 
-    if (countEl) countEl.textContent = String(ids.length);
-    if (idsEl) idsEl.value = ids.join(",");
+    // "Todos los que coinciden" solo vale mientras la página completa siga seleccionada.
+    if (tokenEl && !pageFullySelected) tokenEl.value = "";
+    const matching = Boolean(tokenEl && tokenEl.value);
+
+    if (countEl) countEl.textContent = String(matching ? total : ids.length);
+    if (idsEl) idsEl.value = matching ? "" : ids.join(",");
+    if (matchingBtn) matchingBtn.hidden = matching || !pageFullySelected || total <= ids.length;
 
     bulk.hidden = ids.length === 0;
   }
 
+  function syncSelectAll() {
+    // Mantén el checkbox maestro en estado consistente.
+    const selectAll = $("[data-crud-select-all]");
+    if (!selectAll) return;
+    const allChecks = $all("[data-crud-row-check]", document);
+    const checked = allChecks.filter((x) => x.checked);
+    selectAll.indeterminate = checked.length > 0 && checked.length < allChecks.length;
+    selectAll.checked = checked.length === allChecks.length && allChecks.length > 0;
+  }
+
+  function bindRowChecks(root) {
+    // Idempotente: las filas del scroll infinito llegan sueltas (htmx:load / streaming).
+    $all("[data-crud-row-check]:not([data-crud-bound])", root || document).forEach((cb) => {
+      cb.dataset.crudBound = "1";
+      cb.addEventListener("change", () => {
+        syncSelectAll();
+        syncBulkUI();
+      });
+    });
+  }
+
   function bindSelectionHandlers(root) {
     const scope = root || document;
 
@@ -49,18 +81,16 @@ No hace SPA, no maneja negocio.
       });
     }
 
-    $all("[data-crud-row-check]", scope).forEach((cb) => {
-      cb.addEventListener("change", () => {
-        // Mantén el checkbox maestro en estado consistente.
-        const allChecks = $all("[data-crud-row-check]", document);
-        const checked = allChecks.filter((x) => x.checked);
-        if (selectAll) {
-          selectAll.indeterminate = checked.length > 0 && checked.length < allChecks.length;
-          selectAll.checked = checked.length === allChecks.length && allChecks.length > 0;
-        }
+    bindRowChecks(scope);
+
+    const matchingBtn = $("[data-crud-select-matching]", scope);
+    if (matchingBtn) {
+      matchingBtn.addEventListener("click", () => {
+        const tokenEl = $("[data-crud-select-all-token]");
+        if (tokenEl) tokenEl.value = matchingBtn.dataset.token || "";
         syncBulkUI();
       });
-    });
+    }
 
     const clearBtn = $("[data-crud-clear-selection]", scope);
     if (clearBtn) {
@@ -93,9 +123,90 @@ No hace SPA, no maneja negocio.
     // Si se actualiza la tabla, vuelve a enganchar eventos de selección.
     if (target && (target.id === "crud-table" || target.closest && target.closest("#crud-table"))) {
       bindSelectionHandlers(document);
+      observeRowStreams(document);
     }
   });
 
+  // Filas nuevas sin swap de la tabla (sentinel hx-get / OOB de fila).
+  document.body.addEventListener("htmx:load", (evt) => {
+    const elt = evt.detail && evt.detail.elt;
+    if (!elt || !elt.closest || !elt.closest("#crud-table")) return;
+    bindRowChecks(elt.parentNode || elt);
+    observeRowStreams(elt.parentNode || elt);
+    syncSelectAll();
+    syncBulkUI();
+  });
+
+  // --- Scroll infinito en streaming ---
+  const ROWS_MARK = "<!--crud-rows-->";
+
+  function parseRows(html) {
+    const tpl = document.createElement("template");
+    // <tr> sueltos solo se parsean dentro de un tbody.
+    tpl.innerHTML = "<table><tbody>" + html + "</tbody></table>";
+    return Array.from(tpl.content.querySelector("tbody").children);
+  }
+
+  function insertRows(sentinel, html) {
+    parseRows(html).forEach((row) => {
+      sentinel.parentNode.insertBefore(row, sentinel);
+      if (window.htmx) window.htmx.process(row);
+    });
+    bindRowChecks(sentinel.parentNode);
+    syncSelectAll();
+    syncBulkUI();
+  }
+
+  async function loadRowStream(sentinel) {
+    const indicator = $("#crud-indicator");
+    if (indicator) indicator.classList.add("htmx-request");
+    try {
+      const response = await fetch(sentinel.dataset.url, {
+        headers: { "HX-Request": "true" },
+        credentials: "same-origin",
+      });
+      if (!response.ok || !response.body) return;
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      for (;;) {
+        const { value, done } = await reader.read();
+        buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+        // Pinta hasta la última marca completa; el resto espera la siguiente tanda.
+        const cut = done ? buffer.length : buffer.lastIndexOf(ROWS_MARK);
+        if (cut > 0 && sentinel.isConnected) {
+          insertRows(sentinel, buffer.slice(0, cut));
+          buffer = buffer.slice(cut);
+        }
+        if (done) break;
+      }
+    } finally {
+      if (indicator) indicator.classList.remove("htmx-request");
+      const table = sentinel.closest("tbody");
+      sentinel.remove();
+      if (table) observeRowStreams(table);
+    }
+  }
+
+  const rowStreamObserver =
+    "IntersectionObserver" in window
+      ? new IntersectionObserver((entries) => {
+          entries.forEach((entry) => {
+            if (!entry.isIntersecting) return;
+            rowStreamObserver.unobserve(entry.target);
+            loadRowStream(entry.target);
+          });
+        })
+      : null;
+
+  function observeRowStreams(root) {
+    if (!rowStreamObserver) return;
+    $all("[data-crud-rows-stream]:not([data-crud-bound])", root || document).forEach((el) => {
+      el.dataset.crudBound = "1";
+      rowStreamObserver.observe(el);
+    });
+  }
+
   // Eventos disparados por el backend vía HX-Trigger.
   document.body.addEventListener("crudModalClose", () => {
     closeBootstrapModal("appModal");
@@ -103,4 +214,5 @@ No hace SPA, no maneja negocio.
 
   // Init inicial.
   bindSelectionHandlers(document);
+  observeRowStreams(document);
 })();